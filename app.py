@@ -1,37 +1,244 @@
-"""FastAPI server for the Support Ticket Triage Agent."""
+"""FastAPI server for the Support Ticket Triage Agent.
 
+Importing this module is kept cheap: ADK, the agent (and LiteLLM), and the
+vector store are loaded by the startup warm-up (see ``STARTUP_WARMUP``) or,
+failing that, on first use.
+"""
+
+import asyncio
 import json
+import os
+import threading
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, NamedTuple
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 
-from triage_agent.agent import root_agent
+from triage_agent.drafts import (
+    build_draft_message,
+    deferred_drafts_enabled,
+    generate_draft,
+    needs_draft,
+)
+from triage_agent.fallback import build_fallback_result
+from triage_agent.fast_path import fast_path_triage
+from triage_agent.models import TriageResult
+from triage_agent.parsing import parse_triage_result
+from triage_agent.prefetch import (
+    format_prefetched_context,
+    prefetch_context,
+    prefetch_enabled,
+)
+from triage_agent.serving import metrics
+from triage_agent.similar_tickets import (
+    CustomerProfile,
+    SimilarTicket,
+    customer_profile,
+    embed_text,
+    personalize_result,
+    semantic_cache_enabled,
+    ticket_text,
+)
+from triage_agent.serving.priority import (
+    parse_class_shares,
+    priority_rank,
+    ticket_priority,
+)
+from triage_agent.serving import (
+    DecisionHooks,
+    EarlyDecision,
+    Job,
+    JobQueue,
+    QueueFullError,
+    SemanticCache,
+    SingleFlight,
+    TTLCache,
+    content_key,
+)
+from triage_agent.serving.warmup import (
+    Warmup,
+    import_litellm,
+    open_vector_store,
+    warm_search,
+)
+from triage_agent.streaming import EarlyFieldTracker
+from triage_agent.ticket_prompt import TicketPrompt, build_ticket_prompt
+from triage_agent.tools.tables import preload_tables
+
+if TYPE_CHECKING:
+    from google.adk.events import Event
+    from google.adk.runners import Runner
+
+    from triage_agent.serving.plugin import MetricsPlugin
+    from triage_agent.serving.sessions import BoundedSessionService
 
 load_dotenv()
 
+# "background": serve immediately, /ready turns 200 once warm-up finishes
+# "blocking":   finish warm-up before accepting connections
+# "off":        no warm-up; everything loads on first use
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background")
+
+
 # ---------------------------------------------------------------------------
 # FastAPI app
 # ---------------------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up on startup (per STARTUP_WARMUP); stop job workers on shutdown."""
+    warmup_task = None
+    if STARTUP_WARMUP == "blocking":
+        await warmup.run()
+    elif STARTUP_WARMUP == "background":
+        warmup_task = asyncio.create_task(warmup.run())
+    else:
+        warmup.mark_ready()
+
+    yield
+
+    if warmup_task is not None:
+        # Steps run in threads and can't be interrupted; don't wait for them
+        warmup_task.cancel()
+    await job_queue.stop()
+    await draft_queue.stop()
+
+
 app = FastAPI(
     title="Support Ticket Triage Agent",
     description="AI-powered triage for customer support tickets",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # ---------------------------------------------------------------------------
 # ADK runner (shared across requests)
 # ---------------------------------------------------------------------------
-session_service = InMemorySessionService()
-runner = Runner(
-    agent=root_agent,
-    app_name="support_triage",
-    session_service=session_service,
+# Both are built by init_agent_runtime(), during warm-up or on first use.
+# Sessions are deleted once their run completes; TTL and size caps
+# (SESSION_TTL_SECONDS / SESSION_MAX_COUNT / SESSION_MAX_BYTES) bound leaks.
+session_service: "BoundedSessionService | None" = None
+runner: "Runner | None" = None
+# Runs the draft writer (DEFERRED_DRAFTS only)
+draft_runner: "Runner | None" = None
+# Registered on ``runner``; told when a run ends without ADK noticing
+metrics_plugin: "MetricsPlugin | None" = None
+_runtime_lock = threading.Lock()
+
+
+def init_agent_runtime() -> None:
+    """Import ADK and the agent and build the shared runner (idempotent).
+
+    Thread-safe: the warm-up calls this from a worker thread while early
+    requests may call it (through ``ensure_agent_runtime``) from others.
+    """
+    global session_service, runner, draft_runner, metrics_plugin
+    with _runtime_lock:
+        if session_service is None:
+            from triage_agent.serving.sessions import BoundedSessionService
+
+            session_service = BoundedSessionService()
+        if runner is None:
+            from google.adk.apps import App
+            from google.adk.runners import Runner
+
+            from triage_agent.agent import root_agent
+            from triage_agent.serving.plugin import MetricsPlugin
+
+            metrics_plugin = MetricsPlugin()
+            runner = Runner(
+                app=App(
+                    name="support_triage",
+                    root_agent=root_agent,
+                    plugins=[metrics_plugin],
+                ),
+                session_service=session_service,
+            )
+        if draft_runner is None and deferred_drafts_enabled():
+            from google.adk.apps import App
+            from google.adk.runners import Runner
+
+            from triage_agent.agent import build_draft_agent
+
+            draft_runner = Runner(
+                app=App(name="support_triage_drafts", root_agent=build_draft_agent()),
+                session_service=session_service,
+            )
+
+
+def agent_runtime_ready() -> bool:
+    """Whether ``init_agent_runtime`` has nothing left to build."""
+    return (
+        session_service is not None
+        and runner is not None
+        and (draft_runner is not None or not deferred_drafts_enabled())
+    )
+
+
+async def ensure_agent_runtime() -> None:
+    """``init_agent_runtime`` for async code, without blocking the event loop.
+
+    While the warm-up thread holds the runtime lock (importing ADK, LiteLLM
+    and the agent takes seconds), waiting for it on the loop would stall
+    every request, ``/health`` included.
+    """
+    if not agent_runtime_ready():
+        await asyncio.to_thread(init_agent_runtime)
+
+
+warmup = Warmup(
+    [
+        ("data_tables", preload_tables),
+        ("agent_runtime", init_agent_runtime),
+        ("litellm", import_litellm),
+        ("vector_store", open_vector_store),
+        ("warm_search", warm_search),
+    ]
 )
 
+# Upper bound on concurrent agent runs within a single /triage/batch call
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# Completed results keyed on the assembled ticket content, so webhook
+# retries of an unchanged ticket skip the agent entirely
+result_cache = TTLCache(
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600")),
+)
+
+# Results of recent tickets, reused for near-duplicates from customers with
+# the same profile (SEMANTIC_CACHE_ENABLED)
+semantic_cache = SemanticCache(
+    max_entries=int(os.getenv("SEMANTIC_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "300")),
+    min_similarity=float(os.getenv("SEMANTIC_CACHE_MIN_SIMILARITY", "0.95")),
+)
+
+# Coalesces identical tickets that arrive while a run for them is in flight
+in_flight_runs = SingleFlight()
+
+# Default time budget for one triage run, used when the caller sets none.
+# When it expires the run is cancelled and a fallback result is returned.
+# 0 disables the default deadline.
+TRIAGE_DEADLINE_SECONDS = float(os.getenv("TRIAGE_DEADLINE_SECONDS", "120"))
+
+# Answer clear-cut how-to / feature-request tickets without the LLM
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+
+# Stream model output, so urgency / recommended_action reach decision_hooks
+# (and /triage/stream clients) while the draft response is still generating
+STREAM_ANSWERS = os.getenv("STREAM_ANSWERS", "true").lower() == "true"
+
+# Routing / paging hooks, called with each EarlyDecision of an agent run
+# (and with the final urgency / action of fast-path and fallback results):
+#   @decision_hooks.register
+#   async def page_on_call(decision): ...
+decision_hooks = DecisionHooks()
+
 
 # ---------------------------------------------------------------------------
 # Request / Response models
@@ -50,6 +257,11 @@ class TicketRequest(BaseModel):
     customer_id: str = Field(description="Customer identifier")
     subject: str = Field(description="Ticket subject line")
     messages: list[TicketMessage] = Field(description="Conversation messages")
+    deadline_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description="Time budget for triage (defaults to TRIAGE_DEADLINE_SECONDS)",
+    )
 
 
 class TriageResponse(BaseModel):
@@ -57,38 +269,153 @@ class TriageResponse(BaseModel):
 
     ticket_id: str
     agent_response: str
+    result: TriageResult | None = Field(
+        default=None,
+        description="agent_response validated against the TriageResult "
+        "schema; null if it isn't a valid triage result",
+    )
+    degraded: bool = Field(
+        default=False,
+        description="True if the deadline expired and agent_response is a "
+        "fallback result built from the tool results gathered so far",
+    )
+    draft_status: str | None = Field(
+        default=None,
+        description="With DEFERRED_DRAFTS: 'pending', 'ready', 'failed' or "
+        "'expired' for the reply being drafted separately (see draft_url)",
+    )
+    draft_url: str | None = Field(
+        default=None, description="Where to fetch the deferred draft response"
+    )
+
+
+class JobSubmitResponse(BaseModel):
+    """Acknowledgement for an asynchronously queued triage job."""
+
+    job_id: str
+    status: str
+    status_url: str
+
+
+class JobStatusResponse(BaseModel):
+    """Current state of a triage job, with its result once finished."""
+
+    job_id: str
+    ticket_id: str
+    status: str = Field(description="'queued', 'running', 'succeeded' or 'failed'")
+    priority_class: str = Field(description="SLA priority class the job was queued in")
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: TriageResponse | None = None
+    error: str | None = None
+
+
+class DraftResponse(BaseModel):
+    """A deferred draft response (DEFERRED_DRAFTS)."""
+
+    draft_id: str
+    ticket_id: str
+    status: str = Field(description="'pending', 'ready' or 'failed'")
+    draft_response: str | None = None
+    error: str | None = None
+
+
+class BatchTriageRequest(BaseModel):
+    """A batch of support tickets to triage concurrently."""
+
+    tickets: list[TicketRequest] = Field(
+        min_length=1, description="Tickets to triage"
+    )
+    max_concurrency: int | None = Field(
+        default=None,
+        ge=1,
+        description="Max tickets processed at once (capped by BATCH_CONCURRENCY)",
+    )
+
+
+class BatchTriageItem(BaseModel):
+    """Triage outcome for one ticket of a batch."""
+
+    ticket_id: str
+    status: str = Field(description="'ok' or 'error'")
+    agent_response: str | None = None
+    result: TriageResult | None = None
+    degraded: bool = False
+    draft_status: str | None = None
+    draft_url: str | None = None
+    error: str | None = None
+
+
+class BatchTriageResponse(BaseModel):
+    """Per-ticket results of a batch triage, in request order."""
+
+    results: list[BatchTriageItem]
+    succeeded: int
+    failed: int
 
 
 # ---------------------------------------------------------------------------
-# Endpoints
+# Agent execution
 # ---------------------------------------------------------------------------
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "ok", "agent": root_agent.name}
+def build_prompt(ticket: TicketRequest) -> TicketPrompt:
+    """Render a ticket as the user message, within THREAD_TOKEN_BUDGET."""
+    return build_ticket_prompt(
+        ticket.ticket_id,
+        ticket.customer_id,
+        ticket.subject,
+        [(msg.timestamp, msg.content) for msg in ticket.messages],
+    )
 
 
-@app.post("/triage", response_model=TriageResponse)
-async def triage_ticket(ticket: TicketRequest):
-    """Process a support ticket through the triage agent.
+def build_user_message(ticket: TicketRequest) -> str:
+    """Render a ticket as the user message sent to the agent."""
+    return build_prompt(ticket).text
 
-    Sends the ticket to the ADK agent, which will:
-    1. Look up customer history
-    2. Search the knowledge base
-    3. Classify urgency and extract key info
-    4. Recommend a triage action
+
+async def stream_agent_events(ticket: TicketRequest) -> AsyncIterator["Event"]:
+    """Run the agent on a single ticket, yielding ADK events as they happen.
+
+    With PREFETCH_CONTEXT on, the customer context tools run first, in
+    parallel, and their results are added to the initial message. They are
+    also yielded as one function-response event (not stored in the
+    session) so consumers see them like any other tool result.
+
+    As soon as the (streamed) answer's ``urgency`` or
+    ``recommended_action`` is complete, it is passed to ``decision_hooks``
+    and attached to the event that completed it as
+    ``custom_metadata["early_decisions"]`` (field -> value).
     """
-    # Build the user message from the ticket
-    conversation = "\n\n".join(
-        f"[{msg.timestamp}] {msg.content}" for msg in ticket.messages
-    )
-    user_message = (
-        f"Please triage the following support ticket.\n\n"
-        f"**Ticket ID:** {ticket.ticket_id}\n"
-        f"**Customer ID:** {ticket.customer_id}\n"
-        f"**Subject:** {ticket.subject}\n\n"
-        f"**Messages:**\n{conversation}"
-    )
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.adk.events import Event
+    from google.genai import types
+
+    await ensure_agent_runtime()
+    prompt = build_prompt(ticket)
+    user_message = prompt.text
+    if prompt.tokens_saved:
+        metrics.THREAD_TOKENS_SAVED.inc(prompt.tokens_saved)
+    if prompt.summarized_messages:
+        metrics.THREAD_SUMMARIZED_TICKETS.inc()
+
+    if prefetch_enabled():
+        prefetched = await prefetch_context(ticket.customer_id, ticket.subject)
+        if prefetched:
+            user_message += "\n\n" + format_prefetched_context(prefetched)
+            yield Event(
+                author="prefetch",
+                content=types.Content(
+                    role="user",
+                    parts=[
+                        types.Part(
+                            function_response=types.FunctionResponse(
+                                name=name, response=response
+                            )
+                        )
+                        for name, _, response in prefetched
+                    ],
+                ),
+            )
 
     # Create a session and run the agent
     session = await session_service.create_session(
@@ -96,8 +423,14 @@ async def triage_ticket(ticket: TicketRequest):
         user_id=ticket.customer_id,
     )
 
+    run_config = None
+    if STREAM_ANSWERS:
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    started = time.perf_counter()
+    tracker = EarlyFieldTracker()
+    known_at: dict[str, float] = {}
+
     try:
-        agent_response_text = ""
         async for event in runner.run_async(
             session_id=session.id,
             user_id=ticket.customer_id,
@@ -105,35 +438,863 @@ async def triage_ticket(ticket: TicketRequest):
                 role="user",
                 parts=[types.Part(text=user_message)],
             ),
+            run_config=run_config,
         ):
-            # Collect the final agent response
-            if event.is_final_response() and event.content and event.content.parts:
-                agent_response_text = event.content.parts[0].text
-
-        if not agent_response_text:
-            raise HTTPException(
-                status_code=500,
-                detail="Agent did not produce a response",
+            early = tracker.observe(event)
+            if early:
+                event.custom_metadata = {
+                    **(event.custom_metadata or {}),
+                    "early_decisions": dict(early),
+                }
+                for field, value in early:
+                    known_at[field] = time.perf_counter()
+                    decision_hooks.notify(
+                        EarlyDecision(
+                            ticket_id=ticket.ticket_id,
+                            customer_id=ticket.customer_id,
+                            field=field,
+                            value=value,
+                            elapsed_seconds=known_at[field] - started,
+                        )
+                    )
+            if known_at and not event.partial and event.is_final_response():
+                answered = time.perf_counter()
+                for field, at in known_at.items():
+                    metrics.EARLY_DECISION_LEAD_SECONDS.labels(field=field).observe(
+                        answered - at
+                    )
+                known_at.clear()
+            yield event
+    finally:
+        # A cancelled run (deadline, client gone) skips ADK's after-run
+        # callbacks
+        if metrics_plugin is not None:
+            metrics_plugin.end_session_runs(session.id)
+        # Each ticket is a one-shot conversation; free its event history
+        await session_service.delete_session(
+            app_name="support_triage",
+            user_id=ticket.customer_id,
+            session_id=session.id,
+        )
+
+
+class AgentRun(NamedTuple):
+    """Outcome of one triage run."""
+
+    text: str
+    degraded: bool = False
+    # Job ID of the deferred draft response, if one is being written
+    draft_id: str | None = None
+
+    @property
+    def result(self) -> TriageResult | None:
+        """The response as a validated TriageResult, if it is one."""
+        return parse_triage_result(self.text)
+
+
+def answer_run(text: str) -> AgentRun:
+    """Outcome for the agent's final answer, repaired locally if needed.
+
+    An answer that only validates after repair (truncated JSON, ``"High"``
+    for ``"high"``, ...) is replaced by the repaired result's JSON rather
+    than re-running the agent, so it is cached and returned in valid form.
+    """
+    if not text:
+        return AgentRun(text)
+    if parse_triage_result(text) is not None:
+        outcome = "valid"
+    else:
+        repaired = parse_triage_result(text, repair=True)
+        if repaired is not None:
+            outcome = "repaired"
+            text = repaired.model_dump_json()
+        else:
+            outcome = "invalid"
+    metrics.AGENT_ANSWERS.labels(outcome=outcome).inc()
+    return AgentRun(text)
+
+
+def deadline_after(seconds: float | None) -> float | None:
+    """Event-loop time ``seconds`` from now, or None for no deadline.
+
+    ``seconds`` defaults to TRIAGE_DEADLINE_SECONDS.
+    """
+    if seconds is None:
+        seconds = TRIAGE_DEADLINE_SECONDS
+    if seconds <= 0:
+        return None
+    return asyncio.get_running_loop().time() + seconds
+
+
+def degraded_run(tool_results: list[tuple[str, dict]]) -> AgentRun:
+    """Fallback outcome for a run whose deadline expired."""
+    metrics.DEADLINE_EXCEEDED.inc()
+    result = build_fallback_result(tool_results, reason="deadline exceeded")
+    return AgentRun(result.model_dump_json(), degraded=True)
+
+
+async def try_fast_path(ticket: TicketRequest) -> AgentRun | None:
+    """Rule-based triage for clear-cut tickets (None: the agent is needed)."""
+    if not FAST_PATH_ENABLED:
+        return None
+    # The rules run local lookups and a knowledge base search; keep the
+    # blocking work off the event loop
+    result = await asyncio.to_thread(
+        fast_path_triage,
+        ticket.customer_id,
+        ticket.subject,
+        [msg.content for msg in ticket.messages],
+    )
+    metrics.FAST_PATH_TICKETS.labels(
+        outcome="miss" if result is None else "hit"
+    ).inc()
+    return None if result is None else AgentRun(result.model_dump_json())
+
+
+class DraftJob(NamedTuple):
+    """Payload of a deferred draft-response job."""
+
+    ticket: TicketRequest
+    message: str
+
+
+def schedule_draft(
+    ticket: TicketRequest, run: AgentRun, tool_results: list[tuple[str, dict]]
+) -> AgentRun:
+    """Queue the reply for a classified ticket (DEFERRED_DRAFTS).
+
+    Returns ``run`` with the draft job's ID, or unchanged if no draft is
+    due: two-phase triage is off, the run is degraded, the answer isn't a
+    valid result or already has a draft, or its action isn't in
+    DRAFT_ACTIONS. A full draft queue skips the draft rather than failing
+    the triage.
+    """
+    if not deferred_drafts_enabled() or run.degraded:
+        return run
+    result = run.result
+    if not needs_draft(result):
+        return run
+    message = build_draft_message(build_user_message(ticket), result, tool_results)
+    try:
+        job = draft_queue.submit(DraftJob(ticket, message))
+    except QueueFullError:
+        metrics.DRAFTS.labels(outcome="rejected").inc()
+        return run
+    return run._replace(draft_id=job.job_id)
+
+
+def draft_status(job: Job | None) -> str:
+    """'pending', 'ready', 'failed' or (no longer retained) 'expired'."""
+    if job is None:
+        return "expired"
+    if job.done:
+        return "ready" if job.status == "succeeded" else "failed"
+    return "pending"
+
+
+def draft_fields(run: AgentRun) -> dict:
+    """``draft_status`` / ``draft_url`` response fields for ``run``."""
+    if run.draft_id is None:
+        return {}
+    return {
+        "draft_status": draft_status(draft_queue.get(run.draft_id)),
+        "draft_url": f"/triage/drafts/{run.draft_id}",
+    }
+
+
+def notify_decisions(
+    ticket: TicketRequest, run: AgentRun, elapsed_seconds: float = 0.0
+) -> None:
+    """Pass ``run``'s final urgency and action to ``decision_hooks``.
+
+    For results that don't come from the agent's streamed answer, which
+    notifies the hooks as it is generated: fast-path results, deadline
+    fallbacks (always ``escalate_to_human``; ``critical`` when the SLA is at
+    risk) and a near-duplicate's reused result. Exact cache hits and
+    coalesced duplicates are retries of a ticket that was already notified.
+    """
+    result = run.result
+    if result is None:
+        return
+    for field, value in (
+        ("urgency", result.urgency),
+        ("recommended_action", result.recommended_action.model_dump()),
+    ):
+        decision_hooks.notify(
+            EarlyDecision(
+                ticket_id=ticket.ticket_id,
+                customer_id=ticket.customer_id,
+                field=field,
+                value=value,
+                elapsed_seconds=elapsed_seconds,
             )
+        )
 
-        return TriageResponse(
-            ticket_id=ticket.ticket_id,
-            agent_response=agent_response_text,
+
+async def run_triage(ticket: TicketRequest, deadline: float = None) -> AgentRun:
+    """Run the agent on a single ticket and return its final response text.
+
+    Clear-cut tickets are answered by ``try_fast_path`` without the agent.
+    If ``deadline`` (event-loop time) passes first, the run is cancelled,
+    including any in-progress fast-path check, LLM or tool call, and a
+    degraded fallback result built from the tool results gathered so far
+    is returned. Both are passed to ``decision_hooks``.
+
+    The text is empty if the agent finished without a final response.
+    """
+    started = time.perf_counter()
+    agent_response_text = ""
+    tool_results = []
+    try:
+        async with asyncio.timeout_at(deadline):
+            fast = await try_fast_path(ticket)
+            if fast is not None:
+                notify_decisions(ticket, fast, time.perf_counter() - started)
+                return fast
+            async with aclosing(stream_agent_events(ticket)) as events:
+                async for event in events:
+                    for result in event.get_function_responses():
+                        tool_results.append((result.name, result.response))
+                    # Collect the final agent response
+                    if (
+                        event.is_final_response()
+                        and event.content
+                        and event.content.parts
+                    ):
+                        agent_response_text = event.content.parts[0].text
+    except TimeoutError:
+        run = degraded_run(tool_results)
+        notify_decisions(ticket, run, time.perf_counter() - started)
+        return run
+
+    return schedule_draft(ticket, answer_run(agent_response_text), tool_results)
+
+
+def ticket_cache_key(ticket: TicketRequest) -> str:
+    """Result cache key: a hash of the ticket's full content.
+
+    Hashes the raw ticket rather than the prompt, which may leave out
+    messages dropped by THREAD_TOKEN_BUDGET windowing.
+    """
+    return content_key(
+        json.dumps(
+            [
+                ticket.ticket_id,
+                ticket.customer_id,
+                ticket.subject,
+                [[msg.timestamp, msg.content] for msg in ticket.messages],
+            ],
+            ensure_ascii=False,
         )
+    )
+
+
+class SimilarityProbe(NamedTuple):
+    """A ticket's semantic cache key."""
+
+    vector: list[float]
+    profile: CustomerProfile
+
+
+async def find_similar_run(
+    ticket: TicketRequest,
+) -> tuple[SimilarityProbe | None, AgentRun | None]:
+    """Look ``ticket`` up in ``semantic_cache`` (SEMANTIC_CACHE_ENABLED).
+
+    On a hit the similar ticket's classification is personalized for this
+    ticket and customer; with DEFERRED_DRAFTS, a fresh draft is scheduled
+    for it. The probe is None if the cache is off or the embedding failed,
+    in which case the ticket is simply triaged.
+
+    Returns:
+        tuple: (probe to store this ticket's result under, reused run or None)
+    """
+    if not semantic_cache_enabled():
+        return None, None
+    text = ticket_text(ticket.subject, [msg.content for msg in ticket.messages])
+    try:
+        vector = await asyncio.to_thread(embed_text, text)
+    except Exception:
+        metrics.SEMANTIC_CACHE_LOOKUPS.labels(outcome="error").inc()
+        return None, None
+    probe = SimilarityProbe(vector, customer_profile(ticket.customer_id))
+
+    hit = semantic_cache.get(probe.vector, probe.profile)
+    if hit is None:
+        metrics.SEMANTIC_CACHE_LOOKUPS.labels(outcome="miss").inc()
+        return probe, None
+    metrics.SEMANTIC_CACHE_LOOKUPS.labels(outcome="hit").inc()
+    metrics.SEMANTIC_CACHE_SIMILARITY.observe(hit.similarity)
+    result = personalize_result(hit.value, ticket.ticket_id, ticket.customer_id)
+    return probe, schedule_draft(ticket, AgentRun(result.model_dump_json()), [])
+
+
+async def run_triage_cached(
+    ticket: TicketRequest, deadline: float = None
+) -> tuple[AgentRun, str]:
+    """Like ``run_triage``, but deduplicated against earlier identical tickets.
+
+    The key is ``ticket_cache_key``, which covers the ticket ID, customer,
+    subject and every message. A completed result is
+    served from ``result_cache``; if an identical ticket is still being
+    triaged, this call waits for that run instead of starting another
+    (but no longer than its own ``deadline``). Otherwise a recent
+    near-duplicate's result is reused if ``find_similar_run`` finds one
+    before the deadline.
+    Only complete, non-empty responses are cached.
+
+    Returns:
+        tuple: (agent run, source) where source is "hit", "coalesced",
+               "similar" or "miss"
+    """
+    key = ticket_cache_key(ticket)
+    cached = result_cache.get(key)
+    if cached is not None:
+        # A retry of a ticket whose own run already notified decision_hooks
+        return cached, "hit"
+
+    async def _run_and_cache() -> AgentRun:
+        run = await run_triage(ticket, deadline)
+        if run.text and not run.degraded:
+            result_cache.set(key, run)
+            result = run.result
+            if probe is not None and result is not None:
+                semantic_cache.set(
+                    probe.vector,
+                    probe.profile,
+                    SimilarTicket(ticket.ticket_id, ticket.customer_id, result),
+                )
+        return run
+
+    async def _join() -> AgentRun:
+        # The run being joined is bounded by its leader's deadline, which
+        # may be later than ours
+        try:
+            async with asyncio.timeout_at(deadline):
+                run, _ = await in_flight_runs.do(key, _run_and_cache)
+        except TimeoutError:
+            run = degraded_run([])
+        return run
 
-    except HTTPException:
+    if key in in_flight_runs:
+        return await _join(), "coalesced"
+
+    try:
+        async with asyncio.timeout_at(deadline):
+            probe, similar = await find_similar_run(ticket)
+    except TimeoutError:
+        # No time left to compare; the run below returns the fallback
+        metrics.SEMANTIC_CACHE_LOOKUPS.labels(outcome="miss").inc()
+        probe, similar = None, None
+    if similar is not None:
+        result_cache.set(key, similar)
+        notify_decisions(ticket, similar)
+        return similar, "similar"
+
+    if key in in_flight_runs:
+        # An identical ticket started its run during the lookup
+        return await _join(), "coalesced"
+    run, _ = await in_flight_runs.do(key, _run_and_cache)
+    return run, "miss"
+
+
+async def run_triage_job(ticket: TicketRequest) -> TriageResponse:
+    """Job-queue handler: triage a ticket, raising if there is no response.
+
+    The ticket's deadline starts when the job starts running.
+    """
+    run, _ = await run_triage_cached(
+        ticket, deadline_after(ticket.deadline_seconds)
+    )
+    if not run.text:
+        raise RuntimeError("Agent did not produce a response")
+    return TriageResponse(
+        ticket_id=ticket.ticket_id,
+        agent_response=run.text,
+        result=run.result,
+        degraded=run.degraded,
+        **draft_fields(run),
+    )
+
+
+def classify_ticket(ticket: TicketRequest) -> tuple[str, float]:
+    """Job-queue classifier: SLA-aware priority class and in-class order."""
+    priority = ticket_priority(ticket.customer_id)
+    return priority.priority_class, priority.time_remaining_hours
+
+
+# Background workers for /triage/jobs (JOB_WORKERS / JOB_QUEUE_SIZE).
+# Queued jobs run by SLA priority; JOB_CLASS_SHARES caps each class's
+# share of the workers (e.g. "pro=0.75,free=0.5").
+job_queue = JobQueue(
+    handler=run_triage_job,
+    classify=classify_ticket,
+    class_shares=parse_class_shares(os.getenv("JOB_CLASS_SHARES", "")),
+)
+
+
+async def run_draft_job(draft: DraftJob) -> str:
+    """Draft-queue handler: write the reply for a classified ticket."""
+    await ensure_agent_runtime()
+    started = time.perf_counter()
+    try:
+        text = await generate_draft(
+            draft_runner, session_service, draft.ticket.customer_id, draft.message
+        )
+    except Exception:
+        metrics.DRAFTS.labels(outcome="failed").inc()
         raise
+    metrics.DRAFTS.labels(outcome="ready").inc()
+    metrics.DRAFT_SECONDS.observe(time.perf_counter() - started)
+    return text
+
+
+# Background workers writing deferred drafts (DEFERRED_DRAFTS), most
+# SLA-critical tickets first; DRAFT_WORKERS / DRAFT_QUEUE_SIZE
+draft_queue = JobQueue(
+    handler=run_draft_job,
+    workers=int(os.getenv("DRAFT_WORKERS", "4")),
+    max_queue=int(os.getenv("DRAFT_QUEUE_SIZE", "1000")),
+    classify=lambda draft: classify_ticket(draft.ticket),
+    class_shares=parse_class_shares(os.getenv("JOB_CLASS_SHARES", "")),
+)
+
+# Gauges are read at scrape time
+metrics.JOBS_QUEUED.set_function(lambda: job_queue.depth)
+metrics.DRAFTS_QUEUED.set_function(lambda: draft_queue.depth)
+metrics.JOBS_RUNNING.set_function(lambda: job_queue.running)
+metrics.SEMANTIC_CACHE_ENTRIES.set_function(lambda: len(semantic_cache))
+metrics.COALESCED_IN_FLIGHT.set_function(lambda: in_flight_runs.in_flight)
+metrics.SESSIONS.set_function(
+    lambda: session_service.stats()["sessions"] if session_service else 0
+)
+metrics.SESSION_BYTES.set_function(
+    lambda: session_service.stats()["approx_bytes"] if session_service else 0
+)
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe request latency, labelled by route template (not raw path)."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_SECONDS.labels(
+            method=request.method,
+            path=route.path if route else "unmatched",
+            status=str(status),
+        ).observe(time.perf_counter() - started)
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/health")
+async def health_check():
+    """Liveness probe; answers as soon as the process is serving."""
+    return {"status": "ok", "agent": runner.agent.name if runner else None}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until startup warm-up has finished."""
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if warmup.ready else 503)
+
+
+@app.get("/sessions/stats")
+async def session_stats():
+    """Report session store usage (count, approximate bytes, evictions)."""
+    await ensure_agent_runtime()
+    return session_service.stats()
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Report result cache, semantic cache and in-flight coalescing counters."""
+    return {
+        **result_cache.stats(),
+        "semantic": semantic_cache.stats(),
+        "single_flight": in_flight_runs.stats(),
+    }
+
+
+@app.post("/triage", response_model=TriageResponse)
+async def triage_ticket(
+    ticket: TicketRequest,
+    response: Response,
+    x_triage_deadline: float | None = Header(
+        default=None, gt=0, description="Time budget in seconds"
+    ),
+):
+    """Process a support ticket through the triage agent.
+
+    Sends the ticket to the ADK agent, which will:
+    1. Look up customer history
+    2. Search the knowledge base
+    3. Classify urgency and extract key info
+    4. Recommend a triage action
+
+    Resubmitting an identical ticket returns the cached result
+    (``X-Cache: HIT``), or joins a run still in progress for it
+    (``X-Cache: COALESCED``), without re-running the agent. With
+    SEMANTIC_CACHE_ENABLED, a near-duplicate of a recent ticket from a
+    similar customer reuses that ticket's classification
+    (``X-Cache: SIMILAR``).
+
+    The time budget is ``deadline_seconds`` in the body, else the
+    ``X-Triage-Deadline`` header, else TRIAGE_DEADLINE_SECONDS. If it
+    expires, the run is cancelled and a conservative fallback result
+    (always ``escalate_to_human``) is returned with ``degraded: true``.
+    """
+    deadline = deadline_after(ticket.deadline_seconds or x_triage_deadline)
+    try:
+        run, source = await run_triage_cached(ticket, deadline)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Agent processing failed: {str(e)}",
         )
 
+    if not run.text:
+        raise HTTPException(
+            status_code=500,
+            detail="Agent did not produce a response",
+        )
+
+    response.headers["X-Cache"] = source.upper()
+    return TriageResponse(
+        ticket_id=ticket.ticket_id,
+        agent_response=run.text,
+        result=run.result,
+        degraded=run.degraded,
+        **draft_fields(run),
+    )
+
+
+@app.post("/triage/stream")
+async def triage_stream(
+    ticket: TicketRequest,
+    x_triage_deadline: float | None = Header(
+        default=None, gt=0, description="Time budget in seconds"
+    ),
+):
+    """Stream triage progress for a ticket as server-sent events.
+
+    Emits, in order:
+    - ``started``: immediately, before the first model call
+    - ``tool_call`` / ``tool_result``: for every tool the agent invokes
+      (none for tickets answered by the rule-based fast path)
+    - ``decision``: ``urgency`` and ``recommended_action`` of the answer, each
+      as soon as it has been generated (before the draft response is done)
+    - ``final``: the agent's final response (same shape as ``/triage``),
+      or the degraded fallback result if the deadline expires
+    - ``draft``: with DEFERRED_DRAFTS, the reply once it has been written
+      (same shape as ``/triage/drafts/{draft_id}``); still ``pending`` if
+      the deadline (at most MAX_DRAFT_WAIT_SECONDS) runs out first
+    - ``error``: instead of ``final`` if the run fails or produces nothing
+    """
+    started = time.perf_counter()
+    deadline = deadline_after(ticket.deadline_seconds or x_triage_deadline)
+
+    async def _produce(queue: asyncio.Queue) -> None:
+        # Runs the agent in its own task so the deadline can cancel it
+        # without cancelling the response stream
+        try:
+            async for event in stream_agent_events(ticket):
+                queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait(e)
+        else:
+            queue.put_nowait(None)
+
+    async def _events() -> AsyncIterator[str]:
+        yield format_sse("started", {"ticket_id": ticket.ticket_id})
+
+        try:
+            async with asyncio.timeout_at(deadline):
+                fast = await try_fast_path(ticket)
+        except TimeoutError:
+            fast = degraded_run([])
+        if fast is not None:
+            notify_decisions(ticket, fast, time.perf_counter() - started)
+            yield format_sse(
+                "final",
+                TriageResponse(
+                    ticket_id=ticket.ticket_id,
+                    agent_response=fast.text,
+                    result=fast.result,
+                    degraded=fast.degraded,
+                ).model_dump(),
+            )
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(_produce(queue))
+        run = AgentRun("")
+        tool_results = []
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        event = await queue.get()
+                except TimeoutError:
+                    producer.cancel()
+                    await asyncio.gather(producer, return_exceptions=True)
+                    run = degraded_run(tool_results)
+                    notify_decisions(ticket, run, time.perf_counter() - started)
+                    break
+
+                if event is None:
+                    break
+                if isinstance(event, Exception):
+                    yield format_sse(
+                        "error",
+                        {"detail": f"Agent processing failed: {str(event)}"},
+                    )
+                    return
+
+                for field, value in (
+                    (event.custom_metadata or {}).get("early_decisions", {}).items()
+                ):
+                    yield format_sse("decision", {"field": field, "value": value})
+                if event.partial:
+                    # Streamed chunks; the complete call / answer follows
+                    continue
+                for call in event.get_function_calls():
+                    yield format_sse(
+                        "tool_call", {"name": call.name, "args": call.args}
+                    )
+                for result in event.get_function_responses():
+                    tool_results.append((result.name, result.response))
+                    yield format_sse(
+                        "tool_result",
+                        {"name": result.name, "response": result.response},
+                    )
+                if (
+                    event.is_final_response()
+                    and event.content
+                    and event.content.parts
+                ):
+                    run = answer_run(event.content.parts[0].text)
+        finally:
+            # Client disconnected mid-stream: stop the agent run too
+            producer.cancel()
+
+        if not run.text:
+            yield format_sse(
+                "error", {"detail": "Agent did not produce a response"}
+            )
+            return
+
+        run = schedule_draft(ticket, run, tool_results)
+        yield format_sse(
+            "final",
+            TriageResponse(
+                ticket_id=ticket.ticket_id,
+                agent_response=run.text,
+                result=run.result,
+                degraded=run.degraded,
+                **draft_fields(run),
+            ).model_dump(),
+        )
+
+        draft = draft_queue.get(run.draft_id) if run.draft_id else None
+        if draft is not None:
+            # Bounded by what is left of the deadline; a draft still
+            # pending then is reported as such and fetched via draft_url
+            timeout = MAX_DRAFT_WAIT_SECONDS
+            if deadline is not None:
+                remaining = deadline - asyncio.get_running_loop().time()
+                timeout = min(timeout, max(remaining, 0))
+            await draft_queue.wait(draft, timeout)
+            yield format_sse("draft", draft_response(draft).model_dump())
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/triage/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_triage_job(ticket: TicketRequest):
+    """Queue a ticket for background triage and return a job ID immediately.
+
+    Returns 429 with a ``Retry-After`` header when the queue is full.
+    """
+    try:
+        job = job_queue.submit(ticket)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
+
+    return JobSubmitResponse(
+        job_id=job.job_id,
+        status=job.status,
+        status_url=f"/triage/jobs/{job.job_id}",
+    )
+
+
+@app.get("/triage/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_triage_job(job_id: str):
+    """Poll a triage job's status and, once finished, its result."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: '{job_id}'")
+
+    return JobStatusResponse(
+        job_id=job.job_id,
+        ticket_id=job.payload.ticket_id,
+        status=job.status,
+        priority_class=job.priority_class,
+        submitted_at=job.submitted_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error,
+    )
+
+
+# Longest a request waits for a deferred draft (stream, ?wait=)
+MAX_DRAFT_WAIT_SECONDS = 60
+
+
+def draft_response(job: Job) -> DraftResponse:
+    """API view of a draft job."""
+    return DraftResponse(
+        draft_id=job.job_id,
+        ticket_id=job.payload.ticket.ticket_id,
+        status=draft_status(job),
+        draft_response=job.result,
+        error=job.error,
+    )
+
+
+@app.get("/triage/drafts/{draft_id}", response_model=DraftResponse)
+async def get_triage_draft(
+    draft_id: str,
+    wait: float = Query(
+        default=0,
+        ge=0,
+        le=MAX_DRAFT_WAIT_SECONDS,
+        description="Seconds to wait for a pending draft",
+    ),
+):
+    """Fetch a deferred draft response (DEFERRED_DRAFTS).
+
+    With ``wait``, a pending draft is waited for up to that many seconds
+    before answering.
+    """
+    job = draft_queue.get(draft_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown draft: '{draft_id}'")
+    if wait:
+        await draft_queue.wait(job, wait)
+    return draft_response(job)
+
+
+@app.post("/triage/batch", response_model=BatchTriageResponse)
+async def triage_batch(batch: BatchTriageRequest):
+    """Triage many tickets in one request with bounded concurrency.
+
+    Tickets run concurrently, at most ``max_concurrency`` at a time (never
+    more than ``BATCH_CONCURRENCY``), with SLA-critical tickets started
+    first. Results are returned in request order. A failure on one ticket
+    is reported in its result entry and does not fail the rest of the batch.
+
+    Each ticket's deadline counts from when the batch request arrived, so
+    time spent waiting for a concurrency slot uses up its budget.
+    """
+    limit = min(batch.max_concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _triage_one(
+        ticket: TicketRequest, deadline: float | None
+    ) -> BatchTriageItem:
+        async with semaphore:
+            try:
+                run, _ = await run_triage_cached(ticket, deadline)
+            except Exception as e:
+                return BatchTriageItem(
+                    ticket_id=ticket.ticket_id,
+                    status="error",
+                    error=f"Agent processing failed: {str(e)}",
+                )
+
+        if not run.text:
+            return BatchTriageItem(
+                ticket_id=ticket.ticket_id,
+                status="error",
+                error="Agent did not produce a response",
+            )
+
+        return BatchTriageItem(
+            ticket_id=ticket.ticket_id,
+            status="ok",
+            agent_response=run.text,
+            result=run.result,
+            degraded=run.degraded,
+            **draft_fields(run),
+        )
+
+    deadlines = [deadline_after(t.deadline_seconds) for t in batch.tickets]
+
+    # The semaphore admits waiters FIFO, so starting the most SLA-critical
+    # tickets first gives them the first free slots
+    order = sorted(
+        range(len(batch.tickets)),
+        key=lambda i: priority_rank(ticket_priority(batch.tickets[i].customer_id)),
+    )
+    tasks = {
+        i: asyncio.ensure_future(_triage_one(batch.tickets[i], deadlines[i]))
+        for i in order
+    }
+    await asyncio.gather(*tasks.values())
+    results = [tasks[i].result() for i in range(len(batch.tickets))]
+    succeeded = sum(1 for r in results if r.status == "ok")
+
+    return BatchTriageResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+    )
+
 
 if __name__ == "__main__":
-    import os
     import uvicorn
 
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "8000"))
-    uvicorn.run(app, host=host, port=port)
+    workers = int(os.getenv("API_WORKERS", "1"))
+
+    if workers > 1:
+        # Fork workers from this process so they share the loaded data tables
+        # and the imported agent stack. Each worker still opens its own
+        # vector store during warm-up (its client is not fork-safe).
+        from triage_agent.serving.prefork import serve_prefork
+
+        init_agent_runtime()
+        import_litellm()
+        serve_prefork(app, host=host, port=port, workers=workers)
+    else:
+        uvicorn.run(app, host=host, port=port)
@@ -3,12 +3,13 @@
 Usage:
     python -m eval.eval_runner
 
-Requires OPENAI_API_KEY in .env
+Requires OPENAI_API_KEY in .env (unless replaying a recorded run with
+LLM_CASSETTE_MODE=replay; see triage_agent/cassette.py). With
+CASCADE_MODEL_NAME set, the report also breaks accuracy down by the model
+that answered each ticket.
 """
 
 import asyncio
-import json
-import re
 from collections import Counter, defaultdict
 
 from dotenv import load_dotenv
@@ -18,27 +19,22 @@ from google.genai import types
 
 from eval.golden_dataset import GOLDEN_DATASET
 from triage_agent.agent import root_agent
+from triage_agent.parsing import extract_json, parse_triage_result
+from triage_agent.ticket_prompt import build_ticket_prompt
 
 load_dotenv()
 
 
 def extract_json_from_response(text: str) -> dict | None:
-    """Attempt to extract JSON from the agent's response text."""
-    # Try to find JSON block in markdown code fences
-    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            pass
-
-    # Try to parse the entire text as JSON
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
+    """Attempt to extract JSON from the agent's response text.
 
-    return None
+    Answers are validated (and repaired if needed) the same way the server
+    does; one that still fails the schema is scored on whatever JSON it has.
+    """
+    result = parse_triage_result(text, repair=True)
+    if result is not None:
+        return result.model_dump()
+    return extract_json(text)
 
 
 def calculate_f1(true_pos, false_pos, false_neg):
@@ -128,6 +124,41 @@ def print_metrics_report(results: list[dict]):
             count = confusion[actual][pred]
             row_str += f" {count:<6}"
         print(row_str)
+
+    # 4. Cascade breakdown (only when the cascade is enabled)
+    cascaded = [r for r in results if r.get("cascade")]
+    if cascaded:
+        print("\n--- Cascade (answered by → tickets, urgency / action accuracy) ---")
+        by_agent = defaultdict(list)
+        for r in cascaded:
+            by_agent[r["cascade"]["answered_by"]].append(r)
+        for agent_name, rows in by_agent.items():
+            urgency_acc = sum(bool(r["checks"].get("urgency")) for r in rows) / len(rows)
+            action_acc = sum(bool(r["checks"].get("action")) for r in rows) / len(rows)
+            print(
+                f"{agent_name:<22} {len(rows):>3}   "
+                f"{urgency_acc * 100:.1f}% / {action_acc * 100:.1f}%"
+            )
+        reasons = Counter(
+            r["cascade"]["escalation_reason"]
+            for r in cascaded
+            if r["cascade"]["escalation_reason"]
+        )
+        if reasons:
+            print("Escalation reasons: " + ", ".join(
+                f"{reason} {count}" for reason, count in reasons.most_common()
+            ))
+
+    # 5. Thread budgeting (only when some thread exceeded THREAD_TOKEN_BUDGET)
+    windowed = [r for r in results if r.get("thread_tokens_saved")]
+    if windowed:
+        saved = sum(r["thread_tokens_saved"] for r in windowed)
+        sent = sum(r["thread_tokens"] for r in results)
+        print("\n--- Thread Budget ---")
+        print(
+            f"{len(windowed)} of {len(results)} tickets windowed, "
+            f"~{saved} thread tokens saved per LLM turn ({sent} sent)"
+        )
     print("="*60 + "\n")
 
 
@@ -193,16 +224,13 @@ async def run_evaluation():
         print(f"\nEvaluating: {ticket_id}...")
 
         # Build user message (Prompt construction)
-        conversation = "\n".join(
-            f"[{msg['timestamp']}] {msg['content']}" for msg in entry["messages"]
-        )
-        user_message = (
-            f"Please triage the following support ticket.\n\n"
-            f"**Ticket ID:** {entry['ticket_id']}\n"
-            f"**Customer ID:** {entry['customer_id']}\n"
-            f"**Subject:** {entry['subject']}\n\n"
-            f"**Messages:**\n{conversation}"
+        prompt = build_ticket_prompt(
+            entry["ticket_id"],
+            entry["customer_id"],
+            entry["subject"],
+            [(msg["timestamp"], msg["content"]) for msg in entry["messages"]],
         )
+        user_message = prompt.text
 
         # Run agent
         session = await session_service.create_session(
@@ -211,6 +239,7 @@ async def run_evaluation():
         )
 
         agent_response = ""
+        cascade = None
         try:
             async for event in runner.run_async(
                 session_id=session.id,
@@ -219,6 +248,7 @@ async def run_evaluation():
             ):
                 if event.is_final_response() and event.content and event.content.parts:
                     agent_response = event.content.parts[0].text
+                    cascade = (event.custom_metadata or {}).get("cascade")
         except Exception as e:
             print(f"❌ Error running agent: {e}")
             continue
@@ -231,6 +261,9 @@ async def run_evaluation():
             "expected": entry["expected"],
             "parsed": parsed if parsed else {},
             "raw_response": agent_response,
+            "cascade": cascade,
+            "thread_tokens": prompt.thread_tokens,
+            "thread_tokens_saved": prompt.tokens_saved,
             "checks": {}
         }
 
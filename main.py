@@ -1,6 +1,23 @@
-"""CLI runner — processes all sample tickets through the triage agent."""
+"""CLI runner — triages the sample tickets, or bulk-triages a JSONL file.
 
+Usage:
+    python main.py
+        Process the sample tickets and print each response.
+
+    python main.py --input tickets.jsonl --output results.jsonl [--concurrency 8]
+        Triage every ticket in ``tickets.jsonl`` (one ticket object per
+        line, same shape as the ``/triage`` request body), appending one
+        result record per line to ``results.jsonl`` as tickets finish.
+        Rerunning the same command resumes: tickets that already have a
+        successful record in the output are skipped, failed ones are retried.
+"""
+
+import argparse
 import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Iterator
 
 from dotenv import load_dotenv
 from google.adk.runners import Runner
@@ -8,7 +25,14 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 from triage_agent.agent import root_agent
+from triage_agent.parsing import parse_triage_result
+from triage_agent.prefetch import (
+    format_prefetched_context,
+    prefetch_context,
+    prefetch_enabled,
+)
 from triage_agent.sample_tickets import SAMPLE_TICKETS
+from triage_agent.ticket_prompt import build_ticket_prompt
 
 load_dotenv()
 
@@ -17,19 +41,22 @@ async def process_ticket(
     session_service: InMemorySessionService,
     ticket: dict,
 ) -> str:
-    """Send a single ticket to the triage agent and return the response."""
+    """Send a single ticket to the triage agent and return the response.
+
+    The response is empty if the agent finished without a final answer.
+    """
 
     # Build user message
-    conversation = "\n\n".join(
-        f"[{msg['timestamp']}] {msg['content']}" for msg in ticket["messages"]
-    )
-    user_message = (
-        f"Please triage the following support ticket.\n\n"
-        f"**Ticket ID:** {ticket['ticket_id']}\n"
-        f"**Customer ID:** {ticket['customer_id']}\n"
-        f"**Subject:** {ticket['subject']}\n\n"
-        f"**Messages:**\n{conversation}"
-    )
+    user_message = build_ticket_prompt(
+        ticket["ticket_id"],
+        ticket["customer_id"],
+        ticket["subject"],
+        [(msg["timestamp"], msg["content"]) for msg in ticket["messages"]],
+    ).text
+    if prefetch_enabled():
+        prefetched = await prefetch_context(ticket["customer_id"], ticket["subject"])
+        if prefetched:
+            user_message += "\n\n" + format_prefetched_context(prefetched)
 
     # Create session and run
     session = await session_service.create_session(
@@ -38,33 +65,161 @@ async def process_ticket(
     )
 
     agent_response = ""
-    async for event in runner.run_async(
-        session_id=session.id,
-        user_id=ticket["customer_id"],
-        new_message=types.Content(
-            role="user",
-            parts=[types.Part(text=user_message)],
-        ),
-    ):
-        if event.is_final_response():
-            if event.content and event.content.parts:
-                agent_response = event.content.parts[0].text
+    try:
+        async for event in runner.run_async(
+            session_id=session.id,
+            user_id=ticket["customer_id"],
+            new_message=types.Content(
+                role="user",
+                parts=[types.Part(text=user_message)],
+            ),
+        ):
+            if event.is_final_response():
+                if event.content and event.content.parts:
+                    agent_response = event.content.parts[0].text or ""
+                else:
+                    agent_response = ""
+    finally:
+        # Bulk runs process many tickets; don't keep their histories around
+        await session_service.delete_session(
+            app_name="support_triage",
+            user_id=ticket["customer_id"],
+            session_id=session.id,
+        )
+
+    return agent_response
+
+
+# ---------------------------------------------------------------------------
+# Bulk JSONL processing
+# ---------------------------------------------------------------------------
+def load_checkpoint(output_path: Path) -> set[str]:
+    """Return the IDs of tickets with a successful record in ``output_path``.
+
+    The last record for a ticket wins, so a ticket that failed and then
+    succeeded on a later run counts as done. A partial last line left by a
+    crash mid-write is truncated away so that appending resumes cleanly.
+    """
+    done: set[str] = set()
+    if not output_path.exists():
+        return done
+
+    valid_bytes = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            valid_bytes += len(line)
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["ticket_id"])
             else:
-                 agent_response = "No response content."
+                done.discard(record.get("ticket_id"))
 
+    if valid_bytes < output_path.stat().st_size:
+        with open(output_path, "rb+") as f:
+            f.truncate(valid_bytes)
+    return done
 
-    return agent_response
 
+def iter_tickets(input_path: Path) -> Iterator[dict]:
+    """Stream ticket objects from a JSONL file, skipping malformed lines."""
+    with open(input_path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                ticket = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"[WARNING] {input_path}:{line_number}: invalid JSON ({e}); skipped")
+                continue
+            if not isinstance(ticket, dict) or "ticket_id" not in ticket:
+                print(f"[WARNING] {input_path}:{line_number}: no ticket_id; skipped")
+                continue
+            yield ticket
 
-async def main():
-    """Process all sample tickets and print results."""
 
-    session_service = InMemorySessionService()
-    runner = Runner(
-        agent=root_agent,
-        app_name="support_triage",
-        session_service=session_service,
-    )
+async def bulk_triage(
+    runner: Runner,
+    session_service: InMemorySessionService,
+    input_path: Path,
+    output_path: Path,
+    concurrency: int = 4,
+) -> dict:
+    """Triage every ticket in ``input_path``, appending results to ``output_path``.
+
+    Tickets are read lazily and processed by ``concurrency`` workers; each
+    result is written and flushed as soon as its ticket finishes, so the
+    output file doubles as the resume checkpoint.
+
+    Returns:
+        dict: Counts of tickets that succeeded, failed, or were skipped
+              (already done, or duplicated in the input).
+    """
+    done = load_checkpoint(output_path)
+    counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+    # Bounded so a huge input file is never read far ahead of the workers
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        async def _worker() -> None:
+            while True:
+                ticket = await queue.get()
+                if ticket is None:
+                    return
+
+                started = time.perf_counter()
+                record = {"ticket_id": ticket["ticket_id"]}
+                try:
+                    response = await process_ticket(runner, session_service, ticket)
+                    if not response:
+                        raise RuntimeError("Agent did not produce a response")
+                    result = parse_triage_result(response, repair=True)
+                    record.update(
+                        status="ok",
+                        agent_response=response,
+                        result=result.model_dump() if result else None,
+                    )
+                    counts["succeeded"] += 1
+                except Exception as e:
+                    record.update(status="error", error=str(e))
+                    counts["failed"] += 1
+                record["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                print(
+                    f"  {record['ticket_id']}: {record['status']} "
+                    f"({record['elapsed_seconds']}s)"
+                )
+
+        workers = [asyncio.create_task(_worker()) for _ in range(concurrency)]
+        try:
+            seen: set[str] = set()
+            for ticket in iter_tickets(input_path):
+                ticket_id = ticket["ticket_id"]
+                if ticket_id in done or ticket_id in seen:
+                    counts["skipped"] += 1
+                    continue
+                seen.add(ticket_id)
+                await queue.put(ticket)
+
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+    return counts
+
+
+async def run_samples(runner: Runner, session_service: InMemorySessionService):
+    """Process all sample tickets and print results."""
 
     print("=" * 80)
     print("  SUPPORT TICKET TRIAGE AGENT — Processing Sample Tickets")
@@ -79,7 +234,7 @@ async def main():
 
         response = await process_ticket(runner, session_service, ticket)
 
-        print(response)
+        print(response or "No response content.")
         print()
 
     print("=" * 80)
@@ -87,5 +242,40 @@ async def main():
     print("=" * 80)
 
 
+async def main():
+    """Run the sample tickets, or a bulk JSONL job if ``--input`` is given."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, help="JSONL file of tickets")
+    parser.add_argument("--output", type=Path, help="JSONL file for results")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Tickets triaged at once"
+    )
+    args = parser.parse_args()
+    if args.input and not args.output:
+        parser.error("--output is required with --input")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    session_service = InMemorySessionService()
+    runner = Runner(
+        agent=root_agent,
+        app_name="support_triage",
+        session_service=session_service,
+    )
+
+    if not args.input:
+        await run_samples(runner, session_service)
+        return
+
+    print(f"Triaging {args.input} -> {args.output} (concurrency {args.concurrency})")
+    counts = await bulk_triage(
+        runner, session_service, args.input, args.output, args.concurrency
+    )
+    print(
+        f"Done: {counts['succeeded']} succeeded, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped"
+    )
+
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,134 @@
+"""Cold-start benchmark for the FastAPI server.
+
+Starts a fresh server process once per startup mode (STARTUP_WARMUP) and
+measures, from process spawn:
+
+- import:  time to ``import app`` and to ``import triage_agent.tools``
+           (each measured in its own process; no data table is loaded
+           by either, the warm-up step ``data_tables`` does that)
+- live:    first 200 from ``/health``
+- ready:   first 200 from ``/ready``
+- first:   latency of the first request that needs the agent runtime
+           (``/sessions/stats``), issued as soon as the server is ready
+
+The warm-up step timings reported by ``/ready`` are printed as well.
+Run from the repository root:
+
+    python scripts/bench_cold_start.py [--runs 3] [--modes background,blocking,off]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> tuple[int, bytes]:
+    try:
+        with urllib.request.urlopen(url, timeout=30) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def _wait_for(url: str, started: float, timeout: float = 120) -> tuple[float, bytes]:
+    while time.perf_counter() - started < timeout:
+        try:
+            status, body = _get(url)
+            if status == 200:
+                return time.perf_counter() - started, body
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def measure_import(module: str = "app") -> float:
+    """Seconds to import ``module`` in a fresh interpreter."""
+    code = (
+        f"import time; t = time.perf_counter(); import {module}; "
+        "print(time.perf_counter() - t)"
+    )
+    out = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT)
+    return float(out.decode().strip().splitlines()[-1])
+
+
+def measure_startup(mode: str) -> dict:
+    """Spawn a server in ``mode`` and time liveness, readiness, first request."""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    code = (
+        "import uvicorn, app; "
+        f"uvicorn.run(app.app, host='127.0.0.1', port={port}, log_level='warning')"
+    )
+    env = {**os.environ, "STARTUP_WARMUP": mode}
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        live, _ = _wait_for(f"{base}/health", started)
+        ready, body = _wait_for(f"{base}/ready", started)
+        request_started = time.perf_counter()
+        _get(f"{base}/sessions/stats")
+        first = time.perf_counter() - request_started
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    steps = json.loads(body).get("steps", {})
+    return {
+        "live": live,
+        "ready": ready,
+        "first": first,
+        "steps": {name: step["seconds"] for name, step in steps.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Server cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", default="background,blocking,off")
+    args = parser.parse_args()
+
+    for module in ("app", "triage_agent.tools"):
+        imports = [measure_import(module) for _ in range(args.runs)]
+        print(
+            f"import {module}: {statistics.median(imports):.3f}s "
+            f"(median of {args.runs})"
+        )
+    print()
+
+    print(f"{'mode':<12}{'live':>9}{'ready':>9}{'first':>9}   warm-up steps")
+    for mode in args.modes.split(","):
+        runs = [measure_startup(mode) for _ in range(args.runs)]
+        med = {k: statistics.median(r[k] for r in runs) for k in ("live", "ready", "first")}
+        steps = ", ".join(f"{name} {sec:.2f}s" for name, sec in runs[-1]["steps"].items())
+        print(
+            f"{mode:<12}{med['live']:>8.2f}s{med['ready']:>8.2f}s"
+            f"{med['first']:>8.3f}s   {steps or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Connection-reuse benchmark against a local OpenAI-compatible stub server.
+
+Starts a stub server that answers ``/v1/chat/completions`` and
+``/v1/embeddings`` with canned responses, counts the TCP connections it
+accepts, and delays each new connection by ``--handshake-ms`` to stand in
+for the TCP + TLS handshake to a real provider. It then makes the same
+calls with and without the shared pools:
+
+- chat: litellm default:      ``litellm.acompletion`` without ``client=``
+                              (LiteLLM's own cached clients; what ``LiteLlm``
+                              does unless ``agent.py`` passes a client)
+- chat: litellm + shared pool: ``litellm.acompletion`` with the shared
+                              client, as ``agent.py`` configures ``LiteLlm``
+- chat: shared pool:          the shared client called directly
+- embed: chromadb default:    ChromaDB's ``OpenAIEmbeddingFunction`` with
+                              the OpenAI client it creates itself
+- embed: chromadb + shared pool: the same function with the shared client,
+                              as ``vector_store.py`` configures it
+
+Run from the repository root:
+
+    python scripts/bench_http_pool.py [--calls 50] [--concurrency 4] [--handshake-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from triage_agent import http_clients
+
+CHAT_RESPONSE = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": '{"urgency": "low"}'},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+    connections = 0
+    _count_lock = threading.Lock()
+
+    def setup(self):
+        with StubHandler._count_lock:
+            StubHandler.connections += 1
+        time.sleep(self.handshake_seconds)
+        super().setup()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/embeddings"):
+            inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+            payload = {
+                "object": "list",
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [0.1] * 8}
+                    for i in range(len(inputs))
+                ],
+                "model": body["model"],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        else:
+            payload = CHAT_RESPONSE
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def _timed_calls(call, calls: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def _one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(_one() for _ in range(calls)))
+    return latencies
+
+
+def _report(name: str, latencies: list[float]) -> None:
+    connections = StubHandler.connections
+    StubHandler.connections = 0
+    print(
+        f"{name:<34}{connections:>6}{statistics.mean(latencies) * 1000:>10.1f}"
+        f"{statistics.median(latencies) * 1000:>10.1f}"
+    )
+
+
+async def run(args, base_url: str) -> None:
+    messages = [{"role": "user", "content": "Please triage this ticket."}]
+
+    print(f"{'scenario':<34}{'conns':>6}{'mean ms':>10}{'p50 ms':>10}")
+
+    # --- LLM calls ----------------------------------------------------------
+    shared = http_clients.openai_async_client(api_key="stub", base_url=base_url)
+
+    if not args.skip_litellm:
+        os.environ.setdefault("LITELLM_MODE", "PRODUCTION")
+        os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+        import litellm
+
+        async def litellm_default_chat():
+            await litellm.acompletion(
+                model="openai/stub",
+                messages=messages,
+                api_key="stub",
+                api_base=base_url,
+            )
+
+        async def litellm_shared_chat():
+            await litellm.acompletion(
+                model="openai/stub", messages=messages, client=shared
+            )
+
+        for name, call in (
+            ("chat: litellm default", litellm_default_chat),
+            ("chat: litellm + shared pool", litellm_shared_chat),
+        ):
+            _report(name, await _timed_calls(call, args.calls, args.concurrency))
+
+    async def shared_chat():
+        await shared.chat.completions.create(model="stub", messages=messages)
+
+    _report(
+        "chat: shared pool",
+        await _timed_calls(shared_chat, args.calls, args.concurrency),
+    )
+
+    # --- Embedding calls (sync, as ChromaDB makes them) ---------------------
+    from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
+
+    default_embed = OpenAIEmbeddingFunction(
+        api_key="stub", api_base=base_url, model_name="stub"
+    )
+    shared_embed = OpenAIEmbeddingFunction(
+        api_key="stub", api_base=base_url, model_name="stub"
+    )
+    shared_embed.client = http_clients.openai_client("stub", base_url=base_url)
+
+    for name, embed in (
+        ("embed: chromadb default", default_embed),
+        ("embed: chromadb + shared pool", shared_embed),
+    ):
+        _report(
+            name,
+            await _timed_calls(
+                lambda: asyncio.to_thread(embed, ["reset password"]),
+                args.calls,
+                args.concurrency,
+            ),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP connection pool benchmark")
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--handshake-ms", type=float, default=50)
+    parser.add_argument(
+        "--skip-litellm", action="store_true", help="Skip the (slow to import) LiteLLM scenario"
+    )
+    args = parser.parse_args()
+
+    StubHandler.handshake_seconds = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    print(
+        f"{args.calls} calls, concurrency {args.concurrency}, "
+        f"{args.handshake_ms:.0f} ms simulated handshake per new connection\n"
+    )
+    try:
+        asyncio.run(run(args, base_url))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Per-worker memory of the pre-fork server vs ``uvicorn --workers``.
+
+Starts the server with N workers twice, once per mode, and waits until
+every worker has finished its blocking warm-up:
+
+- prefork: ``API_WORKERS=N python app.py`` (``triage_agent.serving.prefork``;
+           tables and the agent stack loaded once in the parent, then forked)
+- spawn:   ``uvicorn app:app --workers N`` (each worker a fresh interpreter)
+
+For each worker it reads ``/proc/<pid>/smaps_rollup`` and reports:
+
+- RSS: resident memory, counting shared pages in full
+- PSS: resident memory with shared pages split between their sharers
+- USS: memory private to the worker (what killing it would free)
+
+plus the PSS of the whole server (parent and workers), which is what the
+deployment costs in total.
+
+Linux only. Run from the repository root:
+
+    python scripts/bench_prefork_memory.py [--workers 4]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 180) -> None:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as resp:
+                if resp.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):  # incl. timeouts
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def _children(pid: int) -> list[int]:
+    pids = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        pids += [int(child) for child in (task / "children").read_text().split()]
+    return pids
+
+
+def _is_worker(pid: int) -> bool:
+    # uvicorn's spawned workers share the parent with multiprocessing's
+    # resource tracker, which is not a worker
+    cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+    return b"resource_tracker" not in cmdline
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    """RSS, PSS and USS of ``pid`` in kB."""
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def measure(mode: str, workers: int) -> tuple[list[dict[str, int]], int]:
+    """Start the server in ``mode``; returns each worker's memory and the
+    total PSS (kB) of every process in the server."""
+    port = _free_port()
+    env = {
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+        **os.environ,
+        "STARTUP_WARMUP": "blocking",
+        "API_PORT": str(port),
+    }
+    if mode == "prefork":
+        env["API_WORKERS"] = str(workers)
+        command = [sys.executable, "app.py"]
+    else:
+        command = [
+            sys.executable, "-m", "uvicorn", "app:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ]
+    proc = subprocess.Popen(
+        command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_ready(f"http://127.0.0.1:{port}/ready")
+        # /ready answered from one worker; wait until the others settle too
+        previous = None
+        while True:
+            pids = [pid for pid in _children(proc.pid) if _is_worker(pid)]
+            usage = [memory_kb(pid) for pid in pids]
+            total = sum(u["rss"] for u in usage)
+            if len(pids) == workers and total == previous:
+                everything = [proc.pid, *_children(proc.pid)]
+                return usage, sum(memory_kb(pid)["pss"] for pid in everything)
+            previous = total
+            time.sleep(2)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-fork worker memory benchmark")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--modes", default="prefork,spawn")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, blocking warm-up; MB per worker (mean)\n")
+    print(f"{'mode':<10}{'RSS':>8}{'PSS':>8}{'USS':>8}   server PSS total")
+    for mode in args.modes.split(","):
+        usage, server_pss = measure(mode, args.workers)
+        mean = {k: sum(u[k] for u in usage) / len(usage) / 1024 for k in usage[0]}
+        print(
+            f"{mode:<10}{mean['rss']:>8.1f}{mean['pss']:>8.1f}"
+            f"{mean['uss']:>8.1f}   {server_pss / 1024:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""End-to-end throughput benchmark for ``/triage`` with a record/replay LLM.
+
+Starts the FastAPI server with ``LLM_CASSETTE_MODE`` set (see
+``triage_agent.cassette``) and the result cache disabled, then posts
+``--requests`` distinct tickets (the sample tickets with numbered IDs) at
+``--concurrency`` and reports throughput and latency.
+
+Record once (needs OPENAI_API_KEY and network), then replay as often as
+needed — offline and with the same model answers every time:
+
+    python scripts/bench_throughput.py --mode record --requests 30
+    python scripts/bench_throughput.py --mode replay --requests 30 --concurrency 8 [--latency 0]
+
+``--latency`` is the simulated seconds per LLM call on replay (default: the
+recorded latency). Run from the repository root.
+"""
+
+import argparse
+import asyncio
+import copy
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from triage_agent.cassette import DEFAULT_CASSETTE_PATH  # noqa: E402
+from triage_agent.sample_tickets import SAMPLE_TICKETS  # noqa: E402
+
+
+def bench_tickets(count: int) -> list[dict]:
+    """``count`` distinct tickets cycling through the sample tickets."""
+    tickets = []
+    for i in range(count):
+        ticket = copy.deepcopy(SAMPLE_TICKETS[i % len(SAMPLE_TICKETS)])
+        ticket["ticket_id"] = f"{ticket['ticket_id']}-{i:04d}"
+        tickets.append(ticket)
+    return tickets
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_live(client: httpx.AsyncClient, timeout: float = 120) -> None:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise TimeoutError(f"server not live after {timeout}s")
+
+
+async def run(base_url: str, tickets: list[dict], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    outcomes: Counter = Counter()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        await _wait_live(client)
+
+        async def _one(ticket: dict) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                resp = await client.post("/triage", json=ticket)
+                latencies.append(time.perf_counter() - started)
+                if resp.status_code != 200:
+                    outcomes[f"http_{resp.status_code}"] += 1
+                elif resp.json().get("degraded"):
+                    outcomes["degraded"] += 1
+                else:
+                    outcomes["ok"] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_one(ticket) for ticket in tickets))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"{len(tickets)} tickets, concurrency {concurrency}: "
+        f"{len(tickets) / elapsed:.2f} tickets/s in {elapsed:.2f}s"
+    )
+    print(
+        f"latency p50 {statistics.median(latencies):.3f}s  p95 {p95:.3f}s  "
+        f"max {latencies[-1]:.3f}s"
+    )
+    print("outcomes: " + ", ".join(f"{k} {v}" for k, v in sorted(outcomes.items())))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/triage throughput benchmark")
+    parser.add_argument("--mode", choices=("record", "replay"), default="replay")
+    parser.add_argument("--cassette", type=Path, default=DEFAULT_CASSETTE_PATH)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--latency", default="recorded", help="Replay seconds per LLM call, or 'recorded'"
+    )
+    args = parser.parse_args()
+
+    port = _free_port()
+    env = {
+        **os.environ,
+        "LLM_CASSETTE_MODE": args.mode,
+        "LLM_CASSETTE_PATH": str(args.cassette),
+        "LLM_REPLAY_LATENCY": args.latency,
+        # Every ticket must reach the agent
+        "RESULT_CACHE_SIZE": "0",
+        "STARTUP_WARMUP": "blocking",
+    }
+    code = (
+        "import uvicorn, app; "
+        f"uvicorn.run(app.app, host='127.0.0.1', port={port}, log_level='warning')"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=ROOT, env=env)
+    try:
+        asyncio.run(
+            run(f"http://127.0.0.1:{port}", bench_tickets(args.requests), args.concurrency)
+        )
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
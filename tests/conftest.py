@@ -0,0 +1,164 @@
+"""Shared test helpers: a configurable fake model and an ADK runner."""
+
+import asyncio
+from typing import AsyncGenerator, Callable, NamedTuple, Optional, Sequence
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.apps import App
+from google.adk.events import Event
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService, Session
+from google.genai import types
+
+APP_NAME = "triage_test"
+
+
+class FakeLlm(BaseLlm):
+    """Scripted stand-in for a real model.
+
+    Each turn requests the next of ``tool_calls`` (name, args) that has no
+    response yet; once all have been answered it replies with ``text``, or
+    with ``text(tool_results)`` if ``text`` is a function of the tool
+    responses so far. Every request is kept in ``requests``.
+    """
+
+    model: str = "fake"
+    text: str | Callable[[list[dict]], str] = "{}"
+    tool_calls: list[tuple[str, dict]] = []
+    # Raise RuntimeError(error) instead of answering
+    error: str = ""
+    # Seconds to wait before answering (or failing)
+    delay: float = 0.0
+    # Stream the text in chunks of this many characters (0: don't)
+    chunk_size: int = 0
+    usage: Optional[types.GenerateContentResponseUsageMetadata] = None
+    calls: int = 0
+    requests: list[LlmRequest] = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        self.requests.append(llm_request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+
+        tool_results = [
+            part.function_response.response
+            for content in llm_request.contents
+            for part in content.parts or []
+            if part.function_response
+        ]
+        if len(tool_results) < len(self.tool_calls):
+            turn = len(tool_results)
+            name, args = self.tool_calls[turn]
+            part = types.Part(
+                function_call=types.FunctionCall(
+                    id=f"call_fake_{turn}", name=name, args=args
+                )
+            )
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[part]),
+                usage_metadata=self.usage,
+            )
+            return
+
+        text = self.text(tool_results) if callable(self.text) else self.text
+        if stream and self.chunk_size:
+            for start in range(0, len(text), self.chunk_size):
+                yield LlmResponse(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(text=text[start : start + self.chunk_size])],
+                    ),
+                    partial=True,
+                )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=self.usage,
+        )
+
+
+class AgentRun(NamedTuple):
+    """Everything one run of ``run_agent`` produced."""
+
+    events: list[Event]
+    # The session as stored after the run
+    session: Session
+
+    @property
+    def finals(self) -> list[Event]:
+        return [
+            event
+            for event in self.events
+            if not event.partial and event.is_final_response()
+        ]
+
+    @property
+    def final_text(self) -> str:
+        """Text of the last final response ("" if there is none)."""
+        for event in reversed(self.finals):
+            if event.content and event.content.parts:
+                return event.content.parts[0].text or ""
+        return ""
+
+    @property
+    def tool_responses(self) -> list[dict]:
+        return [
+            response.response
+            for event in self.events
+            for response in event.get_function_responses()
+        ]
+
+
+def make_runner(agent: BaseAgent, plugins: Sequence[BasePlugin] = ()) -> Runner:
+    """A runner for ``agent`` with an in-memory session service."""
+    return Runner(
+        app=App(name=APP_NAME, root_agent=agent, plugins=list(plugins)),
+        session_service=InMemorySessionService(),
+    )
+
+
+async def run_agent_async(
+    runner: Runner,
+    text: str,
+    user_id: str = "CUST-001",
+    streaming: bool = False,
+) -> AgentRun:
+    """Send ``text`` to ``runner``'s agent in a new session."""
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id
+    )
+    events = [
+        event
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+            run_config=RunConfig(
+                streaming_mode=StreamingMode.SSE if streaming else StreamingMode.NONE
+            ),
+        )
+    ]
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session.id
+    )
+    return AgentRun(events, session)
+
+
+def run_agent(
+    agent: BaseAgent,
+    text: str,
+    plugins: Sequence[BasePlugin] = (),
+    user_id: str = "CUST-001",
+    streaming: bool = False,
+) -> AgentRun:
+    """Run ``agent`` on one message, to completion, in a fresh runner."""
+    return asyncio.run(
+        run_agent_async(make_runner(agent, plugins), text, user_id, streaming)
+    )
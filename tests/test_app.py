@@ -0,0 +1,1128 @@
+"""Tests for the FastAPI server, using a stubbed ADK runner."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from google.adk.events import Event
+from google.genai import types
+
+import app as server
+from triage_agent.models import ExtractedInfo, RecommendedAction, TriageResult
+from triage_agent.serving import (
+    JobQueue,
+    SemanticCache,
+    SingleFlight,
+    TTLCache,
+    parse_class_shares,
+)
+from triage_agent.serving.warmup import Warmup
+
+
+class FakeRunner:
+    """Stands in for the ADK Runner; echoes the ticket ID as the response."""
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        fail_on: set[str] | None = None,
+        final_delay: float = 0.0,
+        answer: str | None = None,
+        chunk_size: int = 0,
+    ):
+        self.delay = delay
+        self.answer = answer
+        # Stream the answer in chunks of this many characters first (0: don't)
+        self.chunk_size = chunk_size
+        self.final_delay = final_delay
+        self.fail_on = fail_on or set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.started = []
+        self.messages = []
+
+    async def run_async(self, *, user_id, session_id, new_message, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            text = new_message.parts[0].text
+            self.messages.append(text)
+            ticket_id = text.split("**Ticket ID:** ")[1].split("\n")[0]
+            self.started.append(ticket_id)
+            if ticket_id in self.fail_on:
+                raise ValueError(f"boom on {ticket_id}")
+            yield Event(
+                author="support_triage_agent",
+                content=types.Content(
+                    role="model",
+                    parts=[
+                        types.Part(
+                            function_call=types.FunctionCall(
+                                name="lookup_customer_history",
+                                args={"customer_id": user_id},
+                            )
+                        )
+                    ],
+                ),
+            )
+            yield Event(
+                author="support_triage_agent",
+                content=types.Content(
+                    role="user",
+                    parts=[
+                        types.Part(
+                            function_response=types.FunctionResponse(
+                                name="lookup_customer_history",
+                                response={"status": "found"},
+                            )
+                        )
+                    ],
+                ),
+            )
+            # Stands in for the final (slow) model call
+            await asyncio.sleep(self.final_delay)
+            if self.answer and self.chunk_size:
+                for start in range(0, len(self.answer), self.chunk_size):
+                    yield Event(
+                        author="support_triage_agent",
+                        partial=True,
+                        content=types.Content(
+                            role="model",
+                            parts=[
+                                types.Part(
+                                    text=self.answer[start : start + self.chunk_size]
+                                )
+                            ],
+                        ),
+                    )
+            yield Event(
+                author="support_triage_agent",
+                content=types.Content(
+                    role="model",
+                    parts=[
+                        types.Part(text=self.answer or f'{{"ticket": "{ticket_id}"}}')
+                    ],
+                ),
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def make_ticket(ticket_id: str, customer_id: str = "CUST-001") -> dict:
+    return {
+        "ticket_id": ticket_id,
+        "customer_id": customer_id,
+        "subject": "Payment issue",
+        "messages": [{"timestamp": "now", "content": "My payment failed"}],
+    }
+
+
+@pytest.fixture
+def fake_runner(monkeypatch):
+    runner = FakeRunner(delay=0.01)
+    monkeypatch.setattr(server, "runner", runner)
+    monkeypatch.setattr(
+        server, "result_cache", TTLCache(max_entries=100, ttl_seconds=60)
+    )
+    monkeypatch.setattr(server, "in_flight_runs", SingleFlight())
+    monkeypatch.setattr(
+        server,
+        "semantic_cache",
+        SemanticCache(max_entries=100, ttl_seconds=60, min_similarity=0.95),
+    )
+    # Nothing to warm up with a stubbed runner
+    monkeypatch.setattr(server, "STARTUP_WARMUP", "off")
+    # Prefetch hits the real tools; TestPrefetch turns it back on
+    monkeypatch.setenv("PREFETCH_CONTEXT", "false")
+    return runner
+
+
+@pytest.fixture
+def decisions():
+    seen = []
+    hook = server.decision_hooks.register(seen.append)
+    yield seen
+    server.decision_hooks.unregister(hook)
+
+
+@pytest.fixture
+def client():
+    return TestClient(server.app)
+
+
+class TestTriageEndpoint:
+    """Tests for POST /triage."""
+
+    def test_triage_returns_agent_response(self, fake_runner, client):
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "ticket_id": "TK-1",
+            "agent_response": '{"ticket": "TK-1"}',
+            "result": None,
+            "degraded": False,
+            "draft_status": None,
+            "draft_url": None,
+        }
+
+    def test_triage_agent_failure_is_500(self, fake_runner, client):
+        fake_runner.fail_on = {"TK-1"}
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.status_code == 500
+        assert "boom on TK-1" in resp.json()["detail"]
+
+
+class TestResultCache:
+    """Identical resubmissions are served from the result cache."""
+
+    def test_identical_ticket_is_cached(self, fake_runner, client):
+        first = client.post("/triage", json=make_ticket("TK-1"))
+        second = client.post("/triage", json=make_ticket("TK-1"))
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        assert fake_runner.calls == 1
+        stats = client.get("/cache/stats").json()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_changed_messages_miss_cache(self, fake_runner, client):
+        ticket = make_ticket("TK-1")
+        client.post("/triage", json=ticket)
+        ticket["messages"].append({"timestamp": "later", "content": "Any update?"})
+        resp = client.post("/triage", json=ticket)
+        assert resp.headers["X-Cache"] == "MISS"
+        assert fake_runner.calls == 2
+
+    def test_failures_are_not_cached(self, fake_runner, client):
+        fake_runner.fail_on = {"TK-1"}
+        client.post("/triage", json=make_ticket("TK-1"))
+        fake_runner.fail_on = set()
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.status_code == 200
+        assert resp.headers["X-Cache"] == "MISS"
+
+    def test_concurrent_duplicates_are_coalesced(self, fake_runner, client):
+        tickets = [make_ticket("TK-1")] * 3 + [make_ticket("TK-2")]
+        body = client.post("/triage/batch", json={"tickets": tickets}).json()
+        assert body["succeeded"] == 4
+        assert fake_runner.calls == 2
+        stats = client.get("/cache/stats").json()["single_flight"]
+        assert stats["coalesced"] == 2
+
+
+class TestBatchTriageEndpoint:
+    """Tests for POST /triage/batch."""
+
+    def test_batch_returns_results_in_order(self, fake_runner, client):
+        tickets = [make_ticket(f"TK-{i}") for i in range(5)]
+        resp = client.post("/triage/batch", json={"tickets": tickets})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [r["ticket_id"] for r in body["results"]] == [
+            f"TK-{i}" for i in range(5)
+        ]
+        assert body["succeeded"] == 5
+        assert body["failed"] == 0
+
+    def test_batch_reports_per_ticket_errors(self, fake_runner, client):
+        fake_runner.fail_on = {"TK-1"}
+        tickets = [make_ticket("TK-0"), make_ticket("TK-1"), make_ticket("TK-2")]
+        body = client.post("/triage/batch", json={"tickets": tickets}).json()
+        statuses = {r["ticket_id"]: r["status"] for r in body["results"]}
+        assert statuses == {"TK-0": "ok", "TK-1": "error", "TK-2": "ok"}
+        assert "boom on TK-1" in body["results"][1]["error"]
+        assert body["failed"] == 1
+
+    def test_batch_respects_concurrency_limit(self, fake_runner, client):
+        tickets = [make_ticket(f"TK-{i}") for i in range(10)]
+        client.post(
+            "/triage/batch", json={"tickets": tickets, "max_concurrency": 3}
+        )
+        assert fake_runner.calls == 10
+        assert 1 < fake_runner.max_in_flight <= 3
+
+    def test_batch_concurrency_capped_by_server_limit(
+        self, fake_runner, client, monkeypatch
+    ):
+        monkeypatch.setattr(server, "BATCH_CONCURRENCY", 2)
+        tickets = [make_ticket(f"TK-{i}") for i in range(6)]
+        client.post(
+            "/triage/batch", json={"tickets": tickets, "max_concurrency": 50}
+        )
+        assert fake_runner.max_in_flight <= 2
+
+    def test_batch_starts_sla_critical_tickets_first(self, fake_runner, client):
+        tickets = [
+            make_ticket("TK-free", "CUST-001"),
+            make_ticket("TK-pro", "CUST-003"),
+            make_ticket("TK-urgent", "CUST-002"),
+        ]
+        body = client.post(
+            "/triage/batch", json={"tickets": tickets, "max_concurrency": 1}
+        ).json()
+        assert fake_runner.started == ["TK-urgent", "TK-pro", "TK-free"]
+        # Results still come back in request order
+        assert [r["ticket_id"] for r in body["results"]] == [
+            "TK-free", "TK-pro", "TK-urgent",
+        ]
+
+    def test_batch_rejects_empty(self, fake_runner, client):
+        resp = client.post("/triage/batch", json={"tickets": []})
+        assert resp.status_code == 422
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamEndpoint:
+    """Tests for POST /triage/stream."""
+
+    def test_stream_emits_tool_events_then_final(self, fake_runner, client):
+        resp = client.post("/triage/stream", json=make_ticket("TK-1"))
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+
+        events = parse_sse(resp.text)
+        assert [name for name, _ in events] == [
+            "started", "tool_call", "tool_result", "final",
+        ]
+        assert events[1][1] == {
+            "name": "lookup_customer_history",
+            "args": {"customer_id": "CUST-001"},
+        }
+        assert events[2][1]["response"] == {"status": "found"}
+        assert events[3][1]["agent_response"] == '{"ticket": "TK-1"}'
+
+    def test_stream_reports_errors_as_event(self, fake_runner, client):
+        fake_runner.fail_on = {"TK-1"}
+        resp = client.post("/triage/stream", json=make_ticket("TK-1"))
+        events = parse_sse(resp.text)
+        assert events[0][0] == "started"
+        assert events[-1][0] == "error"
+        assert "boom on TK-1" in events[-1][1]["detail"]
+
+
+class TestSessionLifecycle:
+    """Sessions must not outlive their triage run."""
+
+    def test_sessions_deleted_after_run(self, fake_runner, client):
+        client.post("/triage", json=make_ticket("TK-1"))
+        client.post("/triage/batch", json={"tickets": [make_ticket("TK-2")]})
+        client.post("/triage/stream", json=make_ticket("TK-3"))
+        stats = client.get("/sessions/stats").json()
+        assert stats["sessions"] == 0
+
+    def test_sessions_deleted_after_failed_run(self, fake_runner, client):
+        fake_runner.fail_on = {"TK-1"}
+        client.post("/triage", json=make_ticket("TK-1"))
+        assert client.get("/sessions/stats").json()["sessions"] == 0
+
+
+class TestDeadlines:
+    """Runs past their deadline are cancelled and return a fallback result."""
+
+    def test_expired_deadline_returns_degraded_fallback(self, fake_runner, client):
+        fake_runner.final_delay = 5
+        ticket = {**make_ticket("TK-1", "CUST-002"), "deadline_seconds": 0.2}
+        started = time.perf_counter()
+        resp = client.post("/triage", json=ticket)
+        assert time.perf_counter() - started < 2
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["degraded"] is True
+        result = json.loads(body["agent_response"])
+        assert result["recommended_action"]["action"] == "escalate_to_human"
+        assert "lookup_customer_history" in result["reasoning"]
+        # The cancelled run still cleaned up its session
+        assert fake_runner.in_flight == 0
+        assert client.get("/sessions/stats").json()["sessions"] == 0
+
+    def test_cancelled_run_is_ended_in_metrics_plugin(
+        self, fake_runner, client, monkeypatch
+    ):
+        ended = []
+
+        class Plugin:
+            def end_session_runs(self, session_id):
+                ended.append(session_id)
+
+        monkeypatch.setattr(server, "metrics_plugin", Plugin())
+        fake_runner.final_delay = 5
+        ticket = {**make_ticket("TK-1"), "deadline_seconds": 0.2}
+        assert client.post("/triage", json=ticket).json()["degraded"] is True
+        assert len(ended) == 1
+
+    def test_deadline_from_header(self, fake_runner, client):
+        fake_runner.final_delay = 5
+        resp = client.post(
+            "/triage",
+            json=make_ticket("TK-1"),
+            headers={"X-Triage-Deadline": "0.2"},
+        )
+        assert resp.json()["degraded"] is True
+
+    def test_invalid_deadline_header_is_422(self, fake_runner, client):
+        resp = client.post(
+            "/triage",
+            json=make_ticket("TK-1"),
+            headers={"X-Triage-Deadline": "-1"},
+        )
+        assert resp.status_code == 422
+
+    def test_default_deadline_applies(self, fake_runner, client, monkeypatch):
+        monkeypatch.setattr(server, "TRIAGE_DEADLINE_SECONDS", 0.2)
+        fake_runner.final_delay = 5
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.json()["degraded"] is True
+
+    def test_degraded_results_are_not_cached(self, fake_runner, client):
+        fake_runner.final_delay = 5
+        client.post("/triage", json={**make_ticket("TK-1"), "deadline_seconds": 0.2})
+        fake_runner.final_delay = 0
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.headers["X-Cache"] == "MISS"
+        assert resp.json()["degraded"] is False
+
+    def test_run_within_deadline_is_not_degraded(self, fake_runner, client):
+        ticket = {**make_ticket("TK-1"), "deadline_seconds": 5}
+        assert client.post("/triage", json=ticket).json()["degraded"] is False
+
+    def test_batch_marks_only_slow_tickets_degraded(self, fake_runner, client):
+        fake_runner.final_delay = 0.5
+        tickets = [
+            {**make_ticket("TK-0"), "deadline_seconds": 0.1},
+            {**make_ticket("TK-1"), "deadline_seconds": 5},
+        ]
+        body = client.post("/triage/batch", json={"tickets": tickets}).json()
+        assert [r["degraded"] for r in body["results"]] == [True, False]
+        assert body["succeeded"] == 2
+
+    def test_stream_ends_with_degraded_final(self, fake_runner, client):
+        fake_runner.final_delay = 5
+        ticket = {**make_ticket("TK-1"), "deadline_seconds": 0.2}
+        events = parse_sse(client.post("/triage/stream", json=ticket).text)
+        assert [name for name, _ in events] == [
+            "started", "tool_call", "tool_result", "final",
+        ]
+        assert events[-1][1]["degraded"] is True
+        assert fake_runner.in_flight == 0
+
+    @pytest.mark.parametrize("path", ["/triage", "/triage/stream"])
+    def test_slow_fast_path_is_bounded_by_deadline(self, fake_runner, monkeypatch, path):
+        release = threading.Event()
+        monkeypatch.setattr(server, "fast_path_triage", lambda *args: release.wait(5))
+        ticket = {**make_ticket("TK-1"), "deadline_seconds": 0.2}
+        with TestClient(server.app) as client:
+            started = time.perf_counter()
+            resp = client.post(path, json=ticket)
+            elapsed = time.perf_counter() - started
+            release.set()
+        assert elapsed < 1
+        if path == "/triage":
+            assert resp.json()["degraded"] is True
+        else:
+            assert parse_sse(resp.text)[-1][1]["degraded"] is True
+        assert fake_runner.calls == 0
+
+    @pytest.mark.parametrize("path", ["/triage", "/triage/stream"])
+    def test_degraded_fallback_notifies_decision_hooks(
+        self, fake_runner, decisions, client, path
+    ):
+        fake_runner.final_delay = 5
+        ticket = {**make_ticket("TK-1"), "deadline_seconds": 0.2}
+        client.post(path, json=ticket)
+        assert [(d.ticket_id, d.field) for d in decisions] == [
+            ("TK-1", "urgency"),
+            ("TK-1", "recommended_action"),
+        ]
+        assert decisions[1].value["action"] == "escalate_to_human"
+        assert decisions[0].elapsed_seconds > 0.1
+
+    def test_deadline_exceeded_is_counted(self, fake_runner, client):
+        fake_runner.final_delay = 5
+        client.post("/triage", json={**make_ticket("TK-1"), "deadline_seconds": 0.1})
+        assert "triage_deadline_exceeded_total" in client.get("/metrics").text
+
+
+class TestFastPath:
+    """Clear-cut tickets are answered without running the agent."""
+
+    @pytest.fixture
+    def fast_result(self, monkeypatch):
+        result = TriageResult(
+            urgency="low",
+            extracted_info=ExtractedInfo(
+                product_area="ui",
+                issue_type="question",
+                customer_sentiment="neutral",
+                language="english",
+            ),
+            recommended_action=RecommendedAction(
+                action="auto_respond", reason="Simple how-to question"
+            ),
+            reasoning="Rule-based fast path",
+            draft_response="Go to Settings > Appearance.",
+        )
+        monkeypatch.setattr(server, "fast_path_triage", lambda *args: result)
+        return result
+
+    def test_fast_path_skips_agent(self, fake_runner, fast_result, client):
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.status_code == 200
+        assert json.loads(resp.json()["agent_response"]) == fast_result.model_dump()
+        assert fake_runner.calls == 0
+
+    def test_stream_goes_straight_to_final(self, fake_runner, fast_result, client):
+        events = parse_sse(client.post("/triage/stream", json=make_ticket("TK-1")).text)
+        assert [name for name, _ in events] == ["started", "final"]
+        assert fake_runner.calls == 0
+
+    @pytest.mark.parametrize("path", ["/triage", "/triage/stream"])
+    def test_fast_path_notifies_decision_hooks(
+        self, fake_runner, fast_result, decisions, client, path
+    ):
+        client.post(path, json=make_ticket("TK-1"))
+        assert [(d.field, d.value) for d in decisions] == [
+            ("urgency", "low"),
+            ("recommended_action", fast_result.recommended_action.model_dump()),
+        ]
+
+    def test_fast_path_can_be_disabled(
+        self, fake_runner, fast_result, client, monkeypatch
+    ):
+        monkeypatch.setattr(server, "FAST_PATH_ENABLED", False)
+        client.post("/triage", json=make_ticket("TK-1"))
+        assert fake_runner.calls == 1
+
+    def test_miss_falls_through_to_agent(self, fake_runner, client, monkeypatch):
+        monkeypatch.setattr(server, "fast_path_triage", lambda *args: None)
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.json()["agent_response"] == '{"ticket": "TK-1"}'
+        assert fake_runner.calls == 1
+
+
+class TestPrefetch:
+    """Customer context is fetched before the agent starts."""
+
+    @pytest.fixture
+    def prefetched(self, monkeypatch):
+        results = [
+            ("lookup_customer_history", {"customer_id": "CUST-001"}, {"plan": "pro"}),
+            ("check_sla_status", {"customer_id": "CUST-001"}, {"sla_at_risk": False}),
+        ]
+
+        async def _prefetch(customer_id, subject):
+            return results
+
+        monkeypatch.setenv("PREFETCH_CONTEXT", "true")
+        monkeypatch.setattr(server, "prefetch_context", _prefetch)
+        return results
+
+    def test_context_is_added_to_first_message(self, fake_runner, prefetched, client):
+        client.post("/triage", json=make_ticket("TK-1"))
+        [message] = fake_runner.messages
+        assert "**Prefetched Context**" in message
+        assert '{"plan": "pro"}' in message
+
+    def test_cache_key_ignores_prefetched_context(
+        self, fake_runner, prefetched, client
+    ):
+        client.post("/triage", json=make_ticket("TK-1"))
+        prefetched[0] = ("lookup_customer_history", {}, {"plan": "enterprise"})
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.headers["X-Cache"] == "HIT"
+        assert fake_runner.calls == 1
+
+    def test_stream_reports_prefetched_results(self, fake_runner, prefetched, client):
+        events = parse_sse(client.post("/triage/stream", json=make_ticket("TK-1")).text)
+        assert [name for name, _ in events] == [
+            "started", "tool_result", "tool_result",
+            "tool_call", "tool_result", "final",
+        ]
+        assert events[1][1] == {
+            "name": "lookup_customer_history",
+            "response": {"plan": "pro"},
+        }
+
+    def test_nothing_prefetched_leaves_message_unchanged(
+        self, fake_runner, prefetched, client
+    ):
+        prefetched.clear()
+        client.post("/triage", json=make_ticket("TK-1"))
+        assert "Prefetched" not in fake_runner.messages[0]
+
+
+class TestStructuredResult:
+    """Responses carry the answer validated as a TriageResult."""
+
+    ANSWER = {
+        "urgency": "high",
+        "extracted_info": {
+            "product_area": "billing",
+            "issue_type": "payment_failure",
+            "customer_sentiment": "frustrated",
+            "language": "english",
+        },
+        "recommended_action": {
+            "action": "route_to_specialist",
+            "route_to": "billing_team",
+            "reason": "Card declined",
+        },
+        "reasoning": "Payment failed",
+        "draft_response": "Sorry about that",
+        "confidence": 0.9,
+    }
+
+    def test_valid_answer_is_returned_as_is(self, fake_runner, client):
+        fake_runner.answer = json.dumps(self.ANSWER)
+        body = client.post("/triage", json=make_ticket("TK-1")).json()
+        assert body["agent_response"] == fake_runner.answer
+        assert body["result"] == self.ANSWER
+
+    def test_malformed_answer_is_repaired_without_rerun(self, fake_runner, client):
+        # Upper-case urgency, cut off mid-draft
+        text = json.dumps({**self.ANSWER, "urgency": "High"})
+        fake_runner.answer = text[: text.index("Sorry about") + 5]
+        body = client.post("/triage", json=make_ticket("TK-1")).json()
+        assert fake_runner.calls == 1
+        assert body["result"]["urgency"] == "high"
+        assert body["result"]["draft_response"] == "Sorry"
+        assert json.loads(body["agent_response"]) == body["result"]
+
+    def test_cached_repair_is_served_valid(self, fake_runner, client):
+        fake_runner.answer = json.dumps(self.ANSWER).replace('"high"', '"HIGH"')
+        first = client.post("/triage", json=make_ticket("TK-1")).json()
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        assert resp.headers["X-Cache"] == "HIT"
+        assert resp.json()["result"] == first["result"]
+
+    def test_non_triage_answer_has_no_result(self, fake_runner, client):
+        body = client.post("/triage", json=make_ticket("TK-1")).json()
+        assert body["agent_response"] == '{"ticket": "TK-1"}'
+        assert body["result"] is None
+
+
+class TestEarlyDecisions:
+    """Urgency and action are acted on before the answer is complete."""
+
+    @pytest.fixture
+    def streaming_runner(self, fake_runner):
+        answer = dict(TestStructuredResult.ANSWER, urgency="critical")
+        fake_runner.answer = json.dumps(answer)
+        fake_runner.chunk_size = 16
+        return fake_runner
+
+    def test_hooks_receive_urgency_and_action(
+        self, streaming_runner, decisions, client
+    ):
+        assert client.post("/triage", json=make_ticket("TK-1")).status_code == 200
+        assert [(d.ticket_id, d.field) for d in decisions] == [
+            ("TK-1", "urgency"),
+            ("TK-1", "recommended_action"),
+        ]
+        assert decisions[0].value == "critical"
+        assert decisions[1].value["action"] == "route_to_specialist"
+
+    def test_stream_emits_decisions_before_final(self, streaming_runner, client):
+        events = parse_sse(client.post("/triage/stream", json=make_ticket("TK-1")).text)
+        assert [name for name, _ in events] == [
+            "started", "tool_call", "tool_result", "decision", "decision", "final",
+        ]
+        assert events[3][1] == {"field": "urgency", "value": "critical"}
+
+    def test_unstreamed_answer_still_notifies(self, fake_runner, decisions, client):
+        fake_runner.answer = json.dumps(TestStructuredResult.ANSWER)
+        client.post("/triage", json=make_ticket("TK-1"))
+        assert [d.field for d in decisions] == ["urgency", "recommended_action"]
+
+    def test_cached_result_does_not_notify_again(
+        self, fake_runner, decisions, client
+    ):
+        fake_runner.answer = json.dumps(TestStructuredResult.ANSWER)
+        client.post("/triage", json=make_ticket("TK-1"))
+        resp = client.post("/triage", json=make_ticket("TK-1"))
+        # A webhook retry must not page on-call a second time
+        assert resp.headers["X-Cache"] == "HIT"
+        assert [d.field for d in decisions] == ["urgency", "recommended_action"]
+
+    def test_failing_hook_does_not_fail_run(self, streaming_runner, client):
+        def broken(decision):
+            raise RuntimeError("pager down")
+
+        server.decision_hooks.register(broken)
+        try:
+            resp = client.post("/triage", json=make_ticket("TK-1"))
+        finally:
+            server.decision_hooks.unregister(broken)
+        assert resp.json()["result"]["urgency"] == "critical"
+
+
+class TestThreadBudget:
+    """Long message threads are windowed before reaching the agent."""
+
+    def test_long_thread_is_summarized(self, fake_runner, client, monkeypatch):
+        monkeypatch.setenv("THREAD_TOKEN_BUDGET", "300")
+        ticket = make_ticket("TK-1")
+        ticket["messages"] = [
+            {"timestamp": f"t{i:02d}", "content": f"Update {i}: still waiting. " * 10}
+            for i in range(40)
+        ]
+        saved = server.metrics.THREAD_TOKENS_SAVED._value.get()
+        assert client.post("/triage", json=ticket).status_code == 200
+        [message] = fake_runner.messages
+        assert "earlier messages summarized" in message
+        assert "[t00]" in message and "[t39]" in message
+        assert server.metrics.THREAD_TOKENS_SAVED._value.get() > saved
+
+
+    def test_threads_differing_only_in_windowed_messages_are_cached_apart(
+        self, fake_runner, client, monkeypatch
+    ):
+        monkeypatch.setenv("THREAD_TOKEN_BUDGET", "300")
+        ticket = make_ticket("TK-1")
+        ticket["messages"] = [
+            {"timestamp": f"t{i:02d}", "content": f"Update {i}: still waiting. " * 10}
+            for i in range(40)
+        ]
+        edited = json.loads(json.dumps(ticket))
+        edited["messages"][20]["content"] = "Actually, please cancel my account."
+        # The edited message falls in the summarized part of the thread
+        assert server.build_user_message(
+            server.TicketRequest(**ticket)
+        ) == server.build_user_message(server.TicketRequest(**edited))
+
+        client.post("/triage", json=ticket)
+        resp = client.post("/triage", json=edited)
+        assert resp.headers["X-Cache"] == "MISS"
+        assert fake_runner.calls == 2
+
+
+class TestReadiness:
+    """Tests for GET /ready and the startup warm-up."""
+
+    def test_ready_only_after_background_warmup(self, monkeypatch):
+        release = threading.Event()
+        monkeypatch.setattr(server, "STARTUP_WARMUP", "background")
+        monkeypatch.setattr(server, "warmup", Warmup([("step", release.wait)]))
+        with TestClient(server.app) as client:
+            assert client.get("/health").status_code == 200
+            resp = client.get("/ready")
+            assert resp.status_code == 503
+            assert resp.json()["status"] == "warming_up"
+
+            release.set()
+            for _ in range(200):
+                resp = client.get("/ready")
+                if resp.status_code == 200:
+                    break
+                time.sleep(0.005)
+        assert resp.status_code == 200
+        assert resp.json()["steps"]["step"]["ok"] is True
+
+    def test_blocking_warmup_is_ready_on_first_request(self, monkeypatch):
+        monkeypatch.setattr(server, "STARTUP_WARMUP", "blocking")
+        monkeypatch.setattr(
+            server, "warmup", Warmup([("step", lambda: time.sleep(0.05))])
+        )
+        with TestClient(server.app) as client:
+            assert client.get("/ready").status_code == 200
+
+    def test_health_answers_while_warmup_builds_runtime(self, monkeypatch):
+        monkeypatch.setattr(server, "STARTUP_WARMUP", "off")
+        for name in ("session_service", "runner", "draft_runner", "metrics_plugin"):
+            monkeypatch.setattr(server, name, None)
+        with TestClient(server.app) as client:
+            # The warm-up thread holds the lock while it imports the agent
+            with server._runtime_lock:
+                stats = threading.Thread(
+                    target=client.get, args=("/sessions/stats",)
+                )
+                stats.start()
+                time.sleep(0.1)
+                started = time.perf_counter()
+                assert client.get("/health").status_code == 200
+                elapsed = time.perf_counter() - started
+            stats.join(30)
+        assert elapsed < 0.5
+
+    def test_warmup_off_is_ready_immediately(self, monkeypatch):
+        monkeypatch.setattr(server, "STARTUP_WARMUP", "off")
+        monkeypatch.setattr(server, "warmup", Warmup([]))
+        with TestClient(server.app) as client:
+            assert client.get("/ready").json()["status"] == "ready"
+
+
+def make_job_queue(**kwargs) -> JobQueue:
+    return JobQueue(
+        server.run_triage_job,
+        classify=server.classify_ticket,
+        class_shares=parse_class_shares(""),
+        **kwargs,
+    )
+
+
+class TestJobEndpoints:
+    """Tests for POST /triage/jobs and GET /triage/jobs/{id}."""
+
+    def wait_for_job(self, client, status_url):
+        for _ in range(200):
+            body = client.get(status_url).json()
+            if body["status"] in ("succeeded", "failed"):
+                return body
+            time.sleep(0.005)
+        raise AssertionError("job did not finish")
+
+    def test_submit_then_poll_result(self, fake_runner, monkeypatch):
+        monkeypatch.setattr(
+            server, "job_queue", make_job_queue(workers=2, max_queue=10)
+        )
+        with TestClient(server.app) as client:
+            resp = client.post("/triage/jobs", json=make_ticket("TK-1"))
+            assert resp.status_code == 202
+            body = self.wait_for_job(client, resp.json()["status_url"])
+
+        assert body["status"] == "succeeded"
+        assert body["ticket_id"] == "TK-1"
+        assert body["priority_class"] == "free"
+        assert body["result"]["agent_response"] == '{"ticket": "TK-1"}'
+
+    def test_failed_job_reports_error(self, fake_runner, monkeypatch):
+        fake_runner.fail_on = {"TK-1"}
+        monkeypatch.setattr(
+            server, "job_queue", make_job_queue(workers=1, max_queue=10)
+        )
+        with TestClient(server.app) as client:
+            resp = client.post("/triage/jobs", json=make_ticket("TK-1"))
+            body = self.wait_for_job(client, resp.json()["status_url"])
+
+        assert body["status"] == "failed"
+        assert "boom on TK-1" in body["error"]
+
+    def test_full_queue_returns_429(self, fake_runner, monkeypatch):
+        fake_runner.delay = 0.5
+        monkeypatch.setattr(
+            server, "job_queue", make_job_queue(workers=1, max_queue=1)
+        )
+        with TestClient(server.app) as client:
+            statuses = [
+                client.post("/triage/jobs", json=make_ticket(f"TK-{i}")).status_code
+                for i in range(4)
+            ]
+            rejected = client.post("/triage/jobs", json=make_ticket("TK-9"))
+
+        assert 429 in statuses
+        assert rejected.status_code == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+
+    def test_unknown_job_is_404(self, client):
+        assert client.get("/triage/jobs/nope").status_code == 404
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_metrics_exposes_request_latency_and_gauges(self, fake_runner, client):
+        client.post("/triage", json=make_ticket("TK-1"))
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        body = resp.text
+        assert 'triage_http_request_duration_seconds_count{method="POST",path="/triage",status="200"}' in body
+        assert "triage_jobs_queued" in body
+        assert "triage_sessions" in body
+
+    def test_metrics_use_route_template_for_path(self, client):
+        client.get("/triage/jobs/some-unknown-id")
+        assert 'path="/triage/jobs/{job_id}"' in client.get("/metrics").text
+
+
+class FakeDraftRunner:
+    """Stands in for the draft writer's Runner."""
+
+    app_name = "support_triage_drafts"
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.messages = []
+
+    async def run_async(self, *, user_id, session_id, new_message, **kwargs):
+        self.messages.append(new_message.parts[0].text)
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("writer down")
+        yield Event(
+            author="draft_writer",
+            content=types.Content(role="model", parts=[types.Part(text="Hi, we're on it.")]),
+        )
+
+
+class TestDeferredDrafts:
+    """Two-phase triage: classification first, draft response afterwards."""
+
+    @pytest.fixture
+    def drafts(self, fake_runner, monkeypatch):
+        monkeypatch.setenv("DEFERRED_DRAFTS", "true")
+        monkeypatch.delenv("DRAFT_ACTIONS", raising=False)
+        writer = FakeDraftRunner()
+        monkeypatch.setattr(server, "draft_runner", writer)
+        monkeypatch.setattr(
+            server,
+            "draft_queue",
+            JobQueue(server.run_draft_job, workers=2, max_queue=10, result_ttl_seconds=60),
+        )
+        fake_runner.answer = json.dumps(
+            {**TestStructuredResult.ANSWER, "draft_response": None}
+        )
+        return writer
+
+    def test_triage_returns_before_draft_then_draft_is_fetched(self, drafts):
+        with TestClient(server.app) as client:
+            body = client.post("/triage", json=make_ticket("TK-1")).json()
+            assert body["result"]["urgency"] == "high"
+            assert body["result"]["draft_response"] == ""
+            assert body["draft_status"] == "pending"
+            draft = client.get(body["draft_url"], params={"wait": 5}).json()
+
+        assert draft["status"] == "ready"
+        assert draft["ticket_id"] == "TK-1"
+        assert draft["draft_response"] == "Hi, we're on it."
+        # The writer sees the ticket and its classification
+        assert "**Ticket ID:** TK-1" in drafts.messages[0]
+        assert '"route_to": "billing_team"' in drafts.messages[0]
+
+    def test_stream_attaches_draft_after_final(self, drafts):
+        with TestClient(server.app) as client:
+            events = parse_sse(
+                client.post("/triage/stream", json=make_ticket("TK-1")).text
+            )
+        names = [name for name, _ in events]
+        assert names[-2:] == ["final", "draft"]
+        assert events[-2][1]["draft_status"] == "pending"
+        assert events[-1][1]["draft_response"] == "Hi, we're on it."
+
+    def test_stream_stops_waiting_for_draft_at_deadline(self, drafts, monkeypatch):
+        async def stalled(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(server, "generate_draft", stalled)
+        ticket = {**make_ticket("TK-1"), "deadline_seconds": 0.5}
+        with TestClient(server.app) as client:
+            started = time.perf_counter()
+            events = parse_sse(client.post("/triage/stream", json=ticket).text)
+            elapsed = time.perf_counter() - started
+        assert elapsed < 2
+        assert events[-1][0] == "draft"
+        assert events[-1][1]["status"] == "pending"
+
+    def test_cached_result_keeps_its_draft(self, drafts):
+        with TestClient(server.app) as client:
+            first = client.post("/triage", json=make_ticket("TK-1")).json()
+            client.get(first["draft_url"], params={"wait": 5})
+            second = client.post("/triage", json=make_ticket("TK-1")).json()
+        assert second["draft_url"] == first["draft_url"]
+        assert second["draft_status"] == "ready"
+
+    def test_actions_outside_draft_actions_get_no_draft(self, drafts, monkeypatch):
+        monkeypatch.setenv("DRAFT_ACTIONS", "auto_respond")
+        with TestClient(server.app) as client:
+            body = client.post("/triage", json=make_ticket("TK-1")).json()
+        assert body["draft_status"] is None
+        assert drafts.messages == []
+
+    def test_failed_draft_is_reported(self, drafts):
+        drafts.fail = True
+        with TestClient(server.app) as client:
+            body = client.post("/triage", json=make_ticket("TK-1")).json()
+            draft = client.get(body["draft_url"], params={"wait": 5}).json()
+        assert draft["status"] == "failed"
+        assert "writer down" in draft["error"]
+
+    def test_unknown_draft_is_404(self, client):
+        assert client.get("/triage/drafts/nope").status_code == 404
+
+
+class TestSemanticCache:
+    """Near-duplicate tickets reuse a recent ticket's classification."""
+
+    VOCABULARY = ("error", "500", "dashboard", "refund", "invoice")
+
+    @pytest.fixture
+    def embeddings(self, fake_runner, monkeypatch):
+        monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "true")
+        monkeypatch.setattr(server, "FAST_PATH_ENABLED", False)
+        embedded = []
+
+        def embed(text):
+            embedded.append(text)
+            words = text.lower().split()
+            return [float(words.count(word)) for word in self.VOCABULARY]
+
+        monkeypatch.setattr(server, "embed_text", embed)
+        fake_runner.answer = json.dumps(
+            {
+                **TestStructuredResult.ANSWER,
+                "draft_response": "Hi Alice, we're looking into TK-1.",
+            }
+        )
+        return embedded
+
+    @staticmethod
+    def outage_ticket(ticket_id: str, customer_id: str, message: str) -> dict:
+        return {
+            "ticket_id": ticket_id,
+            "customer_id": customer_id,
+            "subject": "Dashboard down",
+            "messages": [
+                {"timestamp": "t0", "content": "It was fine yesterday"},
+                {"timestamp": "t1", "content": message},
+            ],
+        }
+
+    def test_near_duplicate_reuses_result(self, embeddings, fake_runner, client):
+        first = client.post(
+            "/triage", json=self.outage_ticket("TK-1", "CUST-001", "error 500 everywhere")
+        )
+        second = client.post(
+            "/triage",
+            json=self.outage_ticket("TK-2", "CUST-001", "also getting error 500 here"),
+        )
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "SIMILAR"
+        assert fake_runner.calls == 1
+        result = second.json()["result"]
+        assert result["recommended_action"] == TestStructuredResult.ANSWER["recommended_action"]
+        assert result["draft_response"] == "Hi Alice, we're looking into TK-2."
+        # Subject and latest message only
+        assert embeddings[0] == "Dashboard down\nerror 500 everywhere"
+
+        # A retry of the reused ticket is an exact hit
+        retry = client.post(
+            "/triage",
+            json=self.outage_ticket("TK-2", "CUST-001", "also getting error 500 here"),
+        )
+        assert retry.headers["X-Cache"] == "HIT"
+        assert len(embeddings) == 2
+
+    def test_near_duplicate_notifies_decision_hooks(
+        self, embeddings, fake_runner, decisions, client
+    ):
+        client.post("/triage", json=self.outage_ticket("TK-1", "CUST-001", "error 500"))
+        resp = client.post(
+            "/triage", json=self.outage_ticket("TK-2", "CUST-001", "error 500 again")
+        )
+        assert resp.headers["X-Cache"] == "SIMILAR"
+        assert [(d.ticket_id, d.field) for d in decisions[2:]] == [
+            ("TK-2", "urgency"),
+            ("TK-2", "recommended_action"),
+        ]
+        assert decisions[2].value == "high"
+        assert decisions[3].value["route_to"] == "billing_team"
+
+    def test_other_customer_profile_or_topic_runs_agent(
+        self, embeddings, fake_runner, client
+    ):
+        client.post("/triage", json=self.outage_ticket("TK-1", "CUST-001", "error 500"))
+        other_plan = client.post(
+            "/triage", json=self.outage_ticket("TK-2", "CUST-002", "error 500")
+        )
+        other_topic = client.post(
+            "/triage", json=self.outage_ticket("TK-3", "CUST-001", "refund my invoice")
+        )
+        assert other_plan.headers["X-Cache"] == "MISS"
+        assert other_topic.headers["X-Cache"] == "MISS"
+        assert fake_runner.calls == 3
+
+        stats = client.get("/cache/stats").json()["semantic"]
+        assert stats["entries"] == 3
+        assert stats["hits"] == 0
+        assert stats["misses"] == 3
+
+    def test_embedding_failure_falls_back_to_agent(
+        self, embeddings, fake_runner, client, monkeypatch
+    ):
+        def fail(text):
+            raise RuntimeError("embeddings down")
+
+        monkeypatch.setattr(server, "embed_text", fail)
+        for ticket_id in ("TK-1", "TK-2"):
+            resp = client.post(
+                "/triage", json=self.outage_ticket(ticket_id, "CUST-001", "error 500")
+            )
+            assert resp.headers["X-Cache"] == "MISS"
+        assert fake_runner.calls == 2
+        assert len(server.semantic_cache) == 0
+
+    def test_slow_embedding_is_bounded_by_deadline(
+        self, embeddings, fake_runner, monkeypatch
+    ):
+        release = threading.Event()
+        monkeypatch.setattr(server, "embed_text", lambda text: release.wait(5))
+        ticket = {
+            **self.outage_ticket("TK-1", "CUST-001", "error 500"),
+            "deadline_seconds": 0.2,
+        }
+        with TestClient(server.app) as client:
+            started = time.perf_counter()
+            resp = client.post("/triage", json=ticket)
+            elapsed = time.perf_counter() - started
+            release.set()
+        assert elapsed < 1
+        assert resp.headers["X-Cache"] == "MISS"
+        assert resp.json()["degraded"] is True
+
+    def test_duplicate_joining_during_lookup_keeps_its_deadline(
+        self, embeddings, fake_runner, monkeypatch
+    ):
+        # The second copy's embedding finishes after the first copy's run
+        # has started, so it joins that run
+        def embed(text):
+            if len(embeddings) == 1:
+                time.sleep(0.1)
+            embeddings.append(text)
+            return [1.0] * len(self.VOCABULARY)
+
+        monkeypatch.setattr(server, "embed_text", embed)
+        fake_runner.final_delay = 1
+        ticket = server.TicketRequest(
+            **self.outage_ticket("TK-1", "CUST-001", "error 500")
+        )
+
+        async def timed(deadline_seconds):
+            started = time.perf_counter()
+            run, source = await server.run_triage_cached(
+                ticket, server.deadline_after(deadline_seconds)
+            )
+            return run, source, time.perf_counter() - started
+
+        async def scenario():
+            return await asyncio.gather(timed(10), timed(0.3))
+
+        (leader, leader_source, _), (follower, source, elapsed) = asyncio.run(
+            scenario()
+        )
+        assert (leader_source, leader.degraded) == ("miss", False)
+        assert (source, follower.degraded) == ("coalesced", True)
+        assert elapsed < 0.8
+        assert fake_runner.calls == 1
+
+    def test_disabled_by_default(self, embeddings, fake_runner, client, monkeypatch):
+        monkeypatch.delenv("SEMANTIC_CACHE_ENABLED")
+        for ticket_id in ("TK-1", "TK-2"):
+            client.post(
+                "/triage", json=self.outage_ticket(ticket_id, "CUST-001", "error 500")
+            )
+        assert fake_runner.calls == 2
+        assert embeddings == []
@@ -0,0 +1,51 @@
+"""Tests for the LRU + TTL result cache."""
+
+from triage_agent.serving.cache import TTLCache, content_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Test suite for TTLCache."""
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(max_entries=10, ttl_seconds=60)
+        assert cache.get("a") is None
+        cache.set("a", "value")
+        assert cache.get("a") == "value"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(max_entries=10, ttl_seconds=60, clock=clock)
+        cache.set("a", "value")
+        clock.now = 59
+        assert cache.get("a") == "value"
+        clock.now = 61
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_content_key_is_stable_and_content_sensitive(self):
+        assert content_key("ticket") == content_key("ticket")
+        assert content_key("ticket") != content_key("ticket ")
@@ -0,0 +1,103 @@
+"""Tests for the cheap-model-first triage cascade."""
+
+import json
+
+import pytest
+from google.adk.agents import LlmAgent
+
+from tests.conftest import AgentRun, FakeLlm, run_agent
+from triage_agent.cascade import CascadeAgent, escalation_reason
+
+
+def answer(urgency="low", action="auto_respond", confidence=0.9) -> str:
+    return json.dumps(
+        {
+            "urgency": urgency,
+            "extracted_info": {
+                "product_area": "ui",
+                "issue_type": "question",
+                "customer_sentiment": "neutral",
+                "language": "english",
+            },
+            "recommended_action": {"action": action, "reason": "test"},
+            "reasoning": "test",
+            "draft_response": "Hi",
+            "confidence": confidence,
+        }
+    )
+
+
+def run_cascade(
+    cheap_llm: FakeLlm, full_llm: FakeLlm, streaming: bool = False
+) -> AgentRun:
+    agent = CascadeAgent(
+        name="cascade",
+        sub_agents=[
+            LlmAgent(name="cheap", model=cheap_llm, instruction="Triage."),
+            LlmAgent(name="full", model=full_llm, instruction="Triage."),
+        ],
+    )
+    return run_agent(agent, "help", streaming=streaming)
+
+
+class TestEscalationReason:
+    """Test suite for escalation_reason."""
+
+    @pytest.mark.parametrize(
+        "text, reason",
+        [
+            (answer(), None),
+            (answer(urgency="high", action="route_to_specialist"), None),
+            ("not json", "invalid"),
+            (answer(urgency="urgent"), "invalid"),
+            (answer(confidence=0.5), "low_confidence"),
+            (answer(confidence=None), "low_confidence"),
+            (answer(urgency="critical"), "critical"),
+            (answer(action="escalate_to_human"), "escalate_to_human"),
+        ],
+    )
+    def test_reasons(self, text, reason):
+        assert escalation_reason(text, min_confidence=0.7) == reason
+
+
+class TestCascadeAgent:
+    """CascadeAgent answers with the cheap model unless it must escalate."""
+
+    def test_confident_routine_answer_is_accepted(self):
+        cheap, full = FakeLlm(text=answer()), FakeLlm(text=answer(urgency="high"))
+        finals = run_cascade(cheap, full).finals
+        assert full.calls == 0
+        assert [event.author for event in finals] == ["cheap"]
+        assert finals[0].custom_metadata["cascade"] == {
+            "answered_by": "cheap",
+            "escalation_reason": None,
+        }
+
+    def test_hard_tail_is_rerun_on_full_model(self):
+        cheap = FakeLlm(text=answer(urgency="critical"))
+        full = FakeLlm(text=answer(urgency="high", action="route_to_specialist"))
+        run = run_cascade(cheap, full)
+        finals = run.finals
+        assert full.calls == 1
+        assert [event.author for event in finals] == ["full"]
+        assert finals[0].custom_metadata["cascade"] == {
+            "answered_by": "full",
+            "escalation_reason": "critical",
+        }
+        # The rejected cheap answer is not stored in the session
+        assert "cheap" not in [event.author for event in run.session.events]
+
+    def test_cheap_model_failure_escalates(self):
+        cheap, full = FakeLlm(error="rate limited"), FakeLlm(text=answer())
+        finals = run_cascade(cheap, full).finals
+        assert [event.author for event in finals] == ["full"]
+        assert finals[0].custom_metadata["cascade"]["escalation_reason"] == "error"
+
+    def test_streamed_cheap_answer_is_not_passed_on(self):
+        cheap = FakeLlm(text=answer(urgency="critical"), chunk_size=20)
+        full = FakeLlm(text=answer(urgency="high"), chunk_size=20)
+        run = run_cascade(cheap, full, streaming=True)
+        # Only the full model's chunks reach consumers acting on early fields
+        assert {event.author for event in run.events if event.partial} == {"full"}
+        finals = run.finals
+        assert [event.author for event in finals] == ["full"]
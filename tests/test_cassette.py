@@ -0,0 +1,125 @@
+"""Tests for the record/replay LLM wrapper."""
+
+import json
+import time
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm
+from google.genai import types
+
+from tests.conftest import FakeLlm, run_agent
+from triage_agent.cassette import CassetteLlm, CassetteMissError, wrap_model
+from triage_agent.prefetch import format_prefetched_context
+
+
+def scripted_llm() -> FakeLlm:
+    """Calls ``lookup_plan`` on the first turn, then answers with the plan."""
+    return FakeLlm(
+        model="scripted",
+        tool_calls=[("lookup_plan", {"customer_id": "C1"})],
+        text=lambda results: json.dumps({"plan": results[0]["plan"]}),
+        delay=0.05,
+        usage=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=100, candidates_token_count=10
+        ),
+    )
+
+
+def run_ticket(model: BaseLlm, text: str, plan: str = "pro") -> tuple[str, list]:
+    """Run one ticket; returns the final answer and the tool executions."""
+    executions = []
+
+    def lookup_plan(customer_id: str) -> dict:
+        """Look up the customer's plan."""
+        executions.append(customer_id)
+        return {"plan": plan}
+
+    agent = LlmAgent(
+        name="cassette_test_agent",
+        model=model,
+        instruction="Triage.",
+        tools=[lookup_plan],
+    )
+    return run_agent(agent, text, user_id="C1").final_text, executions
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    return tmp_path / "llm.jsonl"
+
+
+class TestCassetteLlm:
+    """Test suite for CassetteLlm record and replay."""
+
+    def test_replay_reproduces_recorded_run(self, cassette):
+        recorder = CassetteLlm(
+            model="scripted", inner=scripted_llm(), mode="record", cassette_path=cassette
+        )
+        recorded, _ = run_ticket(recorder, "Ticket TK-1")
+        entries = [json.loads(line) for line in cassette.read_text().splitlines()]
+        assert [entry["turn"] for entry in entries] == [0, 1]
+        # Provider call IDs are not replayed
+        call = entries[0]["responses"][0]["content"]["parts"][0]["function_call"]
+        assert "id" not in call
+
+        replayer = CassetteLlm(
+            model="scripted", mode="replay", cassette_path=cassette, replay_latency=0
+        )
+        replayed, executions = run_ticket(replayer, "Ticket TK-1")
+        assert replayed == recorded == '{"plan": "pro"}'
+        # Tools still run for real on replay
+        assert executions == ["C1"]
+
+    def test_replay_ignores_prefetched_context_and_tool_output(self, cassette):
+        recorder = CassetteLlm(
+            model="scripted", inner=scripted_llm(), mode="record", cassette_path=cassette
+        )
+        run_ticket(recorder, "Ticket TK-1")
+
+        prefetched = format_prefetched_context([("lookup_plan", {}, {"plan": "x"})])
+        replayer = CassetteLlm(
+            model="scripted", mode="replay", cassette_path=cassette, replay_latency=0
+        )
+        replayed, _ = run_ticket(replayer, "Ticket TK-1\n\n" + prefetched, plan="free")
+        assert replayed == '{"plan": "pro"}'
+
+    def test_recorded_latency_is_simulated(self, cassette):
+        recorder = CassetteLlm(
+            model="scripted", inner=scripted_llm(), mode="record", cassette_path=cassette
+        )
+        run_ticket(recorder, "Ticket TK-1")
+
+        replayer = CassetteLlm(model="scripted", mode="replay", cassette_path=cassette)
+        started = time.perf_counter()
+        run_ticket(replayer, "Ticket TK-1")
+        assert time.perf_counter() - started >= 0.1
+
+    def test_unrecorded_request_raises(self, cassette):
+        replayer = CassetteLlm(model="scripted", mode="replay", cassette_path=cassette)
+        with pytest.raises(CassetteMissError):
+            run_ticket(replayer, "Ticket TK-2")
+
+
+class TestWrapModel:
+    """Test suite for wrap_model."""
+
+    def test_off_returns_model_unchanged(self, monkeypatch):
+        monkeypatch.delenv("LLM_CASSETTE_MODE", raising=False)
+        model = scripted_llm()
+        assert wrap_model(model) is model
+
+    def test_replay_settings_from_env(self, monkeypatch, cassette):
+        monkeypatch.setenv("LLM_CASSETTE_MODE", "replay")
+        monkeypatch.setenv("LLM_CASSETTE_PATH", str(cassette))
+        monkeypatch.setenv("LLM_REPLAY_LATENCY", "0.25")
+        wrapped = wrap_model(scripted_llm())
+        assert isinstance(wrapped, CassetteLlm)
+        assert wrapped.model == "scripted"
+        assert wrapped.cassette_path == cassette
+        assert wrapped.replay_latency == 0.25
+
+    def test_unknown_mode(self, monkeypatch):
+        monkeypatch.setenv("LLM_CASSETTE_MODE", "rewind")
+        with pytest.raises(ValueError):
+            wrap_model(scripted_llm())
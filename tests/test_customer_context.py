@@ -0,0 +1,68 @@
+"""Tests for the composite customer context tool."""
+
+from triage_agent.tools import (
+    check_sla_status,
+    get_customer_context,
+    get_customer_health_score,
+    lookup_billing_transaction,
+    lookup_customer_history,
+)
+
+
+class TestGetCustomerContext:
+    """Test suite for the get_customer_context tool."""
+
+    def test_matches_individual_tools(self):
+        """Sections should carry the same data as the single-purpose tools."""
+        result = get_customer_context("CUST-002")
+        assert result["status"] == "found"
+
+        customer = lookup_customer_history("CUST-002")["customer"]
+        assert result["profile"]["plan"] == customer["plan"]
+        assert result["profile"]["region"] == customer["region"]
+
+        health = get_customer_health_score("CUST-002")
+        assert result["health"] == {
+            key: value for key, value in health.items() if key != "status"
+        }
+
+        sla = check_sla_status("CUST-002")
+        assert result["sla"] == {
+            key: value for key, value in sla.items() if key != "status"
+        }
+
+    def test_billing_summary(self):
+        """Billing totals should match the billing lookup tool."""
+        result = get_customer_context("CUST-001")
+        billing = lookup_billing_transaction("CUST-001")
+        summary = result["billing_summary"]
+        assert summary["total_pending"] == billing["total_pending"]
+        assert summary["total_completed"] == billing["total_completed"]
+        assert summary["total_transactions"] == billing["total_results"]
+
+    def test_recent_entries_are_newest_first(self):
+        """Recent transactions and tickets should be sorted newest first."""
+        result = get_customer_context("CUST-001")
+        dates = [t["created_at"] for t in result["billing_summary"]["recent_transactions"]]
+        assert dates == sorted(dates, reverse=True)
+
+        result = get_customer_context("CUST-002")
+        assert result["total_tickets"] > 0
+        dates = [t["date"] for t in result["recent_tickets"]]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_missing_sections_are_null(self):
+        """A customer known only from ticket history has no profile."""
+        result = get_customer_context("CUST-004")
+        assert result["status"] == "found"
+        assert result["profile"] is None
+        assert result["health"] is None
+        assert result["sla"] is None
+        assert result["total_tickets"] > 0
+        assert result["billing_summary"]["recent_transactions"] == []
+
+    def test_unknown_customer(self):
+        """Should return not_found for unknown customer IDs."""
+        result = get_customer_context("CUST-999")
+        assert result["status"] == "not_found"
+        assert "message" in result
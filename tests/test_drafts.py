@@ -0,0 +1,147 @@
+"""Tests for deferred draft-response generation."""
+
+import asyncio
+import json
+
+import pytest
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from triage_agent.drafts import (
+    MAX_CONTEXT_CHARS,
+    build_draft_message,
+    clean_draft,
+    draft_actions,
+    generate_draft,
+    needs_draft,
+)
+from triage_agent.models import TriageResult
+
+RESULT = {
+    "urgency": "high",
+    "extracted_info": {
+        "product_area": "billing",
+        "issue_type": "payment_failure",
+        "customer_sentiment": "frustrated",
+        "language": "english",
+    },
+    "recommended_action": {
+        "action": "route_to_specialist",
+        "route_to": "billing_team",
+        "reason": "Payment failure",
+    },
+    "reasoning": "Card declined twice",
+    "draft_response": "",
+}
+
+
+def make_result(**overrides) -> TriageResult:
+    return TriageResult.model_validate({**RESULT, **overrides})
+
+
+class TestClassifyOnlySchema:
+    """Classify-only answers fit the structured-output schema."""
+
+    def test_null_draft_validates(self):
+        result = TriageResult.model_validate_json(
+            json.dumps({**RESULT, "draft_response": None})
+        )
+        assert result.draft_response is None
+        assert needs_draft(result)
+
+    def test_schema_allows_null_draft(self):
+        schema = TriageResult.model_json_schema()["properties"]["draft_response"]
+        assert {"type": "null"} in schema["anyOf"]
+        assert "draft_response" in TriageResult.model_json_schema()["required"]
+
+
+class TestNeedsDraft:
+    """Test suite for needs_draft and DRAFT_ACTIONS."""
+
+    def test_classified_ticket_without_draft(self, monkeypatch):
+        monkeypatch.delenv("DRAFT_ACTIONS", raising=False)
+        assert needs_draft(make_result())
+        assert not needs_draft(make_result(draft_response="Already written"))
+        assert not needs_draft(None)
+
+    def test_draft_actions_filter(self, monkeypatch):
+        monkeypatch.setenv("DRAFT_ACTIONS", "auto_respond, escalate_to_human")
+        assert draft_actions() == {"auto_respond", "escalate_to_human"}
+        assert not needs_draft(make_result())
+
+
+class TestBuildDraftMessage:
+    """Test suite for build_draft_message."""
+
+    def test_includes_classification_and_context_tools_only(self):
+        message = build_draft_message(
+            "**Ticket ID:** TK-1",
+            make_result(),
+            [
+                ("get_customer_context", {"plan": "enterprise"}),
+                ("check_service_status", {"status": "ok"}),
+                ("search_knowledge_base", {"results": ["x" * (MAX_CONTEXT_CHARS + 100)]}),
+            ],
+        )
+        assert message.startswith("**Ticket ID:** TK-1")
+        assert '"route_to": "billing_team"' in message
+        assert '"draft_response"' not in message
+        assert '**Context (get_customer_context):**\n{"plan": "enterprise"}' in message
+        assert "check_service_status" not in message
+        knowledge = message.split("**Context (search_knowledge_base):**\n")[1]
+        assert knowledge.startswith('{"results": ["xxx')
+        assert len(knowledge.split("\n\n")[0]) == MAX_CONTEXT_CHARS + len(" ...")
+
+
+class TestCleanDraft:
+    """Test suite for clean_draft."""
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            "Hi there",
+            '  "Hi there"  ',
+            "```\nHi there\n```",
+            "```text\nHi there```",
+        ],
+    )
+    def test_strips_wrapping(self, raw):
+        assert clean_draft(raw) == "Hi there"
+
+
+class WriterRunner:
+    app_name = "support_triage_drafts"
+
+    def __init__(self, reply: str):
+        self.reply = reply
+
+    async def run_async(self, *, user_id, session_id, new_message, **kwargs):
+        yield Event(
+            author="draft_writer",
+            content=types.Content(role="model", parts=[types.Part(text=self.reply)]),
+        )
+
+
+class TestGenerateDraft:
+    """Test suite for generate_draft."""
+
+    def test_returns_cleaned_reply_and_deletes_session(self):
+        sessions = InMemorySessionService()
+
+        async def run():
+            draft = await generate_draft(
+                WriterRunner('"Sorry, a fix is on the way."'), sessions, "CUST-1", "msg"
+            )
+            listed = await sessions.list_sessions(
+                app_name="support_triage_drafts", user_id="CUST-1"
+            )
+            return draft, listed.sessions
+
+        draft, remaining = asyncio.run(run())
+        assert draft == "Sorry, a fix is on the way."
+        assert remaining == []
+
+    def test_empty_reply_raises(self):
+        with pytest.raises(RuntimeError):
+            asyncio.run(generate_draft(WriterRunner("  "), InMemorySessionService(), "C", "m"))
@@ -0,0 +1,74 @@
+"""Tests for the deadline fallback triage result."""
+
+from triage_agent.fallback import build_fallback_result
+from triage_agent.tools import (
+    check_sla_status,
+    get_customer_context,
+    get_customer_health_score,
+    lookup_customer_history,
+)
+
+
+class TestBuildFallbackResult:
+    """Test suite for build_fallback_result."""
+
+    def test_no_tool_results_escalates_at_medium(self):
+        result = build_fallback_result([], reason="deadline exceeded")
+        assert result.urgency == "medium"
+        assert result.recommended_action.action == "escalate_to_human"
+        assert "deadline exceeded" in result.reasoning
+        assert "Tools completed: none" in result.reasoning
+
+    def test_at_risk_sla_is_critical(self):
+        # CUST-002: enterprise, SLA at risk
+        result = build_fallback_result(
+            [
+                ("lookup_customer_history", lookup_customer_history("CUST-002")),
+                ("check_sla_status", check_sla_status("CUST-002")),
+            ],
+            reason="deadline exceeded",
+        )
+        assert result.urgency == "critical"
+        assert "enterprise plan" in result.reasoning
+        assert "lookup_customer_history, check_sla_status" in result.reasoning
+
+    def test_enterprise_plan_is_high(self):
+        result = build_fallback_result(
+            [("lookup_customer_history", lookup_customer_history("CUST-002"))],
+            reason="deadline exceeded",
+        )
+        assert result.urgency == "high"
+
+    def test_low_risk_customer_stays_medium(self):
+        result = build_fallback_result(
+            [
+                ("lookup_customer_history", lookup_customer_history("CUST-003")),
+                ("get_customer_health_score", get_customer_health_score("CUST-003")),
+                ("check_sla_status", check_sla_status("CUST-003")),
+            ],
+            reason="deadline exceeded",
+        )
+        assert result.urgency == "medium"
+        assert result.recommended_action.action == "escalate_to_human"
+
+    def test_reads_composite_customer_context(self):
+        result = build_fallback_result(
+            [("get_customer_context", get_customer_context("CUST-002"))],
+            reason="deadline exceeded",
+        )
+        assert result.urgency == "critical"
+        assert "Customer CUST-002 is on the enterprise plan" in result.reasoning
+
+    def test_product_area_from_first_kb_article(self):
+        kb = {
+            "status": "found",
+            "articles": [
+                {"title": "Payment failures", "category": "billing"},
+                {"title": "Dark mode", "category": "features"},
+            ],
+        }
+        result = build_fallback_result(
+            [("search_knowledge_base", kb)], reason="deadline exceeded"
+        )
+        assert result.extracted_info.product_area == "billing"
+        assert "Payment failures" in result.reasoning
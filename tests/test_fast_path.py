@@ -0,0 +1,93 @@
+"""Tests for the rule-based fast-path classifier."""
+
+import pytest
+
+from triage_agent import fast_path
+from triage_agent.fast_path import fast_path_triage
+
+DARK_MODE_ARTICLE = {
+    "id": "features_dark_mode_setup_and_troubleshooting",
+    "category": "features",
+    "title": "Features Dark Mode Setup And Troubleshooting",
+    "content": "To enable: Go to Settings > Appearance > Theme.",
+    "similarity_score": 0.72,
+}
+
+
+@pytest.fixture
+def kb_results(monkeypatch):
+    """Replace the (embedding-backed) KB search with canned results."""
+    calls = []
+    results = {"status": "success", "articles": [DARK_MODE_ARTICLE]}
+
+    def _search(query):
+        calls.append(query)
+        return results
+
+    monkeypatch.setattr(fast_path, "search_knowledge_base", _search)
+    return results, calls
+
+
+class TestFastPathTriage:
+    """Test suite for fast_path_triage."""
+
+    def test_how_to_from_new_customer_is_auto_responded(self, kb_results):
+        result = fast_path_triage(
+            "CUST-999", "Dark mode", ["Hi! How do I turn on dark mode?"]
+        )
+        assert result is not None
+        assert result.urgency == "low"
+        assert result.recommended_action.action == "auto_respond"
+        assert result.extracted_info.issue_type == "question"
+        assert result.extracted_info.product_area == "ui"
+        assert result.draft_response.startswith("Hi there,")
+        assert "Settings > Appearance" in result.draft_response
+
+    def test_feature_request(self, kb_results):
+        result = fast_path_triage(
+            "CUST-999",
+            "Idea",
+            ["It would be great if dark mode could switch on a schedule."],
+        )
+        assert result.extracted_info.issue_type == "feature_request"
+        assert "suggestion" in result.draft_response
+
+    def test_escalation_signals_skip_kb_search(self, kb_results):
+        _, calls = kb_results
+        assert fast_path_triage(
+            "CUST-999", "Help", ["How do I fix error 500?"]
+        ) is None
+        assert fast_path_triage(
+            "CUST-999", "Payment", ["How do I get a refund for this charge??"]
+        ) is None
+        assert calls == []
+
+    def test_non_english_goes_to_agent(self, kb_results):
+        assert fast_path_triage(
+            "CUST-999", "โหมดมืด", ["เปิดโหมดมืดยังไงครับ how do I"]
+        ) is None
+
+    def test_not_a_question_or_request_goes_to_agent(self, kb_results):
+        assert fast_path_triage("CUST-999", "Hello", ["Thanks for the help."]) is None
+
+    def test_customer_gates(self, kb_results):
+        message = ["How do I turn on dark mode?"]
+        # CUST-001: free plan but medium churn risk
+        assert fast_path_triage("CUST-001", "Dark mode", message) is None
+        # CUST-003: pro plan
+        assert fast_path_triage("CUST-003", "Dark mode", message) is None
+
+    def test_weak_kb_match_goes_to_agent(self, kb_results):
+        results, _ = kb_results
+        results["articles"] = [{**DARK_MODE_ARTICLE, "similarity_score": 0.1}]
+        assert fast_path_triage(
+            "CUST-999", "Dark mode", ["How do I turn on dark mode?"]
+        ) is None
+
+    def test_keyword_results_are_never_strong(self, kb_results):
+        results, _ = kb_results
+        article = {k: v for k, v in DARK_MODE_ARTICLE.items() if k != "similarity_score"}
+        results["articles"] = [article]
+        assert fast_path_triage(
+            "CUST-999", "Dark mode", ["How do I turn on dark mode?"]
+        ) is None
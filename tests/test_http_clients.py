@@ -0,0 +1,36 @@
+"""Tests for the shared HTTP connection pools."""
+
+from triage_agent import http_clients
+
+
+class TestHttpClients:
+    """Test suite for triage_agent.http_clients."""
+
+    def test_clients_are_process_wide(self):
+        assert http_clients.get_sync_client() is http_clients.get_sync_client()
+        assert http_clients.get_async_client() is http_clients.get_async_client()
+
+    def test_pool_settings_from_env(self, monkeypatch):
+        monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "3")
+        monkeypatch.setenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "12")
+        monkeypatch.setenv("HTTP2", "false")
+        settings = http_clients.pool_settings()
+        assert settings["limits"].max_connections == 7
+        assert settings["limits"].max_keepalive_connections == 3
+        assert settings["limits"].keepalive_expiry == 12
+        assert settings["http2"] is False
+
+    def test_http2_forced_on(self, monkeypatch):
+        monkeypatch.setenv("HTTP2", "true")
+        assert http_clients.http2_enabled() is True
+
+    def test_openai_clients_share_the_pools(self):
+        sync = http_clients.openai_client("test-key")
+        async_ = http_clients.openai_async_client("test-key")
+        assert sync._client is http_clients.get_sync_client()
+        assert async_._client is http_clients.get_async_client()
+
+    def test_async_client_needs_an_api_key(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        assert http_clients.openai_async_client() is None
@@ -0,0 +1,223 @@
+"""Tests for the in-process triage job queue."""
+
+import asyncio
+
+import pytest
+
+from triage_agent.serving.jobs import JobQueue, QueueFullError
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def wait_done(queue: JobQueue, job_id: str):
+    for _ in range(200):
+        job = queue.get(job_id)
+        if job.done:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError("job did not finish")
+
+
+class TestJobQueue:
+    """Test suite for JobQueue."""
+
+    def test_job_runs_and_stores_result(self):
+        async def handler(payload):
+            return payload * 2
+
+        async def scenario():
+            queue = JobQueue(handler, workers=2, max_queue=10, result_ttl_seconds=60)
+            job = queue.submit(21)
+            assert job.status == "queued"
+            job = await wait_done(queue, job.job_id)
+            await queue.stop()
+            return job
+
+        job = run(scenario())
+        assert job.status == "succeeded"
+        assert job.result == 42
+        assert job.started_at is not None and job.finished_at >= job.started_at
+
+    def test_wait_returns_when_job_finishes(self):
+        async def handler(payload):
+            await asyncio.sleep(0.02)
+            return payload
+
+        async def scenario():
+            queue = JobQueue(handler, workers=1, max_queue=10, result_ttl_seconds=60)
+            job = queue.submit("x")
+            timed_out = await queue.wait(job, timeout=0.001)
+            assert not timed_out.done
+            job = await queue.wait(job)
+            await queue.stop()
+            return job
+
+        job = run(scenario())
+        assert job.status == "succeeded"
+        assert job.result == "x"
+
+    def test_stop_fails_running_and_queued_jobs(self):
+        async def handler(payload):
+            await asyncio.sleep(60)
+
+        async def scenario():
+            queue = JobQueue(handler, workers=1, max_queue=10, result_ttl_seconds=60)
+            running, queued = queue.submit("a"), queue.submit("b")
+            await asyncio.sleep(0.01)
+            waiters = [asyncio.create_task(queue.wait(job)) for job in (running, queued)]
+            await queue.stop()
+            return await asyncio.wait_for(asyncio.gather(*waiters), 1)
+
+        running, queued = run(scenario())
+        assert running.status == queued.status == "failed"
+        assert "while the job was running" in running.error
+        assert "before the job started" in queued.error
+        assert queued.finished_at is not None
+
+    def test_handler_exception_marks_job_failed(self):
+        async def handler(payload):
+            raise ValueError("bad ticket")
+
+        async def scenario():
+            queue = JobQueue(handler, workers=1, max_queue=10, result_ttl_seconds=60)
+            job = await wait_done(queue, queue.submit("x").job_id)
+            await queue.stop()
+            return job
+
+        job = run(scenario())
+        assert job.status == "failed"
+        assert job.error == "bad ticket"
+
+    def test_full_queue_rejects_with_retry_hint(self):
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def handler(payload):
+                await gate.wait()
+
+            queue = JobQueue(handler, workers=1, max_queue=2, result_ttl_seconds=60)
+            queue.submit(1)
+            await asyncio.sleep(0.01)  # worker picks up job 1
+            queue.submit(2)
+            queue.submit(3)
+            assert queue.running == 1
+            assert queue.depth == 2
+            with pytest.raises(QueueFullError) as exc_info:
+                queue.submit(4)
+            gate.set()
+            await queue.stop()
+            return exc_info.value
+
+        error = run(scenario())
+        assert error.retry_after_seconds >= 1
+
+    def test_worker_pool_bounds_concurrency(self):
+        state = {"in_flight": 0, "peak": 0}
+
+        async def handler(payload):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+
+        async def scenario():
+            queue = JobQueue(handler, workers=3, max_queue=20, result_ttl_seconds=60)
+            jobs = [queue.submit(i) for i in range(10)]
+            for job in jobs:
+                await wait_done(queue, job.job_id)
+            await queue.stop()
+
+        run(scenario())
+        assert state["peak"] == 3
+
+    def test_finished_jobs_expire(self):
+        async def handler(payload):
+            return payload
+
+        async def scenario():
+            queue = JobQueue(handler, workers=1, max_queue=10, result_ttl_seconds=0)
+            first = queue.submit(1)
+            await wait_done(queue, first.job_id)
+            queue.submit(2)  # submitting prunes expired results
+            await queue.stop()
+            return queue.get(first.job_id)
+
+        assert run(scenario()) is None
+
+
+class TestJobQueuePriority:
+    """Classified jobs run by class priority within per-class caps."""
+
+    SHARES = {"urgent": 1.0, "enterprise": 1.0, "free": 0.5}
+
+    def test_higher_class_and_lower_sort_key_run_first(self):
+        order = []
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def handler(payload):
+                if payload == "blocker":
+                    await gate.wait()
+                order.append(payload)
+
+            queue = JobQueue(
+                handler,
+                workers=1,
+                max_queue=10,
+                result_ttl_seconds=60,
+                classify=lambda p: {
+                    "blocker": ("urgent", 0),
+                    "free-a": ("free", 50),
+                    "ent": ("enterprise", 10),
+                    "urgent-late": ("urgent", 3),
+                    "urgent-soon": ("urgent", 1),
+                }[p],
+                class_shares=self.SHARES,
+            )
+            queue.submit("blocker")
+            await asyncio.sleep(0.01)  # worker is now busy on the blocker
+            jobs = [queue.submit(p) for p in ("free-a", "ent", "urgent-late", "urgent-soon")]
+            gate.set()
+            for job in jobs:
+                await wait_done(queue, job.job_id)
+            await queue.stop()
+
+        run(scenario())
+        assert order == ["blocker", "urgent-soon", "urgent-late", "ent", "free-a"]
+
+    def test_class_share_caps_concurrency(self):
+        state = {"free_running": 0, "free_peak": 0}
+
+        async def scenario():
+            async def handler(payload):
+                if payload.startswith("free"):
+                    state["free_running"] += 1
+                    state["free_peak"] = max(state["free_peak"], state["free_running"])
+                await asyncio.sleep(0.02)
+                if payload.startswith("free"):
+                    state["free_running"] -= 1
+
+            queue = JobQueue(
+                handler,
+                workers=4,
+                max_queue=20,
+                result_ttl_seconds=60,
+                classify=lambda p: (p.split("-")[0], 0),
+                class_shares=self.SHARES,
+            )
+            jobs = [queue.submit(f"free-{i}") for i in range(6)]
+            await asyncio.sleep(0.005)
+            # Urgent work still finds free workers while free tickets queue
+            urgent = queue.submit("urgent-1")
+            await asyncio.sleep(0.005)
+            assert queue.get(urgent.job_id).status == "running"
+            assert queue.stats()["classes"]["free"]["max_running"] == 2
+            for job in jobs + [urgent]:
+                await wait_done(queue, job.job_id)
+            await queue.stop()
+
+        run(scenario())
+        assert state["free_peak"] == 2
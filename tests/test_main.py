@@ -0,0 +1,143 @@
+"""Tests for the bulk JSONL triage CLI, using a stubbed ADK runner."""
+
+import asyncio
+import json
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from main import bulk_triage, load_checkpoint
+
+
+class EchoRunner:
+    """Stands in for the ADK Runner; echoes the ticket ID as the response."""
+
+    def __init__(
+        self, fail_on: set[str] | None = None, silent_on: set[str] | None = None
+    ):
+        self.fail_on = fail_on or set()
+        # Tickets whose final event has no content
+        self.silent_on = silent_on or set()
+        self.seen = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def run_async(self, *, user_id, session_id, new_message, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            text = new_message.parts[0].text
+            ticket_id = text.split("**Ticket ID:** ")[1].split("\n")[0]
+            self.seen.append(ticket_id)
+            if ticket_id in self.fail_on:
+                raise ValueError(f"boom on {ticket_id}")
+            if ticket_id in self.silent_on:
+                yield Event(author="support_triage_agent")
+                return
+            yield Event(
+                author="support_triage_agent",
+                content=types.Content(
+                    role="model", parts=[types.Part(text=f"done {ticket_id}")]
+                ),
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def write_tickets(path, ticket_ids):
+    with open(path, "w", encoding="utf-8") as f:
+        for ticket_id in ticket_ids:
+            ticket = {
+                "ticket_id": ticket_id,
+                "customer_id": "CUST-001",
+                "subject": "Question",
+                "messages": [{"timestamp": "now", "content": "Hello"}],
+            }
+            f.write(json.dumps(ticket) + "\n")
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def run_bulk(runner, tmp_path, concurrency=4):
+    session_service = InMemorySessionService()
+    counts = asyncio.run(
+        bulk_triage(
+            runner,
+            session_service,
+            tmp_path / "in.jsonl",
+            tmp_path / "out.jsonl",
+            concurrency,
+        )
+    )
+    return counts, session_service
+
+
+class TestBulkTriage:
+    """Test suite for bulk_triage."""
+
+    def test_triages_all_tickets_concurrently(self, tmp_path):
+        write_tickets(tmp_path / "in.jsonl", [f"TK-{i}" for i in range(10)])
+        runner = EchoRunner()
+        counts, session_service = run_bulk(runner, tmp_path, concurrency=3)
+
+        assert counts == {"succeeded": 10, "failed": 0, "skipped": 0}
+        records = read_records(tmp_path / "out.jsonl")
+        assert sorted(r["ticket_id"] for r in records) == sorted(
+            f"TK-{i}" for i in range(10)
+        )
+        assert all(r["agent_response"] == f"done {r['ticket_id']}" for r in records)
+        assert 1 < runner.max_in_flight <= 3
+        user_sessions = session_service.sessions["support_triage"].values()
+        assert all(not sessions for sessions in user_sessions)
+
+    def test_resume_skips_done_and_retries_failed(self, tmp_path):
+        write_tickets(tmp_path / "in.jsonl", ["TK-0", "TK-1", "TK-2"])
+        first, _ = run_bulk(EchoRunner(fail_on={"TK-1"}), tmp_path)
+        assert first == {"succeeded": 2, "failed": 1, "skipped": 0}
+
+        runner = EchoRunner()
+        second, _ = run_bulk(runner, tmp_path)
+        assert second == {"succeeded": 1, "failed": 0, "skipped": 2}
+        assert runner.seen == ["TK-1"]
+        assert load_checkpoint(tmp_path / "out.jsonl") == {"TK-0", "TK-1", "TK-2"}
+
+    def test_empty_answer_is_an_error_and_retried(self, tmp_path):
+        write_tickets(tmp_path / "in.jsonl", ["TK-0", "TK-1"])
+        first, _ = run_bulk(EchoRunner(silent_on={"TK-1"}), tmp_path)
+        assert first == {"succeeded": 1, "failed": 1, "skipped": 0}
+        records = {r["ticket_id"]: r for r in read_records(tmp_path / "out.jsonl")}
+        assert records["TK-1"]["status"] == "error"
+
+        runner = EchoRunner()
+        second, _ = run_bulk(runner, tmp_path)
+        assert second == {"succeeded": 1, "failed": 0, "skipped": 1}
+        assert runner.seen == ["TK-1"]
+
+    def test_duplicate_and_malformed_input_lines_are_skipped(self, tmp_path):
+        write_tickets(tmp_path / "in.jsonl", ["TK-0", "TK-0"])
+        with open(tmp_path / "in.jsonl", "a", encoding="utf-8") as f:
+            f.write("{not json\n\n" + json.dumps({"subject": "no id"}) + "\n")
+        runner = EchoRunner()
+        counts, _ = run_bulk(runner, tmp_path)
+        assert counts == {"succeeded": 1, "failed": 0, "skipped": 1}
+        assert runner.seen == ["TK-0"]
+
+
+class TestLoadCheckpoint:
+    """Test suite for load_checkpoint."""
+
+    def test_missing_output_is_empty(self, tmp_path):
+        assert load_checkpoint(tmp_path / "out.jsonl") == set()
+
+    def test_partial_last_line_is_truncated(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        complete = json.dumps({"ticket_id": "TK-0", "status": "ok"}) + "\n"
+        path.write_text(complete + '{"ticket_id": "TK-1", "sta', encoding="utf-8")
+
+        assert load_checkpoint(path) == {"TK-0"}
+        assert path.read_text(encoding="utf-8") == complete
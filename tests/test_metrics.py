@@ -0,0 +1,139 @@
+"""Tests for the Prometheus metrics plugin, using a scripted fake model."""
+
+import asyncio
+
+from google.adk.agents import LlmAgent
+from google.genai import types
+from prometheus_client import REGISTRY
+
+from tests.conftest import FakeLlm, make_runner, run_agent, run_agent_async
+from triage_agent.serving.plugin import MetricsPlugin
+from triage_agent.tools import lookup_customer_history
+
+
+def sample(name: str, labels: dict | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def run_one_ticket() -> str:
+    llm = FakeLlm(
+        text='{"urgency": "low"}',
+        tool_calls=[("lookup_customer_history", {"customer_id": "CUST-001"})],
+        usage=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=100,
+            cached_content_token_count=60,
+            candidates_token_count=10,
+        ),
+    )
+    agent = LlmAgent(
+        model=llm,
+        name="metrics_test_agent",
+        instruction="Triage.",
+        tools=[lookup_customer_history],
+    )
+    return run_agent(agent, "help", plugins=[MetricsPlugin()]).final_text
+
+
+class TestMetricsPlugin:
+    """MetricsPlugin records LLM, token, tool and per-ticket metrics."""
+
+    def test_records_llm_tool_and_ticket_metrics(self):
+        tool_labels = {"tool": "lookup_customer_history", "outcome": "ok"}
+        before = {
+            "llm_calls": sample("triage_llm_calls_total"),
+            "prompt_tokens": sample("triage_llm_tokens_total", {"kind": "prompt"}),
+            "cached_tokens": sample(
+                "triage_llm_tokens_total", {"kind": "cached_prompt"}
+            ),
+            "ticket_uncached_tokens": sample(
+                "triage_llm_tokens_per_ticket_sum", {"kind": "uncached_prompt"}
+            ),
+            "tool_calls": sample("triage_tool_calls_total", tool_labels),
+            "tickets": sample("triage_llm_calls_per_ticket_count"),
+            "ticket_llm_calls": sample("triage_llm_calls_per_ticket_sum"),
+        }
+
+        assert run_one_ticket() == '{"urgency": "low"}'
+
+        assert sample("triage_llm_calls_total") - before["llm_calls"] == 2
+        assert (
+            sample("triage_llm_tokens_total", {"kind": "prompt"})
+            - before["prompt_tokens"]
+        ) == 200
+        assert (
+            sample("triage_llm_tokens_total", {"kind": "cached_prompt"})
+            - before["cached_tokens"]
+        ) == 120
+        assert (
+            sample("triage_llm_tokens_per_ticket_sum", {"kind": "uncached_prompt"})
+            - before["ticket_uncached_tokens"]
+        ) == 80
+        assert sample("triage_tool_calls_total", tool_labels) - before["tool_calls"] == 1
+        assert sample(
+            "triage_tool_call_duration_seconds_count",
+            {"tool": "lookup_customer_history"},
+        ) >= 1
+        assert sample("triage_llm_calls_per_ticket_count") - before["tickets"] == 1
+        assert (
+            sample("triage_llm_calls_per_ticket_sum") - before["ticket_llm_calls"]
+        ) == 2
+        assert sample("triage_agent_runs_in_progress") == 0
+
+
+def plugin_state(plugin: MetricsPlugin) -> list[dict]:
+    return [
+        plugin._run_started,
+        plugin._run_sessions,
+        plugin._per_ticket,
+        plugin._model_started,
+        plugin._tool_started,
+    ]
+
+
+class TestUnfinishedRuns:
+    """Runs that are cancelled or fail don't leak gauge counts or state."""
+
+    def start_runs(self, llm: FakeLlm, timeout: float, count: int = 3):
+        plugin = MetricsPlugin()
+        runner = make_runner(
+            LlmAgent(model=llm, name="stalled_agent", instruction="Triage."),
+            plugins=[plugin],
+        )
+
+        async def run_one(in_progress: list[float]) -> None:
+            try:
+                async with asyncio.timeout(timeout):
+                    await run_agent_async(runner, "help")
+            except (TimeoutError, RuntimeError):
+                in_progress.append(sample("triage_agent_runs_in_progress"))
+
+        async def scenario() -> list[float]:
+            in_progress: list[float] = []
+            await asyncio.gather(*(run_one(in_progress) for _ in range(count)))
+            sessions = await runner.session_service.list_sessions(
+                app_name=runner.app_name, user_id="CUST-001"
+            )
+            for session in sessions.sessions:
+                plugin.end_session_runs(session.id)
+            return in_progress
+
+        return plugin, asyncio.run(scenario())
+
+    def test_cancelled_runs_are_ended(self):
+        before = sample("triage_agent_run_duration_seconds_count")
+        plugin, in_progress = self.start_runs(FakeLlm(delay=60), timeout=0.05)
+        # Still counted while cancelled (ADK skipped after_run) ...
+        assert max(in_progress) >= 1
+        # ... until end_session_runs
+        assert sample("triage_agent_runs_in_progress") == 0
+        assert plugin_state(plugin) == [{}] * 5
+        assert sample("triage_agent_run_duration_seconds_count") - before == 3
+
+    def test_failed_runs_are_ended_by_adk(self, monkeypatch):
+        monkeypatch.setattr(MetricsPlugin, "end_session_runs", lambda self, session_id: None)
+        plugin, in_progress = self.start_runs(
+            FakeLlm(error="model unavailable"), timeout=10
+        )
+        assert len(in_progress) == 3
+        assert sample("triage_agent_runs_in_progress") == 0
+        assert plugin_state(plugin) == [{}] * 5
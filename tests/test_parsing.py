@@ -0,0 +1,110 @@
+"""Tests for parsing the agent's final answer."""
+
+import json
+
+from triage_agent.parsing import extract_json, parse_triage_result, repair_json
+
+RESULT = {
+    "urgency": "high",
+    "extracted_info": {
+        "product_area": "billing",
+        "issue_type": "payment_failure",
+        "customer_sentiment": "frustrated",
+        "language": "english",
+    },
+    "recommended_action": {
+        "action": "route_to_specialist",
+        "route_to": "billing_team",
+        "reason": "Payment failure",
+    },
+    "reasoning": "Card declined twice",
+    "draft_response": "Sorry about that!",
+}
+
+
+class TestExtractJson:
+    """Test suite for extract_json."""
+
+    def test_bare_object(self):
+        assert extract_json(json.dumps(RESULT)) == RESULT
+
+    def test_fenced_object(self):
+        assert extract_json(f"```json\n{json.dumps(RESULT)}\n```") == RESULT
+
+    def test_object_with_surrounding_text(self):
+        assert extract_json(f"Here you go: {json.dumps(RESULT)} Thanks") == RESULT
+
+    def test_no_object(self):
+        assert extract_json("I could not triage this ticket.") is None
+        assert extract_json("") is None
+
+
+class TestParseTriageResult:
+    """Test suite for parse_triage_result."""
+
+    def test_valid_result(self):
+        result = parse_triage_result(json.dumps(RESULT))
+        assert result.urgency == "high"
+        assert result.confidence is None
+
+    def test_null_draft_response(self):
+        result = parse_triage_result(json.dumps({**RESULT, "draft_response": None}))
+        assert result.draft_response == ""
+
+    def test_unknown_urgency_or_action(self):
+        assert parse_triage_result(json.dumps({**RESULT, "urgency": "urgent"})) is None
+        bad_action = {**RESULT["recommended_action"], "action": "ignore"}
+        assert (
+            parse_triage_result(json.dumps({**RESULT, "recommended_action": bad_action}))
+            is None
+        )
+
+    def test_schema_mismatch(self):
+        assert parse_triage_result(json.dumps({"urgency": "low"})) is None
+        assert parse_triage_result(json.dumps({**RESULT, "confidence": 3})) is None
+
+
+class TestRepair:
+    """parse_triage_result(repair=True) fixes near-miss answers locally."""
+
+    def test_valid_answer_unchanged(self):
+        result = parse_triage_result(json.dumps(RESULT), repair=True)
+        assert result.model_dump(exclude={"confidence"}) == RESULT
+
+    def test_truncated_answer(self):
+        text = json.dumps(RESULT)
+        assert parse_triage_result(text[:-10]) is None
+        result = parse_triage_result(text[:-10], repair=True)
+        assert result.draft_response == "Sorry abo"
+
+    def test_truncated_before_draft(self):
+        text = json.dumps(RESULT)
+        cut = text[: text.index('"draft_response"') + 5]
+        result = parse_triage_result(cut, repair=True)
+        assert result.urgency == "high"
+        assert result.draft_response == ""
+
+    def test_trailing_commas_and_python_literals(self):
+        text = json.dumps(RESULT).replace('"billing_team"', "None")
+        text = text.replace("}", ",}")
+        result = parse_triage_result(text, repair=True)
+        assert result.recommended_action.route_to is None
+
+    def test_near_miss_values(self):
+        data = json.loads(json.dumps(RESULT))
+        data["urgency"] = " High "
+        data["recommended_action"]["action"] = "Route to specialist"
+        data["confidence"] = "85%"
+        result = parse_triage_result(json.dumps(data), repair=True)
+        assert result.urgency == "high"
+        assert result.recommended_action.action == "route_to_specialist"
+        assert result.confidence == 0.85
+
+    def test_unknown_values_are_not_guessed(self):
+        assert parse_triage_result(json.dumps({**RESULT, "urgency": "urgent"}), repair=True) is None
+        assert parse_triage_result("no json here", repair=True) is None
+
+    def test_repair_json(self):
+        assert repair_json('Here you go: {"a": [1, 2,], "b": "x') == {"a": [1, 2], "b": "x"}
+        assert repair_json('{"a": 1, "b":') == {"a": 1}
+        assert repair_json("nothing") is None
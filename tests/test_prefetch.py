@@ -0,0 +1,94 @@
+"""Tests for the speculative context prefetch."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from triage_agent import prefetch
+from triage_agent.prefetch import format_prefetched_context, prefetch_context
+
+
+@pytest.fixture
+def kb_search(monkeypatch):
+    """Replace the (embedding-backed) KB search with a controllable stub."""
+    state = {"delay": 0.0, "error": None, "threads": set()}
+
+    def _search(query):
+        state["threads"].add(threading.get_ident())
+        time.sleep(state["delay"])
+        if state["error"]:
+            raise state["error"]
+        return {"status": "success", "query": query, "articles": []}
+
+    monkeypatch.setattr(prefetch, "search_knowledge_base", _search)
+    return state
+
+
+class TestPrefetchContext:
+    """Test suite for prefetch_context."""
+
+    def test_returns_all_tools_in_order(self, kb_search):
+        results = asyncio.run(prefetch_context("CUST-001", "Payment failed"))
+        assert [name for name, _, _ in results] == [
+            "get_customer_context",
+            "search_knowledge_base",
+        ]
+        assert results[0][1] == {"customer_id": "CUST-001"}
+        assert results[1][1] == {"query": "Payment failed"}
+        assert results[1][2]["query"] == "Payment failed"
+        assert results[0][2]["status"] == "found"
+
+    def test_tools_run_off_the_event_loop(self, kb_search):
+        asyncio.run(prefetch_context("CUST-001", "Payment failed"))
+        assert threading.get_ident() not in kb_search["threads"]
+
+    def test_slow_tools_are_left_out(self, kb_search):
+        kb_search["delay"] = 0.5
+
+        async def _timed():
+            started = time.perf_counter()
+            results = await prefetch_context(
+                "CUST-001", "Payment failed", timeout_seconds=0.1
+            )
+            return results, time.perf_counter() - started
+
+        results, elapsed = asyncio.run(_timed())
+        assert elapsed < 0.5
+        assert "search_knowledge_base" not in [name for name, _, _ in results]
+        assert len(results) == 1
+
+    def test_tool_errors_are_reported(self, kb_search):
+        kb_search["error"] = RuntimeError("embedding service down")
+        results = asyncio.run(prefetch_context("CUST-001", "Payment failed"))
+        assert results[1][2] == {
+            "status": "error",
+            "message": "embedding service down",
+        }
+
+    def test_enabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("PREFETCH_CONTEXT", raising=False)
+        assert prefetch.prefetch_enabled()
+        monkeypatch.setenv("PREFETCH_CONTEXT", "false")
+        assert not prefetch.prefetch_enabled()
+
+
+class TestFormatPrefetchedContext:
+    """Test suite for format_prefetched_context."""
+
+    def test_renders_each_call_and_response(self):
+        text = format_prefetched_context(
+            [
+                ("check_sla_status", {"customer_id": "CUST-001"}, {"sla_at_risk": True}),
+                ("search_knowledge_base", {"query": "SSO"}, {"articles": []}),
+            ]
+        )
+        assert text.startswith("**Prefetched Context**")
+        assert '`check_sla_status(customer_id="CUST-001")`' in text
+        assert '`search_knowledge_base(query="SSO")`' in text
+        assert json.dumps({"sla_at_risk": True}) in text
+
+    def test_empty(self):
+        assert format_prefetched_context([]) == ""
@@ -0,0 +1,49 @@
+"""Tests for SLA-aware ticket priority classification."""
+
+import math
+
+from triage_agent.serving.priority import (
+    DEFAULT_CLASS_SHARES,
+    parse_class_shares,
+    priority_rank,
+    ticket_priority,
+)
+
+
+class TestTicketPriority:
+    """Test suite for ticket_priority / priority_rank."""
+
+    def test_at_risk_sla_is_urgent(self):
+        # CUST-002: enterprise, 2h remaining, is_at_risk
+        priority = ticket_priority("CUST-002")
+        assert priority.priority_class == "urgent"
+        assert priority.time_remaining_hours == 2
+
+    def test_plan_tier_classes(self):
+        assert ticket_priority("CUST-003").priority_class == "pro"
+        assert ticket_priority("CUST-001").priority_class == "free"
+
+    def test_unknown_customer_is_free_with_no_deadline(self):
+        priority = ticket_priority("CUST-999")
+        assert priority.priority_class == "free"
+        assert math.isinf(priority.time_remaining_hours)
+
+    def test_rank_orders_by_class_then_time_remaining(self):
+        ranked = sorted(
+            ["CUST-001", "CUST-999", "CUST-003", "CUST-002"],
+            key=lambda c: priority_rank(ticket_priority(c)),
+        )
+        assert ranked == ["CUST-002", "CUST-003", "CUST-001", "CUST-999"]
+
+
+class TestParseClassShares:
+    """Test suite for parse_class_shares."""
+
+    def test_empty_spec_uses_defaults(self):
+        assert parse_class_shares("") == DEFAULT_CLASS_SHARES
+
+    def test_overrides_keep_priority_order(self):
+        shares = parse_class_shares("free=0.25, urgent=1")
+        assert list(shares) == ["urgent", "enterprise", "pro", "free"]
+        assert shares["free"] == 0.25
+        assert shares["pro"] == DEFAULT_CLASS_SHARES["pro"]
@@ -0,0 +1,46 @@
+"""Tests that every LLM call starts with the same cacheable prompt prefix."""
+
+import json
+
+from google.adk.models import LlmRequest
+
+from tests.conftest import FakeLlm, run_agent
+from triage_agent.agent import root_agent
+from triage_agent.prompts import TRIAGE_AGENT_INSTRUCTION
+
+
+def prefix_of(request: LlmRequest) -> str:
+    """The part of a request that precedes any per-ticket content."""
+    tools = [
+        declaration.model_dump(exclude_none=True)
+        for tool in request.config.tools or []
+        for declaration in tool.function_declarations or []
+    ]
+    return json.dumps({"system": request.config.system_instruction, "tools": tools})
+
+
+def capture_requests(tickets: list[tuple[str, str]]) -> list[LlmRequest]:
+    llm = FakeLlm()
+    agent = root_agent.clone(update={"model": llm})
+    for customer_id, text in tickets:
+        run_agent(agent, text, user_id=customer_id)
+    return llm.requests
+
+
+class TestPromptPrefix:
+    """The static instruction and tool schemas form a byte-stable prefix."""
+
+    def test_prefix_is_identical_across_tickets(self):
+        first, second = capture_requests(
+            [
+                ("CUST-001", "How do I enable dark mode?"),
+                ("CUST-002", "Outage! {customer_id} can't log in"),
+            ]
+        )
+        assert prefix_of(first) == prefix_of(second)
+        assert TRIAGE_AGENT_INSTRUCTION in first.config.system_instruction
+
+    def test_ticket_content_only_follows_the_prefix(self):
+        [request] = capture_requests([("CUST-001", "My payment failed")])
+        assert "My payment failed" not in prefix_of(request)
+        assert request.contents[-1].parts[-1].text == "My payment failed"
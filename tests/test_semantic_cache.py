@@ -0,0 +1,99 @@
+"""Tests for the similarity-keyed semantic cache."""
+
+import pytest
+
+from triage_agent.serving.semantic_cache import SemanticCache, normalize
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(**kwargs) -> SemanticCache:
+    return SemanticCache(
+        **{"max_entries": 10, "ttl_seconds": 60, "min_similarity": 0.9, **kwargs}
+    )
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache."""
+
+    def test_similar_vector_in_same_scope_hits(self):
+        cache = make_cache()
+        cache.set([1.0, 0.0], "free", "outage")
+        hit = cache.get([0.95, 0.1], "free")
+        assert hit.value == "outage"
+        assert hit.similarity == pytest.approx(0.9945, abs=1e-4)
+
+    def test_dissimilar_vector_or_other_scope_misses(self):
+        cache = make_cache()
+        cache.set([1.0, 0.0], "free", "outage")
+        assert cache.get([0.5, 0.5], "free") is None
+        assert cache.get([1.0, 0.0], "enterprise") is None
+        stats = cache.stats()
+        assert stats["misses"] == 2
+        assert stats["hit_rate"] == 0.0
+
+    def test_most_similar_entry_wins(self):
+        cache = make_cache()
+        cache.set([1.0, 0.2], "free", "close")
+        cache.set([1.0, 0.05], "free", "closest")
+        assert cache.get([1.0, 0.0], "free").value == "closest"
+
+    def test_entries_expire_after_their_ttl(self):
+        clock = FakeClock()
+        cache = make_cache(clock=clock)
+        cache.set([1.0, 0.0], "free", "default ttl")
+        cache.set([0.0, 1.0], "free", "short ttl", ttl_seconds=10)
+        clock.now = 30
+        assert cache.get([0.0, 1.0], "free") is None
+        # Hits don't extend an entry's lifetime
+        assert cache.get([1.0, 0.0], "free").value == "default ttl"
+        clock.now = 61
+        assert cache.get([1.0, 0.0], "free") is None
+        assert cache.stats()["expirations"] == 2
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = make_cache(max_entries=2)
+        cache.set([1.0, 0.0], "free", "a")
+        cache.set([0.0, 1.0], "free", "b")
+        cache.get([1.0, 0.0], "free")  # "b" is now least recently used
+        cache.set([-1.0, 0.0], "free", "c")
+        assert cache.get([0.0, 1.0], "free") is None
+        assert cache.get([1.0, 0.0], "free").value == "a"
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicted_and_expired_slots_are_reused(self):
+        clock = FakeClock()
+        cache = make_cache(max_entries=2, clock=clock)
+        cache.set([1.0, 0.0], "free", "a", ttl_seconds=10)
+        cache.set([0.0, 1.0], "free", "b")
+        clock.now = 11
+        cache.set([-1.0, 0.0], "free", "c")  # takes the expired entry's slot
+        cache.set([0.0, -1.0], "free", "d")  # evicts "b"
+        assert len(cache) == 2
+        assert cache.get([1.0, 0.0], "free") is None
+        assert cache.get([0.0, 1.0], "free") is None
+        assert cache.get([-1.0, 0.0], "free").value == "c"
+        assert cache.get([0.0, -1.0], "free").value == "d"
+
+    def test_zero_size_stores_nothing(self):
+        cache = make_cache(max_entries=0)
+        cache.set([1.0, 0.0], "free", "a")
+        assert len(cache) == 0
+        assert cache.get([1.0, 0.0], "free") is None
+
+    def test_vector_size_must_match(self):
+        cache = make_cache()
+        cache.set([1.0, 0.0], "free", "a")
+        with pytest.raises(ValueError):
+            cache.set([1.0, 0.0, 0.0], "free", "b")
+
+    def test_normalize(self):
+        assert normalize([3.0, 4.0]).tolist() == pytest.approx([0.6, 0.8])
+        assert normalize([0.0, 0.0]).tolist() == [0.0, 0.0]
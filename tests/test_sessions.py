@@ -0,0 +1,113 @@
+"""Tests for the bounded session store."""
+
+import asyncio
+
+from google.adk.events import Event
+from google.genai import types
+
+from triage_agent.serving.sessions import BoundedSessionService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_event(text: str) -> Event:
+    return Event(
+        author="agent",
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+    )
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestBoundedSessionService:
+    """Test suite for BoundedSessionService."""
+
+    def test_delete_frees_session(self):
+        service = BoundedSessionService(max_sessions=10, max_bytes=10**6, ttl_seconds=60)
+
+        async def scenario():
+            session = await service.create_session(app_name="app", user_id="u1")
+            await service.append_event(session, make_event("hello"))
+            assert service.stats()["sessions"] == 1
+            assert service.stats()["approx_bytes"] > 0
+            await service.delete_session(
+                app_name="app", user_id="u1", session_id=session.id
+            )
+
+        run(scenario())
+        stats = service.stats()
+        assert stats["sessions"] == 0
+        assert stats["approx_bytes"] == 0
+        assert service.sessions == {}
+
+    def test_ttl_expires_idle_sessions(self):
+        clock = FakeClock()
+        service = BoundedSessionService(
+            max_sessions=10, max_bytes=10**6, ttl_seconds=60, clock=clock
+        )
+
+        async def scenario():
+            old = await service.create_session(app_name="app", user_id="u1")
+            clock.now = 30
+            await service.create_session(app_name="app", user_id="u2")
+            clock.now = 61
+            assert service.evict_expired() == 1
+            assert await service.get_session(
+                app_name="app", user_id="u1", session_id=old.id
+            ) is None
+
+        run(scenario())
+        assert service.stats()["sessions"] == 1
+        assert service.stats()["evicted_ttl"] == 1
+
+    def test_max_sessions_evicts_least_recently_used(self):
+        service = BoundedSessionService(max_sessions=2, max_bytes=10**6, ttl_seconds=60)
+
+        async def scenario():
+            first = await service.create_session(app_name="app", user_id="u1")
+            second = await service.create_session(app_name="app", user_id="u2")
+            # Touch the first so the second becomes least recently used
+            await service.append_event(first, make_event("still busy"))
+            await service.create_session(app_name="app", user_id="u3")
+            return first, second
+
+        first, second = run(scenario())
+        assert service.stats()["sessions"] == 2
+        assert service.stats()["evicted_capacity"] == 1
+        assert "u2" not in service.sessions["app"]
+        assert first.id in service.sessions["app"]["u1"]
+
+    def test_max_bytes_evicts_oldest(self):
+        service = BoundedSessionService(max_sessions=100, max_bytes=2000, ttl_seconds=60)
+
+        async def scenario():
+            for i in range(5):
+                session = await service.create_session(app_name="app", user_id=f"u{i}")
+                await service.append_event(session, make_event("x" * 500))
+
+        run(scenario())
+        stats = service.stats()
+        assert stats["approx_bytes"] <= 2000
+        assert stats["evicted_capacity"] > 0
+        assert "u4" in service.sessions["app"]
+
+    def test_session_being_written_is_never_evicted(self):
+        service = BoundedSessionService(max_sessions=10, max_bytes=100, ttl_seconds=60)
+
+        async def scenario():
+            session = await service.create_session(app_name="app", user_id="u1")
+            # A single event larger than the cap must not kill the live run
+            await service.append_event(session, make_event("x" * 500))
+            await service.append_event(session, make_event("y" * 500))
+            return session
+
+        session = run(scenario())
+        assert session.id in service.sessions["app"]["u1"]
@@ -0,0 +1,74 @@
+"""Tests for reusing a near-duplicate ticket's triage."""
+
+from triage_agent.models import TriageResult
+from triage_agent.similar_tickets import (
+    CustomerProfile,
+    SimilarTicket,
+    customer_profile,
+    personalize_result,
+    ticket_text,
+)
+
+RESULT = TriageResult.model_validate(
+    {
+        "urgency": "critical",
+        "extracted_info": {
+            "product_area": "platform",
+            "issue_type": "outage",
+            "customer_sentiment": "frustrated",
+            "language": "english",
+        },
+        "recommended_action": {
+            "action": "escalate_to_human",
+            "route_to": None,
+            "reason": "Outage reported on TK-1",
+        },
+        "reasoning": "CUST-001 (Alice Johnson) sees error 500 on every page",
+        "draft_response": "Hi Alice, we're investigating the errors on TK-1.",
+    }
+)
+
+
+class TestCustomerProfile:
+    """Test suite for customer_profile."""
+
+    def test_known_and_unknown_customers(self):
+        assert customer_profile("CUST-001") == CustomerProfile("free", "medium", False)
+        assert customer_profile("CUST-002") == CustomerProfile("enterprise", "low", True)
+        assert customer_profile("CUST-999") == CustomerProfile("unknown", "unknown", False)
+
+
+class TestTicketText:
+    """Test suite for ticket_text."""
+
+    def test_subject_and_latest_message(self):
+        assert ticket_text("Error 500", ["first", "latest"]) == "Error 500\nlatest"
+        assert ticket_text("Error 500", []) == "Error 500"
+
+
+class TestPersonalizeResult:
+    """Test suite for personalize_result."""
+
+    def test_swaps_name_and_ids(self):
+        result = personalize_result(
+            SimilarTicket("TK-1", "CUST-001", RESULT), "TK-7", "CUST-003"
+        )
+        assert result.draft_response == "Hi Emily, we're investigating the errors on TK-7."
+        assert result.reasoning == "CUST-003 (Emily) sees error 500 on every page"
+        assert result.recommended_action.reason == "Outage reported on TK-7"
+        # Classification is reused as is
+        assert result.urgency == "critical"
+        assert result.extracted_info == RESULT.extracted_info
+        assert RESULT.draft_response.startswith("Hi Alice")
+
+    def test_unknown_customer_is_greeted_generically(self):
+        result = personalize_result(
+            SimilarTicket("TK-1", "CUST-001", RESULT), "TK-7", "CUST-999"
+        )
+        assert result.draft_response.startswith("Hi there, ")
+
+    def test_same_customer_keeps_names(self):
+        result = personalize_result(
+            SimilarTicket("TK-1", "CUST-001", RESULT), "TK-2", "CUST-001"
+        )
+        assert result.draft_response == "Hi Alice, we're investigating the errors on TK-2."
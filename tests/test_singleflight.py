@@ -0,0 +1,109 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from triage_agent.serving.singleflight import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight."""
+
+    def test_concurrent_callers_share_one_run(self):
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def scenario():
+            flight = SingleFlight()
+            results = await asyncio.gather(
+                *(flight.do("key", work) for _ in range(5))
+            )
+            return flight, results
+
+        flight, results = run(scenario())
+        assert calls == 1
+        assert [r for r, _ in results] == ["result"] * 5
+        assert sum(shared for _, shared in results) == 4
+        assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+    def test_different_keys_run_independently(self):
+        calls = []
+
+        async def scenario():
+            flight = SingleFlight()
+
+            def work_for(key):
+                async def work():
+                    calls.append(key)
+                    await asyncio.sleep(0.01)
+                    return key
+                return work
+
+            return await asyncio.gather(
+                flight.do("a", work_for("a")), flight.do("b", work_for("b"))
+            )
+
+        results = run(scenario())
+        assert sorted(calls) == ["a", "b"]
+        assert results == [("a", False), ("b", False)]
+
+    def test_exception_propagates_to_all_callers(self):
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        async def scenario():
+            flight = SingleFlight()
+            results = await asyncio.gather(
+                flight.do("key", work), flight.do("key", work),
+                return_exceptions=True,
+            )
+            return flight, results
+
+        flight, results = run(scenario())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight == 0
+
+    def test_sequential_calls_rerun(self):
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        async def scenario():
+            flight = SingleFlight()
+            first = await flight.do("key", work)
+            second = await flight.do("key", work)
+            return first, second
+
+        assert run(scenario()) == ((1, False), (2, False))
+
+    def test_cancelled_leader_does_not_abort_followers(self):
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def scenario():
+            flight = SingleFlight()
+            leader = asyncio.create_task(flight.do("key", work))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.do("key", work))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert run(scenario()) == ("done", True)
@@ -0,0 +1,91 @@
+"""Tests for incremental parsing of the streamed answer."""
+
+import json
+
+from google.adk.events import Event
+from google.genai import types
+
+from triage_agent.streaming import EarlyFieldTracker, IncrementalJsonParser
+
+ANSWER = {
+    "urgency": "critical",
+    "extracted_info": {"product_area": "api", "issue_type": "outage {\"x\"}"},
+    "recommended_action": {"action": "escalate_to_human", "route_to": None},
+    "reasoning": "Production down",
+    "draft_response": "We're on it, [details] to follow.",
+    "confidence": 0.95,
+}
+
+
+def feed_in_chunks(text: str, size: int) -> list[tuple[int, str]]:
+    """(chunk index, field) for each field, in completion order."""
+    parser = IncrementalJsonParser()
+    done = []
+    for index, start in enumerate(range(0, len(text), size)):
+        done += [(index, key) for key, _ in parser.feed(text[start : start + size])]
+    return done
+
+
+class TestIncrementalJsonParser:
+    """Test suite for IncrementalJsonParser."""
+
+    def test_reports_every_field_with_its_value(self):
+        parser = IncrementalJsonParser()
+        pairs = []
+        for char in json.dumps(ANSWER, indent=2):
+            pairs += parser.feed(char)
+        assert dict(pairs) == ANSWER
+        assert parser.done
+
+    def test_fields_complete_before_the_object(self):
+        text = json.dumps(ANSWER)
+        done = dict((key, index) for index, key in feed_in_chunks(text, 5))
+        urgency_end = text.index('"extracted_info"')
+        assert done["urgency"] <= urgency_end // 5
+        assert done["recommended_action"] < done["draft_response"]
+
+    def test_skips_text_around_the_object(self):
+        parser = IncrementalJsonParser()
+        pairs = parser.feed('Here it is:\n```json\n{"urgency": "low", "n": 3}\n```\n{"x": 1}')
+        assert pairs == [("urgency", "low"), ("n", 3)]
+
+    def test_numbers_complete_at_separator(self):
+        parser = IncrementalJsonParser()
+        assert parser.feed('{"confidence": 0.9') == []
+        assert parser.feed("5,") == [("confidence", 0.95)]
+        assert parser.feed('"z": null}') == [("z", None)]
+
+
+def model_event(text: str, partial: bool) -> Event:
+    return Event(
+        author="support_triage_agent",
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        partial=partial,
+    )
+
+
+class TestEarlyFieldTracker:
+    """Test suite for EarlyFieldTracker."""
+
+    def test_streamed_turn_reports_early_fields_once(self):
+        text = json.dumps(ANSWER)
+        tracker = EarlyFieldTracker()
+        found = []
+        for start in range(0, len(text), 10):
+            found += tracker.observe(model_event(text[start : start + 10], partial=True))
+        assert found == [
+            ("urgency", "critical"),
+            ("recommended_action", ANSWER["recommended_action"]),
+        ]
+        # The aggregated final event repeats the text; nothing new
+        assert tracker.observe(model_event(text, partial=False)) == []
+
+    def test_unstreamed_answer_is_parsed_when_complete(self):
+        tracker = EarlyFieldTracker()
+        found = tracker.observe(model_event(json.dumps(ANSWER), partial=False))
+        assert [field for field, _ in found] == ["urgency", "recommended_action"]
+
+    def test_non_json_turn_reports_nothing(self):
+        tracker = EarlyFieldTracker()
+        assert tracker.observe(model_event("Let me check that.", partial=False)) == []
+        assert tracker.observe(model_event(json.dumps(ANSWER), partial=False))
@@ -0,0 +1,35 @@
+"""Tests for the shared data table loader."""
+
+import subprocess
+import sys
+
+from triage_agent.tools import tables
+from triage_agent.tools.context import customer_context
+
+
+class TestTables:
+    """Test suite for load_table / preload_tables."""
+
+    def test_load_table_is_parsed_once(self):
+        assert tables.load_table("customers.json") is tables.load_table("customers.json")
+
+    def test_nothing_is_loaded_at_import(self):
+        code = (
+            "import app; from triage_agent.tools.tables import load_table; "
+            "print(load_table.cache_info().currsize)"
+        )
+        out = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=tables.DATA_DIR.parent
+        )
+        assert out.decode().split()[-1] == "0"
+
+    def test_preload_tables_loads_every_json_file(self):
+        loaded = tables.preload_tables()
+        expected = sorted(p.name for p in tables.DATA_DIR.glob("*.json"))
+        assert set(expected) <= set(loaded)
+        assert tables.load_table.cache_info().currsize >= len(expected)
+
+    def test_preload_tables_builds_derived_indexes(self):
+        tables.preload_tables()
+        assert customer_context._context_index.cache_info().currsize == 1
+        assert customer_context._context_index() is customer_context._context_index()
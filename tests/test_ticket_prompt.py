@@ -0,0 +1,102 @@
+"""Tests for ticket prompt assembly and thread budgeting."""
+
+from triage_agent.ticket_prompt import build_ticket_prompt, estimate_tokens
+
+FILLER = "We have been looking into this on our side and will keep you posted. " * 6
+
+
+def build(messages, budget=400):
+    return build_ticket_prompt("TK-1", "CUST-001", "Payment issue", messages, budget)
+
+
+def long_thread(count: int) -> list[tuple[str, str]]:
+    messages = [("t00", "Our card payment failed with error 402 on checkout.")]
+    for i in range(1, count - 1):
+        messages.append((f"t{i:02d}", f"Update number {i}. " + FILLER))
+    messages.append((f"t{count - 1:02d}", "Still blocked, the deadline is Friday."))
+    return messages
+
+
+class TestShortThreads:
+    """Threads within budget are rendered verbatim."""
+
+    def test_format(self):
+        prompt = build([("now", "My payment failed"), ("later", "Any news?")])
+        assert prompt.text == (
+            "Please triage the following support ticket.\n\n"
+            "**Ticket ID:** TK-1\n"
+            "**Customer ID:** CUST-001\n"
+            "**Subject:** Payment issue\n\n"
+            "**Messages:**\n[now] My payment failed\n\n[later] Any news?"
+        )
+        assert prompt.tokens_saved == 0
+        assert prompt.summarized_messages == 0
+
+    def test_zero_budget_disables_windowing(self):
+        messages = long_thread(30)
+        prompt = build(messages, budget=0)
+        assert prompt.tokens_saved == 0
+        assert all(content in prompt.text for _, content in messages)
+
+    def test_budget_read_from_env(self, monkeypatch):
+        monkeypatch.setenv("THREAD_TOKEN_BUDGET", "400")
+        prompt = build_ticket_prompt("TK-1", "CUST-001", "s", long_thread(30))
+        assert prompt.tokens_saved > 0
+
+
+class TestLongThreads:
+    """Threads over budget are collapsed, shortened and windowed."""
+
+    def test_fits_budget_keeping_first_and_latest(self):
+        messages = long_thread(30)
+        prompt = build(messages)
+        assert prompt.original_thread_tokens > 400
+        assert prompt.thread_tokens <= 400
+        assert prompt.tokens_saved == prompt.original_thread_tokens - prompt.thread_tokens
+        assert "[t00] Our card payment failed with error 402" in prompt.text
+        assert "[t29] Still blocked, the deadline is Friday." in prompt.text
+        assert "earlier messages summarized" in prompt.text
+        assert prompt.summarized_messages > 0
+
+    def test_summary_lines_keep_timestamps(self):
+        prompt = build(long_thread(30))
+        assert "- [t" in prompt.text
+
+    def test_summary_prefers_signal_sentences(self):
+        messages = long_thread(30)
+        messages[10] = ("t10", "Note that we were charged twice for invoice 881. " + FILLER)
+        prompt = build(messages)
+        assert "- [t10] Note that we were charged twice for invoice 881." in prompt.text
+
+    def test_quoted_replies_are_dropped(self):
+        quoted = "\n".join(f"> {line}" for line in FILLER.split(". "))
+        messages = [
+            ("t1", "Our card payment failed."),
+            ("t2", "On Mon, Jan 1 Support wrote:\n" + quoted + "\n\nAny update?"),
+        ] * 8
+        prompt = build(messages, budget=100)
+        assert "> " not in prompt.text
+        assert "wrote:" not in prompt.text
+
+    def test_repeated_paragraphs_are_replaced(self):
+        messages = [(f"t{i}", f"Reply {i}.\n\n" + FILLER) for i in range(6)]
+        prompt = build(messages, budget=600)
+        assert prompt.text.count(FILLER.strip()) == 1
+        assert "[repeated text omitted]" in prompt.text
+
+    def test_pasted_log_keeps_head_and_tail(self):
+        log = "\n".join(f"2024-01-01 ERROR worker {i} crashed" for i in range(300))
+        prompt = build([("t1", "Crash log:\n" + log)], budget=1000)
+        assert "worker 0 crashed" in prompt.text
+        assert "worker 299 crashed" in prompt.text
+        assert "lines omitted" in prompt.text
+        assert prompt.thread_tokens <= 1000
+
+
+class TestEstimateTokens:
+    """Test suite for estimate_tokens."""
+
+    def test_counts_utf8_bytes(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("é" * 4) == 2
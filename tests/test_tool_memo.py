@@ -0,0 +1,94 @@
+"""Tests for per-run tool result memoization."""
+
+from types import SimpleNamespace
+
+from google.adk.agents import LlmAgent
+from prometheus_client import REGISTRY
+
+from tests.conftest import FakeLlm, run_agent
+from triage_agent.serving.plugin import MetricsPlugin
+from triage_agent.tool_memo import ToolMemo
+
+TOOL = SimpleNamespace(name="search_knowledge_base")
+
+
+def context(invocation_id: str, call_id: str) -> SimpleNamespace:
+    return SimpleNamespace(invocation_id=invocation_id, function_call_id=call_id)
+
+
+class TestToolMemo:
+    """Test suite for ToolMemo's callbacks."""
+
+    def test_repeat_call_is_answered_from_memo(self):
+        memo = ToolMemo(enabled=True)
+        args = {"query": "dark mode"}
+        assert memo.before_tool(TOOL, args, context("inv-1", "c1")) is None
+        memo.after_tool(TOOL, args, context("inv-1", "c1"), {"articles": [1]})
+
+        assert memo.before_tool(TOOL, dict(args), context("inv-1", "c2")) == {
+            "articles": [1]
+        }
+        assert memo.was_memoized("inv-1", "c2")
+        assert not memo.was_memoized("inv-1", "c1")
+
+    def test_different_args_and_runs_miss(self):
+        memo = ToolMemo(enabled=True)
+        memo.after_tool(TOOL, {"query": "a"}, context("inv-1", "c1"), {"n": 1})
+        assert memo.before_tool(TOOL, {"query": "b"}, context("inv-1", "c2")) is None
+        assert memo.before_tool(TOOL, {"query": "a"}, context("inv-2", "c3")) is None
+
+    def test_finished_run_is_dropped(self):
+        memo = ToolMemo(enabled=True)
+        memo.after_tool(TOOL, {"query": "a"}, context("inv-1", "c1"), {"n": 1})
+        memo.after_agent(SimpleNamespace(invocation_id="inv-1"))
+        assert memo.before_tool(TOOL, {"query": "a"}, context("inv-1", "c2")) is None
+
+    def test_number_of_runs_is_bounded(self):
+        memo = ToolMemo(max_runs=2, enabled=True)
+        for i in range(3):
+            memo.after_tool(TOOL, {}, context(f"inv-{i}", "c"), {"n": i})
+        assert memo.before_tool(TOOL, {}, context("inv-0", "c2")) is None
+        assert memo.before_tool(TOOL, {}, context("inv-2", "c2")) == {"n": 2}
+
+    def test_disabled(self):
+        memo = ToolMemo(enabled=False)
+        memo.after_tool(TOOL, {}, context("inv-1", "c1"), {"n": 1})
+        assert memo.before_tool(TOOL, {}, context("inv-1", "c2")) is None
+
+
+class TestMemoizedAgentRun:
+    """Repeated calls in a real ADK run execute the tool once."""
+
+    def test_tool_runs_once_and_hit_is_counted(self, monkeypatch):
+        memo = ToolMemo(enabled=True)
+        monkeypatch.setattr("triage_agent.serving.plugin.TOOL_MEMO", memo)
+        executions = []
+
+        def lookup_plan(customer_id: str) -> dict:
+            """Look up the customer's plan."""
+            executions.append(customer_id)
+            return {"plan": "free"}
+
+        agent = LlmAgent(
+            # Requests the same tool call twice, then answers
+            model=FakeLlm(
+                text='{"urgency": "low"}',
+                tool_calls=[("lookup_plan", {"customer_id": "CUST-001"})] * 2,
+            ),
+            name="memo_test_agent",
+            instruction="Triage.",
+            tools=[lookup_plan],
+            before_tool_callback=memo.before_tool,
+            after_tool_callback=memo.after_tool,
+            after_agent_callback=memo.after_agent,
+        )
+        labels = {"tool": "lookup_plan", "outcome": "memoized"}
+        before = REGISTRY.get_sample_value("triage_tool_calls_total", labels) or 0.0
+
+        run = run_agent(agent, "hi", plugins=[MetricsPlugin()])
+        assert executions == ["CUST-001"]
+        assert run.tool_responses == [{"plan": "free"}, {"plan": "free"}]
+        after = REGISTRY.get_sample_value("triage_tool_calls_total", labels)
+        assert after - before == 1
+        # The finished run's results are released
+        assert not memo._runs
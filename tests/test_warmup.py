@@ -0,0 +1,43 @@
+"""Tests for the startup warm-up tracker."""
+
+import asyncio
+
+from triage_agent.serving.warmup import Warmup
+
+
+class TestWarmup:
+    """Test suite for Warmup."""
+
+    def test_runs_steps_in_order_then_ready(self):
+        ran = []
+        warmup = Warmup([("a", lambda: ran.append("a")), ("b", lambda: ran.append("b"))])
+        assert not warmup.ready
+        assert warmup.status()["status"] == "warming_up"
+
+        asyncio.run(warmup.run())
+
+        assert ran == ["a", "b"]
+        assert warmup.ready
+        status = warmup.status()
+        assert status["status"] == "ready"
+        assert list(status["steps"]) == ["a", "b"]
+        assert all(step["ok"] for step in status["steps"].values())
+
+    def test_failed_step_is_recorded_and_rest_still_run(self):
+        ran = []
+
+        def _fail():
+            raise RuntimeError("no vector store")
+
+        warmup = Warmup([("broken", _fail), ("after", lambda: ran.append("after"))])
+        asyncio.run(warmup.run())
+
+        assert warmup.ready
+        assert ran == ["after"]
+        assert warmup.results["broken"]["ok"] is False
+        assert "no vector store" in warmup.results["broken"]["error"]
+
+    def test_mark_ready_without_steps(self):
+        warmup = Warmup([])
+        warmup.mark_ready()
+        assert warmup.status()["status"] == "ready"
@@ -1,3 +1,14 @@
-"""Support Ticket Triage Agent — ADK package entry point."""
+"""Support Ticket Triage Agent — ADK package entry point.
 
-from . import agent  # noqa: F401
+``agent`` (and with it ADK and LiteLLM) is imported on first access, so
+importing the tools, models or serving helpers stays cheap. ADK's loader
+imports ``triage_agent.agent`` itself to find ``root_agent``.
+"""
+
+import importlib
+
+
+def __getattr__(name: str):
+    if name == "agent":
+        return importlib.import_module(f"{__name__}.agent")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,25 @@
 """Support Ticket Triage Agent — ADK agent definition."""
 
 import os
-from google.adk.agents import LlmAgent
+from google.adk.agents import BaseAgent, LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 
+from triage_agent.cascade import CascadeAgent
+from triage_agent.cassette import wrap_model
+from triage_agent.http_clients import openai_async_client
 from triage_agent.models import TriageResult
-from triage_agent.prompts import TRIAGE_AGENT_INSTRUCTION
+from triage_agent.drafts import deferred_drafts_enabled
+from triage_agent.prompts import (
+    CLASSIFY_ONLY_INSTRUCTION,
+    DRAFT_WRITER_INSTRUCTION,
+    TRIAGE_AGENT_INSTRUCTION,
+)
+from triage_agent.tool_memo import TOOL_MEMO
 from triage_agent.tools import (
-    check_sla_status,
     check_system_status,
     get_agent_availability,
-    get_customer_health_score,
+    get_customer_context,
     lookup_billing_transaction,
-    lookup_customer_history,
     search_knowledge_base,
     search_ticket_history,
 )
@@ -21,35 +28,123 @@ from triage_agent.tools import (
 MODEL_NAME = os.getenv("MODEL_NAME", "gpt-4-turbo-preview")
 TEMPERATURE = float(os.getenv("TEMPERATURE", "0.3"))
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "2000"))
+# Routes requests sharing the static prompt prefix to the same provider
+# cache shard (OpenAI prompt caching); empty disables
+PROMPT_CACHE_KEY = os.getenv("PROMPT_CACHE_KEY", "support-triage-v1")
+# Cheap-model-first cascade: a small model answers first and MODEL_NAME only
+# re-runs tickets it can't be trusted with (see triage_agent.cascade);
+# empty disables
+CASCADE_MODEL_NAME = os.getenv("CASCADE_MODEL_NAME", "")
+CASCADE_MIN_CONFIDENCE = float(os.getenv("CASCADE_MIN_CONFIDENCE", "0.7"))
+# Constrain the final answer to the TriageResult JSON schema (OpenAI
+# structured outputs; needs a model that supports them, e.g. gpt-4o)
+STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "false").lower() == "true"
+# Two-phase triage: the agent only classifies; replies are drafted afterwards
+# by draft_agent, off the request path (see triage_agent.drafts)
+DEFERRED_DRAFTS = deferred_drafts_enabled()
+DRAFT_MODEL_NAME = os.getenv("DRAFT_MODEL_NAME", "") or MODEL_NAME
+
+# Send LLM calls through the shared keep-alive connection pool
+llm_client_args = {}
+llm_client = openai_async_client()
+if llm_client is not None:
+    llm_client_args["client"] = llm_client
+if PROMPT_CACHE_KEY:
+    llm_client_args["prompt_cache_key"] = PROMPT_CACHE_KEY
+
+
+def build_triage_agent(name: str, model_name: str, is_root: bool = True) -> LlmAgent:
+    """The triage LlmAgent on the given model.
+
+    Args:
+        name: Agent name (unique within the agent tree).
+        model_name: OpenAI model name.
+        is_root: Whether the agent is the root of its run; the root clears
+                 the run's tool memo when it finishes.
+    """
+    return LlmAgent(
+        # Record/replay per LLM_CASSETTE_MODE (see triage_agent.cassette)
+        model=wrap_model(
+            LiteLlm(
+                model=f"openai/{model_name}",
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+                **llm_client_args,
+            )
+        ),
+        name=name,
+        description=(
+            "An AI agent that triages incoming customer support tickets by "
+            "classifying urgency, extracting key information, searching a "
+            "knowledge base, and deciding the appropriate next action."
+        ),
+        # Static (never state-templated), so the system prompt plus the tool
+        # schemas below form a byte-identical prefix on every LLM call that the
+        # provider can cache; per-ticket content only ever follows it
+        static_instruction=TRIAGE_AGENT_INSTRUCTION
+        + (CLASSIFY_ONLY_INSTRUCTION if DEFERRED_DRAFTS else ""),
+        # Tool calls stay free-form; only the final answer is schema-bound
+        output_schema=TriageResult if STRUCTURED_OUTPUT else None,
+        tools=[
+            # Context Tools (profile, health score and SLA status come from
+            # the one composite lookup rather than three separate calls)
+            get_customer_context,
+            search_ticket_history,
+
+            # Knowledge Tools
+            search_knowledge_base,
+
+            # Operational Tools
+            check_system_status,
+            lookup_billing_transaction,
+
+            # Routing Tools
+            get_agent_availability,
+        ],
+        # No agent transfers: keeps the transfer tool out of the prompt prefix
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        # Repeated identical tool calls within a run reuse the first result
+        before_tool_callback=TOOL_MEMO.before_tool,
+        after_tool_callback=TOOL_MEMO.after_tool,
+        after_agent_callback=TOOL_MEMO.after_agent if is_root else None,
+    )
+
+
+root_agent: BaseAgent
+if CASCADE_MODEL_NAME:
+    root_agent = CascadeAgent(
+        name="support_triage_cascade",
+        description="Triages with a fast model first, escalating to the full model",
+        min_confidence=CASCADE_MIN_CONFIDENCE,
+        sub_agents=[
+            build_triage_agent("fast_triage_agent", CASCADE_MODEL_NAME, is_root=False),
+            build_triage_agent("support_triage_agent", MODEL_NAME, is_root=False),
+        ],
+        after_agent_callback=TOOL_MEMO.after_agent,
+    )
+else:
+    root_agent = build_triage_agent("support_triage_agent", MODEL_NAME)
+
 
-root_agent = LlmAgent(
-    model=LiteLlm(
-        model=f"openai/{MODEL_NAME}",
-        temperature=TEMPERATURE,
-        max_tokens=MAX_TOKENS,
-    ),
-    name="support_triage_agent",
-    description=(
-        "An AI agent that triages incoming customer support tickets by "
-        "classifying urgency, extracting key information, searching a "
-        "knowledge base, and deciding the appropriate next action."
-    ),
-    instruction=TRIAGE_AGENT_INSTRUCTION,
-    tools=[
-        # Context Tools
-        lookup_customer_history,
-        search_ticket_history,
-        get_customer_health_score,
-
-        # Knowledge Tools
-        search_knowledge_base,
-
-        # Operational Tools
-        check_system_status,
-        lookup_billing_transaction,
-        check_sla_status,
-
-        # Routing Tools
-        get_agent_availability,
-    ],
-)
\ No newline at end of file
+def build_draft_agent() -> LlmAgent:
+    """The tool-less agent writing deferred draft responses."""
+    client_args = dict(llm_client_args)
+    if PROMPT_CACHE_KEY:
+        # A different static prefix from the triage agent's
+        client_args["prompt_cache_key"] = f"{PROMPT_CACHE_KEY}-draft"
+    return LlmAgent(
+        model=wrap_model(
+            LiteLlm(
+                model=f"openai/{DRAFT_MODEL_NAME}",
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+                **client_args,
+            )
+        ),
+        name="draft_writer",
+        description="Writes the customer reply for an already triaged ticket.",
+        static_instruction=DRAFT_WRITER_INSTRUCTION,
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+    )
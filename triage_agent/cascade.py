@@ -0,0 +1,108 @@
+"""Cheap-model-first triage cascade.
+
+``CascadeAgent`` runs its first sub-agent (on a small, fast model) and only
+hands the ticket to its second sub-agent (on ``MODEL_NAME``) when the cheap
+answer can't be trusted on its own:
+
+- it doesn't parse/validate as a ``TriageResult``, even after local repair
+  (``invalid``), or the cheap run failed (``error``)
+- its ``confidence`` is missing or below the threshold (``low_confidence``)
+- it lands in the hard tail: urgency ``critical`` or action
+  ``escalate_to_human``
+
+An escalated cheap answer is never yielded (nor are the cheap run's streamed
+chunks), so it is not stored in the session, returned or acted on early; the full model does see the cheap run's tool calls and
+results (and reuses them through the per-run tool memo). The final event
+carries ``custom_metadata["cascade"]`` with the answering sub-agent and the
+escalation reason, and every run is counted in ``triage_cascade_runs_total``.
+"""
+
+import logging
+from contextlib import aclosing
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+
+from triage_agent.parsing import parse_triage_result
+from triage_agent.serving import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def escalation_reason(text: str, min_confidence: float) -> Optional[str]:
+    """Why a cheap-model answer needs the full model, or None to accept it."""
+    result = parse_triage_result(text, repair=True)
+    if result is None:
+        return "invalid"
+    if result.confidence is None or result.confidence < min_confidence:
+        return "low_confidence"
+    if result.urgency == "critical":
+        return "critical"
+    if result.recommended_action.action == "escalate_to_human":
+        return "escalate_to_human"
+    return None
+
+
+def _is_answer(event: Event) -> bool:
+    return bool(
+        event.is_final_response()
+        and event.content
+        and event.content.parts
+        and event.content.parts[0].text
+    )
+
+
+class CascadeAgent(BaseAgent):
+    """Runs ``sub_agents[0]`` (cheap) and falls back to ``sub_agents[1]`` (full)."""
+
+    min_confidence: float = 0.7
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        cheap, full = self.sub_agents
+
+        answer = None
+        try:
+            async with aclosing(cheap.run_async(ctx)) as events:
+                async for event in events:
+                    if event.partial:
+                        # Streamed chunks of an answer that may be escalated
+                        # (and of tool calls, which follow complete)
+                        continue
+                    if _is_answer(event):
+                        # Held back until it has been checked
+                        answer = event
+                        continue
+                    yield event
+        except Exception:
+            logger.exception("Cheap model run failed; escalating")
+            reason = "error"
+        else:
+            if answer is None:
+                reason = "invalid"
+            else:
+                reason = escalation_reason(
+                    answer.content.parts[0].text, self.min_confidence
+                )
+
+        if reason is None:
+            metrics.CASCADE_RUNS.labels(outcome="accepted").inc()
+            answer.custom_metadata = {
+                **(answer.custom_metadata or {}),
+                "cascade": {"answered_by": cheap.name, "escalation_reason": None},
+            }
+            yield answer
+            return
+
+        metrics.CASCADE_RUNS.labels(outcome=reason).inc()
+        async with aclosing(full.run_async(ctx)) as events:
+            async for event in events:
+                if _is_answer(event):
+                    event.custom_metadata = {
+                        **(event.custom_metadata or {}),
+                        "cascade": {"answered_by": full.name, "escalation_reason": reason},
+                    }
+                yield event
@@ -0,0 +1,164 @@
+"""Record/replay wrapper for the agent's LLM.
+
+``CassetteLlm`` wraps the model of every triage agent:
+
+- ``record``: calls the real model and appends each request/response pair
+  (tool-call turns included) to a JSONL cassette file
+- ``replay``: serves the recorded responses without calling the model (or
+  touching the network), optionally with simulated latency
+- ``off``: not wrapped at all
+
+Tools, sessions, the server and everything else run for real, so a replayed
+run benchmarks the whole stack except the model, and gives the same answers
+on every run.
+
+A response is looked up by model, conversation (the ticket's user message,
+minus any prefetched context, which depends on the environment) and turn
+(number of model turns so far), so replay tolerates small differences in
+tool output between recording and replay (e.g. keyword instead of semantic
+KB search without network).
+
+- ``LLM_CASSETTE_MODE``: ``off`` (default), ``record`` or ``replay``
+- ``LLM_CASSETTE_PATH``: cassette file (default ``data/cassettes/llm.jsonl``)
+- ``LLM_REPLAY_LATENCY``: ``recorded`` (default; sleep as long as the
+  recorded call took), or a fixed number of seconds (``0`` for none)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import AsyncGenerator, Optional
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from pydantic import PrivateAttr
+
+from triage_agent.prefetch import PREFETCH_HEADER
+
+DEFAULT_CASSETTE_PATH = Path(__file__).parent.parent / "data" / "cassettes" / "llm.jsonl"
+
+
+class CassetteMissError(LookupError):
+    """Replay found no recorded response for a request."""
+
+
+def request_key(llm_request: LlmRequest) -> tuple[str, int]:
+    """(conversation key, turn) identifying a request across runs."""
+    ticket_text = ""
+    for content in llm_request.contents:
+        texts = [part.text for part in content.parts or [] if part.text]
+        if content.role == "user" and texts:
+            ticket_text = "".join(texts).split("\n\n" + PREFETCH_HEADER)[0]
+            break
+    turn = sum(1 for content in llm_request.contents if content.role == "model")
+    digest = hashlib.sha256(
+        f"{llm_request.model}\n{ticket_text}".encode("utf-8")
+    ).hexdigest()[:24]
+    return digest, turn
+
+
+def _strip_call_ids(response: dict) -> dict:
+    # Provider tool-call IDs are per call; let ADK assign fresh ones on replay
+    for part in response.get("content", {}).get("parts", []):
+        part.get("function_call", {}).pop("id", None)
+    return response
+
+
+class CassetteLlm(BaseLlm):
+    """Records responses of ``inner`` to a cassette, or replays them."""
+
+    inner: Optional[BaseLlm] = None
+    mode: str = "replay"
+    cassette_path: Path = DEFAULT_CASSETTE_PATH
+    # Seconds to sleep per replayed call; None to use the recorded latency
+    replay_latency: Optional[float] = None
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _recorded: Optional[dict] = PrivateAttr(default=None)
+
+    def _load(self) -> dict:
+        with self._lock:
+            if self._recorded is None:
+                recorded = {}
+                if self.cassette_path.exists():
+                    with open(self.cassette_path, encoding="utf-8") as f:
+                        for line in f:
+                            if line.strip():
+                                entry = json.loads(line)
+                                recorded[(entry["key"], entry["turn"])] = entry
+                self._recorded = recorded
+            return self._recorded
+
+    def _append(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cassette_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key, turn = request_key(llm_request)
+
+        if self.mode == "replay":
+            entry = self._load().get((key, turn))
+            if entry is None:
+                raise CassetteMissError(
+                    f"No recorded response for {llm_request.model} turn {turn} "
+                    f"(key {key}) in {self.cassette_path}"
+                )
+            latency = self.replay_latency
+            if latency is None:
+                latency = entry["latency_seconds"]
+            if latency > 0:
+                await asyncio.sleep(latency)
+            for response in entry["responses"]:
+                yield LlmResponse.model_validate(response)
+            return
+
+        started = time.perf_counter()
+        responses = []
+        async for response in self.inner.generate_content_async(llm_request, stream):
+            responses.append(response)
+            yield response
+        # Written once the call completes, so an aborted call leaves no entry
+        self._append(
+            {
+                "key": key,
+                "turn": turn,
+                "model": llm_request.model,
+                "latency_seconds": round(time.perf_counter() - started, 3),
+                "request": [
+                    content.model_dump(mode="json", exclude_none=True)
+                    for content in llm_request.contents
+                ],
+                "responses": [
+                    _strip_call_ids(response.model_dump(mode="json", exclude_none=True))
+                    for response in responses
+                ],
+            }
+        )
+
+
+def wrap_model(model: BaseLlm) -> BaseLlm:
+    """Wrap ``model`` per LLM_CASSETTE_MODE (unchanged when ``off``)."""
+    mode = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+    if mode == "off":
+        return model
+    if mode not in ("record", "replay"):
+        raise ValueError(
+            f"LLM_CASSETTE_MODE must be off, record or replay, not {mode!r}"
+        )
+
+    latency = os.getenv("LLM_REPLAY_LATENCY", "recorded")
+    return CassetteLlm(
+        model=model.model,
+        inner=model,
+        mode=mode,
+        cassette_path=Path(os.getenv("LLM_CASSETTE_PATH", str(DEFAULT_CASSETTE_PATH))),
+        replay_latency=None if latency == "recorded" else float(latency),
+    )
@@ -0,0 +1,112 @@
+"""Deferred draft-response generation (two-phase triage).
+
+With ``DEFERRED_DRAFTS`` on, the triage agent only classifies the ticket
+(its answer's ``draft_response`` is null), so the routing decision is
+returned without waiting for the customer reply to be written. The reply
+is then written by a separate, tool-less draft writer from the ticket, the
+classification and the context the triage run gathered, off the request's
+critical path.
+
+- ``DEFERRED_DRAFTS``: enable two-phase triage (default false)
+- ``DRAFT_ACTIONS``: comma-separated actions that get a draft (default all
+  three; e.g. ``auto_respond,route_to_specialist`` to skip tickets going to
+  a human, whose drafts are mostly discarded)
+- ``DRAFT_MODEL_NAME``: model of the draft writer (default ``MODEL_NAME``)
+"""
+
+import json
+import os
+import re
+from typing import Any
+
+from triage_agent.models import TriageResult
+from triage_agent.parsing import ACTIONS
+
+# Tool results passed on to the draft writer, and how much of each
+DRAFT_CONTEXT_TOOLS = ("get_customer_context", "search_knowledge_base")
+MAX_CONTEXT_CHARS = 4000
+
+_FENCE = re.compile(r"^```[a-z]*\n(.*?)\n?```$", re.DOTALL)
+
+
+def deferred_drafts_enabled() -> bool:
+    """Whether DEFERRED_DRAFTS is on."""
+    return os.getenv("DEFERRED_DRAFTS", "false").lower() == "true"
+
+
+def draft_actions() -> set[str]:
+    """Actions whose tickets get a deferred draft (DRAFT_ACTIONS)."""
+    configured = os.getenv("DRAFT_ACTIONS", "")
+    if not configured.strip():
+        return set(ACTIONS)
+    return {action.strip() for action in configured.split(",") if action.strip()}
+
+
+def needs_draft(result: TriageResult | None) -> bool:
+    """Whether a draft should be generated for a classified ticket."""
+    return (
+        result is not None
+        and not result.draft_response
+        and result.recommended_action.action in draft_actions()
+    )
+
+
+def build_draft_message(
+    ticket_message: str,
+    result: TriageResult,
+    tool_results: list[tuple[str, Any]],
+) -> str:
+    """The draft writer's input: ticket, classification and triage context."""
+    classification = result.model_dump(exclude={"draft_response", "confidence"})
+    sections = [
+        ticket_message,
+        "**Triage Result:**\n" + json.dumps(classification, ensure_ascii=False, indent=2),
+    ]
+    for name, response in tool_results:
+        if name in DRAFT_CONTEXT_TOOLS:
+            text = json.dumps(response, ensure_ascii=False, default=str)
+            if len(text) > MAX_CONTEXT_CHARS:
+                text = text[:MAX_CONTEXT_CHARS] + " ..."
+            sections.append(f"**Context ({name}):**\n{text}")
+    sections.append("Write the reply to the customer.")
+    return "\n\n".join(sections)
+
+
+def clean_draft(text: str) -> str:
+    """Strip a code fence or surrounding quotes from the writer's output."""
+    text = text.strip()
+    match = _FENCE.match(text)
+    if match:
+        text = match.group(1).strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        text = text[1:-1].strip()
+    return text
+
+
+async def generate_draft(runner, session_service, user_id: str, message: str) -> str:
+    """Run the draft writer on ``message`` and return the reply text.
+
+    Raises:
+        RuntimeError: If the writer produced no reply.
+    """
+    from google.genai import types
+
+    app_name = runner.app_name
+    session = await session_service.create_session(app_name=app_name, user_id=user_id)
+    draft = ""
+    try:
+        async for event in runner.run_async(
+            session_id=session.id,
+            user_id=user_id,
+            new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                draft = event.content.parts[0].text or ""
+    finally:
+        await session_service.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session.id
+        )
+    draft = clean_draft(draft)
+    if not draft:
+        raise RuntimeError("Draft writer did not produce a response")
+    return draft
@@ -0,0 +1,105 @@
+"""Best-effort triage result built without the model.
+
+Used when a triage run is cut short (e.g. its deadline expires): whatever
+tool results the agent had already gathered are turned into a conservative
+``TriageResult`` that always hands the ticket to a human.
+"""
+
+from triage_agent.models import ExtractedInfo, RecommendedAction, TriageResult
+
+# Knowledge base article category -> product area
+KB_CATEGORY_PRODUCT_AREA = {
+    "billing": "billing",
+    "system": "platform",
+    "features": "ui",
+}
+
+
+def build_fallback_result(
+    tool_results: list[tuple[str, dict]], reason: str
+) -> TriageResult:
+    """Build a conservative triage result from partial tool output.
+
+    Args:
+        tool_results: (tool name, response) pairs in the order they ran.
+        reason: Why the normal run did not finish (shown in the result).
+
+    Returns:
+        TriageResult: Always ``escalate_to_human``; urgency is raised from
+        the default ``medium`` by SLA risk, plan tier, churn risk or an
+        active incident when those results are available.
+    """
+    latest = {}
+    for name, response in tool_results:
+        latest[name] = response
+
+    customer = latest.get("lookup_customer_history", {}).get("customer") or {}
+    sla = latest.get("check_sla_status", {})
+    health = latest.get("get_customer_health_score", {})
+    context = latest.get("get_customer_context", {})
+    if context.get("status") == "found":
+        # The composite tool carries the same sections, minus their status
+        if context.get("profile"):
+            customer = {"customer_id": context["customer_id"], **context["profile"]}
+        if context.get("sla"):
+            sla = {"status": "found", **context["sla"]}
+        if context.get("health"):
+            health = {"status": "found", **context["health"]}
+    system = latest.get("check_system_status", {})
+    kb = latest.get("search_knowledge_base", {})
+
+    findings = []
+    urgency = "medium"
+
+    if customer:
+        findings.append(
+            f"Customer {customer.get('customer_id')} is on the "
+            f"{customer.get('plan')} plan."
+        )
+        if customer.get("plan") == "enterprise":
+            urgency = "high"
+    if health.get("status") == "found":
+        findings.append(f"Churn risk is {health.get('risk_level')}.")
+        if health.get("risk_level") == "high":
+            urgency = "high"
+    if system.get("incidents") or system.get("region_status") in ("degraded", "outage"):
+        findings.append("An active incident affects the customer's region.")
+        urgency = "high"
+    if sla.get("status") == "found":
+        findings.append(
+            f"SLA {sla.get('sla_tier')} has "
+            f"{sla.get('time_remaining_hours')}h remaining."
+        )
+        if sla.get("is_at_risk"):
+            urgency = "critical"
+
+    product_area = "other"
+    articles = kb.get("articles") or []
+    if articles:
+        category = articles[0].get("category", "")
+        product_area = KB_CATEGORY_PRODUCT_AREA.get(category, "other")
+        findings.append(f"Closest KB article: {articles[0].get('title')}.")
+
+    tools_run = ", ".join(dict.fromkeys(name for name, _ in tool_results)) or "none"
+    reasoning = (
+        f"Automated triage incomplete: {reason}. "
+        f"Tools completed: {tools_run}. "
+        + (" ".join(findings) if findings else "No customer context was gathered.")
+    )
+
+    return TriageResult(
+        urgency=urgency,
+        extracted_info=ExtractedInfo(
+            product_area=product_area,
+            issue_type="other",
+            customer_sentiment="unknown",
+            language="unknown",
+        ),
+        recommended_action=RecommendedAction(
+            action="escalate_to_human",
+            route_to=None,
+            reason="Automated triage did not complete; needs human review",
+        ),
+        reasoning=reasoning,
+        draft_response="",
+    )
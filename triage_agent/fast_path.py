@@ -0,0 +1,157 @@
+"""Deterministic fast path for clear-cut tickets.
+
+The prompt sends simple how-to questions and feature requests from
+low-risk customers to ``auto_respond`` after a single knowledge base
+search. This module recognizes those tickets with plain rules over the
+same tool data and builds the ``TriageResult`` directly, without an LLM
+call. Anything it is not sure about returns ``None`` and goes to the agent.
+
+A ticket takes the fast path only if all of these hold:
+
+- English text with no escalation signals (errors, outages, billing,
+  frustration, ...)
+- It reads as a how-to question or a feature request
+- The customer is on the free plan (or unknown, i.e. a new free customer),
+  has low churn risk, and their SLA is not at risk
+- ``search_knowledge_base`` returns a semantic match scoring at least
+  ``FAST_PATH_MIN_SIMILARITY``
+"""
+
+import os
+import re
+from typing import Optional
+
+from triage_agent.fallback import KB_CATEGORY_PRODUCT_AREA
+from triage_agent.models import ExtractedInfo, RecommendedAction, TriageResult
+from triage_agent.tools import (
+    check_sla_status,
+    get_customer_health_score,
+    lookup_customer_history,
+    search_knowledge_base,
+)
+
+# Minimum similarity_score of the top knowledge base article
+FAST_PATH_MIN_SIMILARITY = float(os.getenv("FAST_PATH_MIN_SIMILARITY", "0.5"))
+
+# Anything that could make a ticket more than a simple question
+_ESCALATION_SIGNALS = re.compile(
+    r"\b(error|errors|outage|down|crash\w*|broken|bug|bugs|fail\w*|"
+    r"not working|doesn'?t work|can'?t|cannot|unable|"
+    r"charge\w*|refund\w*|payment\w*|invoice\w*|billing|bill|cancel\w*|"
+    r"urgent\w*|asap|immediately|emergency|lost|loss|delete\w*|"
+    r"security|hack\w*|breach\w*|dispute\w*|legal|lawyer|"
+    r"ridiculous|unacceptable|terrible|angry|frustrat\w*|"
+    r"enterprise|sla)\b"
+    r"|!{2,}|\?{2,}",
+    re.IGNORECASE,
+)
+
+_HOW_TO = re.compile(
+    r"\b(how (do|can|should) (i|we)|how to|where (do|can) (i|we)|"
+    r"is there a way|do you (support|have|offer)|does (it|the app) support)\b",
+    re.IGNORECASE,
+)
+
+_FEATURE_REQUEST = re.compile(
+    r"\b(feature request|would be (great|cool|nice|helpful) if|"
+    r"(please|could you|can you) add|wish (you|there|it))\b",
+    re.IGNORECASE,
+)
+
+
+def _is_english(text: str) -> bool:
+    letters = [c for c in text if c.isalpha()]
+    if not letters:
+        return False
+    non_ascii = sum(1 for c in letters if not c.isascii())
+    return non_ascii / len(letters) < 0.05
+
+
+def fast_path_triage(
+    customer_id: str, subject: str, messages: list[str]
+) -> Optional[TriageResult]:
+    """Triage a clear-cut ticket without the LLM.
+
+    Args:
+        customer_id: Customer identifier.
+        subject: Ticket subject line.
+        messages: Message contents, oldest first.
+
+    Returns:
+        TriageResult: An ``auto_respond`` result for a clear-cut ticket,
+        or None if the ticket needs the agent.
+    """
+    text = "\n".join([subject, *messages])
+    if not _is_english(text) or _ESCALATION_SIGNALS.search(text):
+        return None
+
+    if _FEATURE_REQUEST.search(text):
+        issue_type = "feature_request"
+    elif _HOW_TO.search(text):
+        issue_type = "question"
+    else:
+        return None
+
+    # Customer gates: cheap local lookups, checked before the KB search
+    customer = lookup_customer_history(customer_id)
+    if customer["status"] == "found" and customer["customer"]["plan"] != "free":
+        return None
+    health = get_customer_health_score(customer_id)
+    if health["status"] == "found" and health["risk_level"] != "low":
+        return None
+    sla = check_sla_status(customer_id)
+    if sla["status"] == "found" and sla["is_at_risk"]:
+        return None
+
+    kb = search_knowledge_base(f"{subject} {messages[-1] if messages else ''}")
+    articles = kb.get("articles") or []
+    if not articles:
+        return None
+    article = articles[0]
+    similarity = article.get("similarity_score")
+    # Keyword fallback results carry no score and are never "strong"
+    if similarity is None or similarity < FAST_PATH_MIN_SIMILARITY:
+        return None
+
+    if customer["status"] == "found":
+        first_name = customer["customer"]["name"].split()[0]
+        customer_context = (
+            f"Customer {customer_id} is on the free plan with "
+            f"{health.get('risk_level', 'unknown')} churn risk."
+        )
+    else:
+        first_name = "there"
+        customer_context = f"Customer {customer_id} is new (free tier, no history)."
+
+    kind = "feature request" if issue_type == "feature_request" else "how-to question"
+    opening = (
+        "Thanks for the suggestion!"
+        if issue_type == "feature_request"
+        else "Thanks for reaching out!"
+    )
+
+    return TriageResult(
+        urgency="low",
+        extracted_info=ExtractedInfo(
+            product_area=KB_CATEGORY_PRODUCT_AREA.get(article.get("category"), "other"),
+            issue_type=issue_type,
+            customer_sentiment="neutral",
+            language="english",
+        ),
+        recommended_action=RecommendedAction(
+            action="auto_respond",
+            route_to=None,
+            reason=f"Simple {kind} with a clear knowledge base answer",
+        ),
+        reasoning=(
+            f"Rule-based fast path: {kind} with no escalation signals. "
+            f"{customer_context} SLA not at risk. "
+            f"Knowledge base article '{article['title']}' matched with "
+            f"similarity {similarity}."
+        ),
+        draft_response=(
+            f"Hi {first_name},\n\n{opening} {article['content']}\n\n"
+            "If this doesn't answer your question, just reply to this "
+            "message and we'll be happy to help further."
+        ),
+    )
@@ -0,0 +1,102 @@
+"""Shared, long-lived HTTP clients for LLM and embedding calls.
+
+Every triage makes several LLM calls and at least one embedding call to the
+same provider. Routing them through process-wide connection pools keeps
+connections (and their TLS sessions) alive between calls instead of paying
+a new handshake whenever a client is rebuilt or a pool runs dry.
+
+LLM calls are async (LiteLLM) and embedding calls are sync (ChromaDB), so
+there is one ``httpx.AsyncClient`` and one ``httpx.Client``, both built
+lazily with the same settings:
+
+- ``HTTP_MAX_CONNECTIONS``: max open connections per pool (default 100)
+- ``HTTP_MAX_KEEPALIVE_CONNECTIONS``: idle connections kept open (default 20)
+- ``HTTP_KEEPALIVE_EXPIRY_SECONDS``: idle time before closing (default 60)
+- ``HTTP_TIMEOUT_SECONDS``: request timeout (default 60)
+- ``HTTP2``: ``auto`` (use HTTP/2 when the ``h2`` package is installed),
+  ``true`` or ``false``
+
+Clients hold no connections until first used, so creating them in a
+pre-fork parent is safe: each worker opens its own connections.
+"""
+
+import os
+import threading
+from typing import Optional
+
+import httpx
+
+_lock = threading.Lock()
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_enabled() -> bool:
+    """Whether the pools negotiate HTTP/2 (per the HTTP2 setting)."""
+    setting = os.getenv("HTTP2", "auto").lower()
+    if setting == "auto":
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+    return setting == "true"
+
+
+def pool_settings() -> dict:
+    """Keyword arguments shared by both httpx clients."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(
+                os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+            ),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60")),
+        ),
+        "timeout": httpx.Timeout(float(os.getenv("HTTP_TIMEOUT_SECONDS", "60"))),
+        "http2": http2_enabled(),
+    }
+
+
+def get_sync_client() -> httpx.Client:
+    """Process-wide pooled client for blocking calls (embeddings)."""
+    global _sync_client
+    with _lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(**pool_settings())
+        return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Process-wide pooled client for async calls (LLM completions)."""
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            _async_client = httpx.AsyncClient(**pool_settings())
+        return _async_client
+
+
+def openai_client(api_key: str, base_url: str = None):
+    """``openai.OpenAI`` using the shared sync pool."""
+    import openai
+
+    return openai.OpenAI(
+        api_key=api_key, base_url=base_url, http_client=get_sync_client()
+    )
+
+
+def openai_async_client(api_key: str = None, base_url: str = None):
+    """``openai.AsyncOpenAI`` using the shared async pool.
+
+    Returns None if no API key is given or set in OPENAI_API_KEY; callers
+    then fall back to their default client (which reports the missing key
+    on first use rather than at import).
+    """
+    import openai
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    return openai.AsyncOpenAI(
+        api_key=api_key, base_url=base_url, http_client=get_async_client()
+    )
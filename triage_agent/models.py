@@ -43,6 +43,13 @@ class TriageResult(BaseModel):
     reasoning: str = Field(
         description="Detailed explanation of the triage decision"
     )
-    draft_response: str = Field(
-        description="Draft response to send to the customer"
+    draft_response: str | None = Field(
+        description="Draft response to send to the customer (null when there "
+        "is nothing to send, or when only classifying)"
+    )
+    confidence: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Self-assessed confidence in the classification and action (0-1)",
     )
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""Parsing of the agent's final JSON answer into a ``TriageResult``.
+
+Answers that are close to valid (truncated output, trailing commas, Python
+literals, ``"High"`` instead of ``"high"``, confidence given in percent)
+are repaired locally by ``parse_triage_result(text, repair=True)`` rather
+than costing another model call.
+"""
+
+import json
+import re
+from typing import Optional
+
+from pydantic import ValidationError
+
+from triage_agent.models import TriageResult
+
+URGENCY_LEVELS = ("critical", "high", "medium", "low")
+ACTIONS = ("auto_respond", "route_to_specialist", "escalate_to_human")
+
+_FENCED_JSON = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def extract_json(text: str) -> Optional[dict]:
+    """Return the JSON object in ``text`` (bare or in a code fence), if any."""
+    if not text:
+        return None
+    candidates = [match.group(1) for match in _FENCED_JSON.finditer(text)]
+    candidates.append(text.strip())
+    # Last resort: outermost braces, for answers with a sentence around them
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidates.append(text[start : end + 1])
+
+    for candidate in candidates:
+        try:
+            value = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+_PYTHON_LITERALS = {"None": "null", "True": "true", "False": "false"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def repair_json(text: str) -> Optional[dict]:
+    """Best-effort parse of a malformed JSON object.
+
+    Starting at the first ``{``: Python literals become JSON ones, trailing
+    commas are dropped, and an unterminated string or unclosed brackets
+    (output cut off at the token limit) are closed.
+    """
+    start = text.find("{") if text else -1
+    if start < 0:
+        return None
+
+    out: list[str] = []
+    stack: list[str] = []
+    in_string = escaped = False
+    i, text = 0, text[start:]
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+            out.append(char)
+        elif char in "}]":
+            if not stack:
+                break  # end of the object; ignore anything after it
+            _drop_trailing_comma(out)
+            out.append(stack.pop())
+            if not stack:
+                break
+        elif char.isascii() and char.isalpha():
+            word = re.match(r"[A-Za-z]+", text[i:]).group(0)
+            out.append(_PYTHON_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    if in_string:
+        if escaped:
+            out.pop()
+        out.append('"')
+    # Truncated mid-object: drop a key left without a value before closing
+    while stack:
+        if stack[-1] == "}":
+            out = [re.sub(r'(?<=[{,])\s*"[^"]*"\s*:?\s*$', "", "".join(out))]
+        _drop_trailing_comma(out)
+        out.append(stack.pop())
+
+    try:
+        value = json.loads("".join(out))
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _drop_trailing_comma(out: list[str]) -> None:
+    joined = "".join(out).rstrip()
+    if joined.endswith(","):
+        out[:] = [joined[:-1]]
+
+
+def _normalize(data: dict) -> dict:
+    """Coerce near-miss field values to the schema's expected form."""
+    if isinstance(data.get("urgency"), str):
+        data["urgency"] = data["urgency"].strip().lower()
+    action = data.get("recommended_action")
+    if isinstance(action, dict):
+        if isinstance(action.get("action"), str):
+            action["action"] = re.sub(r"[\s-]+", "_", action["action"].strip().lower())
+        if action.get("route_to") in ("", "none", "null", "None"):
+            action["route_to"] = None
+        action.setdefault("reason", "")
+    info = data.get("extracted_info")
+    if isinstance(info, dict):
+        for field in ("product_area", "issue_type", "customer_sentiment", "language"):
+            if isinstance(info.get(field), str):
+                info[field] = info[field].strip().lower()
+            else:
+                info[field] = "unknown"
+    if data.get("reasoning") is None:
+        data["reasoning"] = ""
+    confidence = data.get("confidence")
+    if confidence is not None:
+        try:
+            confidence = float(str(confidence).rstrip("%"))
+        except ValueError:
+            confidence = None
+        else:
+            if 1 < confidence <= 100:
+                confidence /= 100  # given in percent
+            if not 0 <= confidence <= 1:
+                confidence = None
+        data["confidence"] = confidence
+    return data
+
+
+def parse_triage_result(text: str, repair: bool = False) -> Optional[TriageResult]:
+    """Parse and validate the agent's answer.
+
+    Args:
+        text: The agent's final response text.
+        repair: Also accept answers that ``repair_json`` can fix and whose
+                field values are near misses (case, spacing, percent
+                confidence, missing non-routing fields). Urgency and action
+                must still be one of the allowed values.
+
+    Returns:
+        TriageResult, or None if the text holds no JSON object, the object
+        doesn't match the schema, or urgency/action is not one of the
+        allowed values.
+    """
+    data = extract_json(text)
+    if data is None and repair:
+        data = repair_json(text)
+    if data is None:
+        return None
+    if repair:
+        data = _normalize(data)
+    if data.get("draft_response") is None:
+        # The prompt's own examples use null when there is nothing to send
+        data["draft_response"] = ""
+    try:
+        result = TriageResult.model_validate(data)
+    except ValidationError:
+        return None
+    if (
+        result.urgency not in URGENCY_LEVELS
+        or result.recommended_action.action not in ACTIONS
+    ):
+        return None
+    return result
@@ -0,0 +1,86 @@
+"""Speculative prefetch of customer context before the first LLM turn.
+
+The prompt has the model call ``get_customer_context`` and
+``search_knowledge_base`` for most tickets, one LLM round trip at a time.
+``prefetch_context`` runs both concurrently before the agent starts and
+``format_prefetched_context`` renders the results into the initial message,
+so the model starts with them instead of asking for them.
+
+- ``PREFETCH_CONTEXT``: ``true`` (default) or ``false``
+- ``PREFETCH_TIMEOUT_SECONDS``: tools still running after this long are
+  left out (the model can still call them); default 5
+"""
+
+import asyncio
+import json
+import os
+
+from triage_agent.tools import get_customer_context, search_knowledge_base
+
+# Start of the section appended to the ticket message
+PREFETCH_HEADER = "**Prefetched Context**"
+
+
+def prefetch_enabled() -> bool:
+    """Whether context is prefetched (per PREFETCH_CONTEXT)."""
+    return os.getenv("PREFETCH_CONTEXT", "true").lower() == "true"
+
+
+async def prefetch_context(
+    customer_id: str, subject: str, timeout_seconds: float = None
+) -> list[tuple[str, dict, dict]]:
+    """Run the context tools concurrently.
+
+    Args:
+        customer_id: Customer identifier.
+        subject: Ticket subject, used as the knowledge base query.
+        timeout_seconds: Max wait for all tools.
+                         Defaults to PREFETCH_TIMEOUT_SECONDS from env or 5.
+
+    Returns:
+        list: (tool name, arguments, response) for every tool that finished
+              in time, in a fixed order. A tool that raised is reported
+              with an ``{"status": "error", ...}`` response.
+    """
+    if timeout_seconds is None:
+        timeout_seconds = float(os.getenv("PREFETCH_TIMEOUT_SECONDS", "5"))
+
+    calls = [
+        ("get_customer_context", get_customer_context, {"customer_id": customer_id}),
+        ("search_knowledge_base", search_knowledge_base, {"query": subject}),
+    ]
+    # The tools block (file lookups, an embedding request); run them in threads
+    tasks = [
+        asyncio.ensure_future(asyncio.to_thread(fn, **args)) for _, fn, args in calls
+    ]
+    done, pending = await asyncio.wait(tasks, timeout=timeout_seconds)
+    for task in pending:
+        task.cancel()
+
+    results = []
+    for (name, _, args), task in zip(calls, tasks):
+        if task not in done:
+            continue
+        if task.exception() is not None:
+            response = {"status": "error", "message": str(task.exception())}
+        else:
+            response = task.result()
+        results.append((name, args, response))
+    return results
+
+
+def format_prefetched_context(results: list[tuple[str, dict, dict]]) -> str:
+    """Render prefetched tool results as a section of the user message."""
+    if not results:
+        return ""
+    lines = [
+        f"{PREFETCH_HEADER} (tool results already retrieved for this "
+        "ticket; do not call these tools again with the same arguments):"
+    ]
+    for name, args, response in results:
+        call = ", ".join(f"{key}={json.dumps(value)}" for key, value in args.items())
+        lines.append(
+            f"- `{name}({call})`:\n"
+            f"```json\n{json.dumps(response, ensure_ascii=False)}\n```"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,39 @@
+import importlib
+
+from .cache import TTLCache, content_key
+from .decisions import DecisionHooks, EarlyDecision
+from .jobs import Job, JobQueue, QueueFullError
+from .priority import TicketPriority, parse_class_shares, ticket_priority
+from .semantic_cache import SemanticCache, SemanticHit
+from .singleflight import SingleFlight
+
+# These subclass ADK types; import them (and ADK) only when first used
+_LAZY = {
+    "BoundedSessionService": ".sessions",
+    "MetricsPlugin": ".plugin",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "BoundedSessionService",
+    "DecisionHooks",
+    "EarlyDecision",
+    "Job",
+    "JobQueue",
+    "MetricsPlugin",
+    "QueueFullError",
+    "SemanticCache",
+    "SemanticHit",
+    "SingleFlight",
+    "TTLCache",
+    "TicketPriority",
+    "content_key",
+    "parse_class_shares",
+    "ticket_priority",
+]
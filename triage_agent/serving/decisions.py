@@ -0,0 +1,59 @@
+"""Hooks notified of a ticket's routing decision before its run finishes."""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class EarlyDecision(NamedTuple):
+    """One routing-critical field of a ticket's answer, as soon as it's known."""
+
+    ticket_id: str
+    customer_id: str
+    field: str  # "urgency" or "recommended_action"
+    value: Any
+    elapsed_seconds: float  # since the run started (0 for a reused result)
+
+
+DecisionHook = Callable[[EarlyDecision], "Awaitable[None] | None"]
+
+
+class DecisionHooks:
+    """Registry of routing / paging hooks.
+
+    Plain functions are called inline and must be quick; coroutine
+    functions run as background tasks so a slow pager never delays the
+    triage run. Exceptions are logged and never fail the run.
+    """
+
+    def __init__(self) -> None:
+        self._hooks: list[DecisionHook] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    def register(self, hook: DecisionHook) -> DecisionHook:
+        """Add ``hook`` (usable as a decorator)."""
+        self._hooks.append(hook)
+        return hook
+
+    def unregister(self, hook: DecisionHook) -> None:
+        self._hooks.remove(hook)
+
+    def notify(self, decision: EarlyDecision) -> None:
+        for hook in list(self._hooks):
+            try:
+                result = hook(decision)
+            except Exception:
+                logger.exception("Decision hook %r failed", hook)
+                continue
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Decision hook failed", exc_info=task.exception())
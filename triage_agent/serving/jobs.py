@@ -0,0 +1,300 @@
+"""In-process job queue for asynchronous triage.
+
+Submissions are held in bounded, per-class priority heaps drained by a
+fixed pool of worker tasks. When the queue is full, ``submit`` raises
+``QueueFullError`` with a suggested retry delay instead of accepting
+unbounded work.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+DEFAULT_CLASS = "default"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+    def __init__(self, retry_after_seconds: int):
+        super().__init__(f"Job queue is full; retry after {retry_after_seconds}s")
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass
+class Job:
+    """A unit of work tracked by the queue."""
+
+    job_id: str
+    payload: Any
+    priority_class: str = DEFAULT_CLASS
+    sort_key: float = 0.0
+    status: str = "queued"  # queued | running | succeeded | failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    # Set once the job has succeeded or failed
+    finished: asyncio.Event = field(
+        default_factory=asyncio.Event, repr=False, compare=False
+    )
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+
+class JobQueue:
+    """Bounded priority queue + worker pool running ``handler(payload)``.
+
+    By default every job is in a single FIFO class. Pass ``classify`` to
+    map each payload to ``(class_name, sort_key)`` and ``class_shares`` to
+    order the classes (highest priority first) and cap the fraction of
+    workers each may occupy. A free worker takes the lowest ``sort_key``
+    job from the highest-priority class that is under its cap; ties are
+    FIFO.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = None,
+        max_queue: int = None,
+        result_ttl_seconds: float = None,
+        classify: Callable[[Any], tuple[str, float]] = None,
+        class_shares: dict[str, float] = None,
+    ) -> None:
+        """Initialize the queue (workers start lazily on first submit).
+
+        Args:
+            handler: Coroutine function executed for each job's payload.
+            workers: Number of concurrent workers.
+                     Defaults to JOB_WORKERS from env or 4.
+            max_queue: Max jobs waiting to start.
+                       Defaults to JOB_QUEUE_SIZE from env or 100.
+            result_ttl_seconds: How long finished jobs stay retrievable.
+                                Defaults to JOB_RESULT_TTL_SECONDS from env or 3600.
+            classify: Optional payload -> (priority class, sort key) function.
+            class_shares: Priority classes, highest first, mapped to the max
+                          fraction of workers each may use. Classes not
+                          listed are scheduled last with no cap.
+        """
+        if workers is None:
+            workers = int(os.getenv("JOB_WORKERS", "4"))
+        if max_queue is None:
+            max_queue = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+        if result_ttl_seconds is None:
+            result_ttl_seconds = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+        if class_shares is None:
+            class_shares = {DEFAULT_CLASS: 1.0}
+
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self.result_ttl_seconds = result_ttl_seconds
+        self.classify = classify
+        self.class_shares = dict(class_shares)
+
+        self._class_caps = {
+            name: max(1, math.floor(share * workers))
+            for name, share in self.class_shares.items()
+        }
+        # class -> heap of (sort_key, seq, job)
+        self._pending: dict[str, list] = {}
+        self._pending_count = 0
+        self._running_by_class: dict[str, int] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._jobs: dict[str, Job] = {}
+        self._running = 0
+        # Exponentially weighted average job duration, for Retry-After hints
+        self._avg_duration = 5.0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def _ensure_started(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+            self._worker_tasks = [
+                asyncio.create_task(self._worker()) for _ in range(self.workers)
+            ]
+
+    async def stop(self) -> None:
+        """Cancel all workers.
+
+        Running jobs and queued jobs that have not started are marked
+        failed, so nothing waiting on them blocks.
+        """
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._wakeup = None
+        for heap in self._pending.values():
+            for _, _, job in heap:
+                self._fail(job, "Job queue stopped before the job started")
+        self._pending.clear()
+        self._pending_count = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit(self, payload: Any) -> Job:
+        """Enqueue a job and return it immediately.
+
+        Raises:
+            QueueFullError: If ``max_queue`` jobs are already waiting.
+        """
+        self._ensure_started()
+        self._prune_finished()
+
+        if self._pending_count >= self.max_queue:
+            raise QueueFullError(self.retry_after_seconds())
+
+        priority_class, sort_key = (
+            self.classify(payload) if self.classify else (DEFAULT_CLASS, 0.0)
+        )
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            payload=payload,
+            priority_class=priority_class,
+            sort_key=sort_key,
+        )
+        heapq.heappush(
+            self._pending.setdefault(priority_class, []),
+            (sort_key, next(self._seq), job),
+        )
+        self._pending_count += 1
+        self._jobs[job.job_id] = job
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by ID (None if unknown or expired)."""
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: Optional[float] = None) -> Job:
+        """Wait until ``job`` is done, or at most ``timeout`` seconds."""
+        if not job.done:
+            try:
+                await asyncio.wait_for(job.finished.wait(), timeout)
+            except TimeoutError:
+                pass
+        return job
+
+    def retry_after_seconds(self) -> int:
+        """Estimate how long until a queue slot frees up."""
+        waves = (self.depth + 1) / max(self.workers, 1)
+        return max(1, math.ceil(waves * self._avg_duration))
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting to start."""
+        return self._pending_count
+
+    @property
+    def running(self) -> int:
+        """Jobs currently executing."""
+        return self._running
+
+    def stats(self) -> dict:
+        """Report queue depth, running jobs, and configured limits."""
+        return {
+            "queued": self.depth,
+            "running": self.running,
+            "retained_jobs": len(self._jobs),
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "avg_job_seconds": round(self._avg_duration, 3),
+            "classes": {
+                name: {
+                    "queued": len(self._pending.get(name, [])),
+                    "running": self._running_by_class.get(name, 0),
+                    "max_running": self._class_caps.get(name, self.workers),
+                }
+                for name in self._class_order()
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _class_order(self) -> list[str]:
+        extra = sorted(set(self._pending) - set(self.class_shares))
+        return list(self.class_shares) + extra
+
+    def _take_next(self) -> Optional[Job]:
+        """Pop the next runnable job, honoring class order and caps."""
+        for name in self._class_order():
+            heap = self._pending.get(name)
+            if not heap:
+                continue
+            if self._running_by_class.get(name, 0) >= self._class_caps.get(
+                name, self.workers
+            ):
+                continue
+            _, _, job = heapq.heappop(heap)
+            self._pending_count -= 1
+            return job
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            job = self._take_next()
+            if job is None:
+                # Nothing runnable right now; wait for a submit or a finish
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            job.status = "running"
+            job.started_at = time.time()
+            self._running += 1
+            self._running_by_class[job.priority_class] = (
+                self._running_by_class.get(job.priority_class, 0) + 1
+            )
+            try:
+                job.result = await self.handler(job.payload)
+                job.status = "succeeded"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+            except asyncio.CancelledError:
+                job.error = "Job queue stopped while the job was running"
+                job.status = "failed"
+                raise
+            finally:
+                self._running -= 1
+                self._running_by_class[job.priority_class] -= 1
+                job.finished_at = time.time()
+                job.finished.set()
+                duration = job.finished_at - job.started_at
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+                # A class may now be under its cap again
+                self._wakeup.set()
+
+    @staticmethod
+    def _fail(job: Job, error: str) -> None:
+        job.error = error
+        job.status = "failed"
+        job.finished_at = time.time()
+        job.finished.set()
+
+    def _prune_finished(self) -> None:
+        cutoff = time.time() - self.result_ttl_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.done and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
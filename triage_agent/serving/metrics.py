@@ -0,0 +1,169 @@
+"""Prometheus metrics for the triage server.
+
+Agent-side measurements (LLM round trips, token usage, tool calls) are
+collected by ``MetricsPlugin`` (``plugin.py``), an ADK plugin registered on
+the ``Runner``, so the agent definition itself stays free of
+instrumentation. HTTP latency and queue gauges are wired up in ``app.py``.
+This module only defines the metrics and does not import ADK.
+
+With the pre-fork server each worker keeps its own counters; scrape every
+worker (or run a single worker) for complete numbers.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+HTTP_REQUEST_SECONDS = Histogram(
+    "triage_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "path", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# ---------------------------------------------------------------------------
+# Agent runs
+# ---------------------------------------------------------------------------
+AGENT_RUNS_IN_PROGRESS = Gauge(
+    "triage_agent_runs_in_progress",
+    "Agent runs currently executing",
+)
+AGENT_RUN_SECONDS = Histogram(
+    "triage_agent_run_duration_seconds",
+    "Wall-clock time of one full agent run (one ticket)",
+    buckets=LATENCY_BUCKETS,
+)
+FAST_PATH_TICKETS = Counter(
+    "triage_fast_path_total",
+    "Tickets checked by the rule-based fast path",
+    ["outcome"],  # hit (answered without the LLM) | miss (sent to the agent)
+)
+DEADLINE_EXCEEDED = Counter(
+    "triage_deadline_exceeded_total",
+    "Triage runs cut short by their deadline (served a fallback result)",
+)
+AGENT_ANSWERS = Counter(
+    "triage_agent_answers_total",
+    "Final agent answers by schema validation outcome",
+    # valid | repaired (fixed locally, no re-run) | invalid
+    ["outcome"],
+)
+EARLY_DECISION_LEAD_SECONDS = Histogram(
+    "triage_early_decision_lead_seconds",
+    "How long before the complete answer a routing field (urgency, "
+    "recommended_action) was known from the streamed answer",
+    ["field"],
+    buckets=LATENCY_BUCKETS,
+)
+DRAFTS = Counter(
+    "triage_deferred_drafts_total",
+    "Deferred draft responses (DEFERRED_DRAFTS)",
+    # ready | failed | rejected (draft queue full; no draft)
+    ["outcome"],
+)
+DRAFT_SECONDS = Histogram(
+    "triage_deferred_draft_duration_seconds",
+    "Time to write a deferred draft response",
+    buckets=LATENCY_BUCKETS,
+)
+CASCADE_RUNS = Counter(
+    "triage_cascade_runs_total",
+    "Cheap-model-first cascade runs, by outcome",
+    # accepted (cheap answer used) | escalated to the full model because of:
+    # invalid | error | low_confidence | critical | escalate_to_human
+    ["outcome"],
+)
+SEMANTIC_CACHE_LOOKUPS = Counter(
+    "triage_semantic_cache_lookups_total",
+    "Semantic cache lookups for tickets not in the exact result cache",
+    # hit (reused a similar ticket's result) | miss | error (embedding failed)
+    ["outcome"],
+)
+SEMANTIC_CACHE_SIMILARITY = Histogram(
+    "triage_semantic_cache_hit_similarity",
+    "Similarity of the cached ticket reused on a semantic cache hit",
+    buckets=(0.8, 0.85, 0.9, 0.92, 0.94, 0.96, 0.98, 0.99, 1.0),
+)
+
+# ---------------------------------------------------------------------------
+# Prompt assembly
+# ---------------------------------------------------------------------------
+THREAD_TOKENS_SAVED = Counter(
+    "triage_thread_tokens_saved_total",
+    "Estimated message-thread tokens removed by THREAD_TOKEN_BUDGET windowing",
+)
+THREAD_SUMMARIZED_TICKETS = Counter(
+    "triage_thread_summarized_tickets_total",
+    "Tickets whose older messages were replaced by a summary",
+)
+
+# ---------------------------------------------------------------------------
+# LLM
+# ---------------------------------------------------------------------------
+LLM_CALLS = Counter(
+    "triage_llm_calls_total",
+    "LLM round trips",
+)
+LLM_CALL_SECONDS = Histogram(
+    "triage_llm_call_duration_seconds",
+    "Latency of one LLM round trip",
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "triage_llm_tokens_total",
+    "LLM tokens used",
+    # prompt (all input tokens) = cached_prompt (served from the provider's
+    # prompt cache) + uncached_prompt; completion
+    ["kind"],
+)
+LLM_CALLS_PER_TICKET = Histogram(
+    "triage_llm_calls_per_ticket",
+    "LLM round trips needed to triage one ticket",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 20),
+)
+LLM_TOKENS_PER_TICKET = Histogram(
+    "triage_llm_tokens_per_ticket",
+    "LLM tokens used to triage one ticket",
+    ["kind"],
+    buckets=(500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000),
+)
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+TOOL_CALLS = Counter(
+    "triage_tool_calls_total",
+    "Tool invocations",
+    # outcome: ok | error | memoized (repeat call answered from the run's memo)
+    ["tool", "outcome"],
+)
+TOOL_CALL_SECONDS = Histogram(
+    "triage_tool_call_duration_seconds",
+    "Tool execution latency",
+    ["tool"],
+    buckets=LATENCY_BUCKETS,
+)
+VECTOR_SEARCH_SECONDS = Histogram(
+    "triage_vector_search_duration_seconds",
+    "VectorStore.search latency (embedding + ChromaDB query)",
+    buckets=LATENCY_BUCKETS,
+)
+
+# ---------------------------------------------------------------------------
+# Queues
+# ---------------------------------------------------------------------------
+JOBS_QUEUED = Gauge("triage_jobs_queued", "Jobs waiting in the /triage/jobs queue")
+JOBS_RUNNING = Gauge("triage_jobs_running", "Jobs currently executing")
+DRAFTS_QUEUED = Gauge("triage_drafts_queued", "Deferred drafts waiting to be written")
+COALESCED_IN_FLIGHT = Gauge(
+    "triage_single_flight_in_flight",
+    "Distinct ticket contents currently being triaged",
+)
+SEMANTIC_CACHE_ENTRIES = Gauge(
+    "triage_semantic_cache_entries", "Tickets held by the semantic cache"
+)
+SESSIONS = Gauge("triage_sessions", "Sessions held by the session store")
+SESSION_BYTES = Gauge("triage_session_bytes", "Approximate session store size")
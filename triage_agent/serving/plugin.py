@@ -0,0 +1,176 @@
+"""ADK plugin feeding the Prometheus metrics in ``metrics.py``."""
+
+import time
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+from triage_agent.tool_memo import TOOL_MEMO
+
+from . import metrics
+
+
+class MetricsPlugin(BasePlugin):
+    """ADK plugin recording LLM, token and tool metrics for every run.
+
+    ADK calls neither ``after_run_callback`` nor ``on_run_error_callback``
+    for a run that is cancelled (e.g. by a triage deadline); whoever runs
+    the agent calls ``end_session_runs`` once the run is over, so the
+    in-progress gauge and the per-run state don't leak.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="triage_metrics")
+        # invocation_id -> start time of the pending model call
+        self._model_started: dict[str, float] = {}
+        # function_call_id -> (invocation_id, start time) of the pending tool call
+        self._tool_started: dict[str, tuple[str, float]] = {}
+        # invocation_id -> [llm_calls, prompt_tokens, cached_prompt_tokens,
+        #                   completion_tokens]
+        self._per_ticket: dict[str, list[int]] = {}
+        # invocation_id -> run start time
+        self._run_started: dict[str, float] = {}
+        # invocation_id -> session ID, for end_session_runs
+        self._run_sessions: dict[str, str] = {}
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        invocation_id = invocation_context.invocation_id
+        self._run_started[invocation_id] = time.perf_counter()
+        self._run_sessions[invocation_id] = invocation_context.session.id
+        self._per_ticket[invocation_id] = [0, 0, 0, 0]
+        metrics.AGENT_RUNS_IN_PROGRESS.inc()
+        return None
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        self.end_run(invocation_context.invocation_id)
+
+    async def on_run_error_callback(
+        self, *, invocation_context: InvocationContext, error: Exception
+    ) -> None:
+        self.end_run(invocation_context.invocation_id)
+
+    def end_run(self, invocation_id: str) -> None:
+        """Record a run's per-ticket metrics and drop its state (idempotent)."""
+        started = self._run_started.pop(invocation_id, None)
+        self._run_sessions.pop(invocation_id, None)
+        self._model_started.pop(invocation_id, None)
+        for call_id, (call_invocation, _) in list(self._tool_started.items()):
+            if call_invocation == invocation_id:
+                del self._tool_started[call_id]
+        totals = self._per_ticket.pop(invocation_id, None)
+        if started is None:
+            return
+        metrics.AGENT_RUN_SECONDS.observe(time.perf_counter() - started)
+        metrics.AGENT_RUNS_IN_PROGRESS.dec()
+
+        calls, prompt_tokens, cached_tokens, completion_tokens = totals
+        metrics.LLM_CALLS_PER_TICKET.observe(calls)
+        for kind, count in (
+            ("prompt", prompt_tokens),
+            ("cached_prompt", cached_tokens),
+            ("uncached_prompt", prompt_tokens - cached_tokens),
+            ("completion", completion_tokens),
+        ):
+            metrics.LLM_TOKENS_PER_TICKET.labels(kind=kind).observe(count)
+
+    def end_session_runs(self, session_id: str) -> None:
+        """End every run still open on ``session_id`` (e.g. a cancelled one)."""
+        for invocation_id, session in list(self._run_sessions.items()):
+            if session == session_id:
+                self.end_run(invocation_id)
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        self._model_started[callback_context.invocation_id] = time.perf_counter()
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None  # streamed chunk; the aggregated response follows
+
+        invocation_id = callback_context.invocation_id
+        started = self._model_started.pop(invocation_id, None)
+        if started is not None:
+            metrics.LLM_CALL_SECONDS.observe(time.perf_counter() - started)
+        metrics.LLM_CALLS.inc()
+
+        usage = llm_response.usage_metadata
+        prompt_tokens = (usage.prompt_token_count or 0) if usage else 0
+        # Part of prompt_tokens; reported by providers with prompt caching
+        cached_tokens = (usage.cached_content_token_count or 0) if usage else 0
+        completion_tokens = (usage.candidates_token_count or 0) if usage else 0
+        metrics.LLM_TOKENS.labels(kind="prompt").inc(prompt_tokens)
+        metrics.LLM_TOKENS.labels(kind="cached_prompt").inc(cached_tokens)
+        metrics.LLM_TOKENS.labels(kind="uncached_prompt").inc(
+            prompt_tokens - cached_tokens
+        )
+        metrics.LLM_TOKENS.labels(kind="completion").inc(completion_tokens)
+
+        totals = self._per_ticket.get(invocation_id)
+        if totals is not None:
+            totals[0] += 1
+            totals[1] += prompt_tokens
+            totals[2] += cached_tokens
+            totals[3] += completion_tokens
+        return None
+
+    async def before_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+    ) -> Optional[dict]:
+        self._tool_started[tool_context.function_call_id] = (
+            tool_context.invocation_id,
+            time.perf_counter(),
+        )
+        return None
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        result: dict,
+    ) -> Optional[dict]:
+        if TOOL_MEMO.was_memoized(
+            tool_context.invocation_id, tool_context.function_call_id
+        ):
+            self._tool_started.pop(tool_context.function_call_id, None)
+            metrics.TOOL_CALLS.labels(tool=tool.name, outcome="memoized").inc()
+        else:
+            self._finish_tool(tool.name, tool_context.function_call_id, "ok")
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> Optional[dict]:
+        self._finish_tool(tool.name, tool_context.function_call_id, "error")
+        return None
+
+    def _finish_tool(self, name: str, call_id: str, outcome: str) -> None:
+        pending = self._tool_started.pop(call_id, None)
+        if pending is not None:
+            metrics.TOOL_CALL_SECONDS.labels(tool=name).observe(
+                time.perf_counter() - pending[1]
+            )
+        metrics.TOOL_CALLS.labels(tool=name, outcome=outcome).inc()
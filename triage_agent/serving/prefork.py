@@ -0,0 +1,111 @@
+"""Pre-fork multi-worker server.
+
+``uvicorn --workers N`` spawns fresh interpreters, so every worker re-imports
+the app and parses its own copy of every data table. This module instead
+loads everything once in a parent process, freezes it out of the garbage
+collector, binds the listening socket, and then ``fork()``s N workers that
+all accept on that socket. Workers inherit the parent's memory
+copy-on-write, so the tables are shared until a worker writes to them.
+
+POSIX only (requires ``os.fork``).
+"""
+
+import gc
+import os
+import signal
+import socket
+
+import uvicorn
+
+from triage_agent.tools.tables import preload_tables
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, log_level: str) -> None:
+    # Let uvicorn install its own graceful-shutdown handlers
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve_prefork(
+    app,
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 2,
+    log_level: str = "info",
+) -> None:
+    """Serve ``app`` from ``workers`` forked processes sharing loaded data.
+
+    ``app`` must be the imported application object (not an import
+    string) so that it, the agent, and all data tables are loaded in the
+    parent before forking. Dead workers are replaced; SIGINT/SIGTERM to
+    the parent stops every worker.
+
+    Args:
+        app: ASGI application object.
+        host: Interface to bind.
+        port: Port to bind.
+        workers: Number of worker processes to fork.
+        log_level: uvicorn log level for the workers.
+    """
+    tables = preload_tables()
+    # Move everything loaded so far into the permanent generation so the
+    # collector never walks (and thereby dirties) these pages in workers.
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind_socket(host, port)
+    print(
+        f"[prefork] pid {os.getpid()} loaded {len(tables)} tables; "
+        f"forking {workers} workers on {host}:{port}"
+    )
+
+    children: set[int] = set()
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(app, sock, log_level)
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def shutdown(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"[prefork] worker {pid} exited ({status}); restarting")
+            spawn()
+
+    sock.close()
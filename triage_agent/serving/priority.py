@@ -0,0 +1,79 @@
+"""SLA-aware priority classes for queued triage work.
+
+Tickets are classified from the customer's SLA status and plan, using the
+same data the ``check_sla_status`` and ``lookup_customer_history`` tools
+return (local table lookups, no LLM call):
+
+- ``urgent``: the ticket's SLA is at risk of breach
+- ``enterprise`` / ``pro``: by plan tier
+- ``free``: everything else, including unknown customers
+
+Within a class, tickets with less SLA time remaining go first.
+"""
+
+import math
+from typing import NamedTuple
+
+from triage_agent.tools import check_sla_status, lookup_customer_history
+
+# Highest priority first
+PRIORITY_CLASSES = ("urgent", "enterprise", "pro", "free")
+
+# Max fraction of workers each class may occupy at once. Capping the lower
+# classes keeps capacity free for higher-priority work arriving later,
+# since a running agent call cannot be preempted.
+DEFAULT_CLASS_SHARES = {
+    "urgent": 1.0,
+    "enterprise": 1.0,
+    "pro": 0.75,
+    "free": 0.5,
+}
+
+
+class TicketPriority(NamedTuple):
+    """Scheduling class and in-class ordering key for a ticket."""
+
+    priority_class: str
+    time_remaining_hours: float
+
+
+def ticket_priority(customer_id: str) -> TicketPriority:
+    """Classify a ticket by its customer's SLA status and plan."""
+    sla = check_sla_status(customer_id)
+    customer = lookup_customer_history(customer_id)
+
+    if sla["status"] == "found":
+        time_remaining = float(sla["time_remaining_hours"])
+        if sla["is_at_risk"]:
+            return TicketPriority("urgent", time_remaining)
+    else:
+        time_remaining = math.inf
+
+    plan = customer["customer"]["plan"] if customer["status"] == "found" else "free"
+    if plan not in PRIORITY_CLASSES:
+        plan = "free"
+    return TicketPriority(plan, time_remaining)
+
+
+def priority_rank(priority: TicketPriority) -> tuple[int, float]:
+    """Sort key: class order first, then least SLA time remaining."""
+    return (
+        PRIORITY_CLASSES.index(priority.priority_class),
+        priority.time_remaining_hours,
+    )
+
+
+def parse_class_shares(spec: str) -> dict[str, float]:
+    """Parse ``"urgent=1.0,free=0.25"`` over ``DEFAULT_CLASS_SHARES``.
+
+    Classes not mentioned keep their default share. Order always follows
+    ``PRIORITY_CLASSES``.
+    """
+    overrides = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        overrides[name.strip()] = float(value)
+    return {
+        name: overrides.get(name, DEFAULT_CLASS_SHARES[name])
+        for name in PRIORITY_CLASSES
+    }
@@ -0,0 +1,147 @@
+"""Similarity-keyed cache: reuse results of near-duplicate tickets."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+def normalize(vector: Sequence[float]) -> np.ndarray:
+    """``vector`` as float32 scaled to unit length (dot product = cosine)."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+class SemanticHit(NamedTuple):
+    """A cached value close enough to the lookup."""
+
+    value: Any
+    similarity: float
+
+
+class _Entry(NamedTuple):
+    scope: Hashable
+    expires_at: float
+    value: Any
+
+
+class SemanticCache:
+    """Size-bounded LRU cache looked up by embedding similarity.
+
+    An entry matches a lookup with the same ``scope`` (e.g. a customer
+    profile) whose vector's cosine similarity is at least
+    ``min_similarity``; the most similar one wins. Each entry expires
+    ``ttl_seconds`` after it was stored (or its own TTL, if given), however
+    often it is hit.
+
+    Vectors live in one preallocated matrix, so a lookup scores every
+    entry with a single matrix-vector product.
+
+    Tracks hit/miss/eviction counters for monitoring.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        min_similarity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_similarity = min_similarity
+        self._clock = clock
+        # Row i holds the vector of slot i; allocated on the first set()
+        self._vectors: Optional[np.ndarray] = None
+        # slot -> entry; LRU order, oldest first
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._free = list(range(max_entries - 1, -1, -1))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, vector: Sequence[float], scope: Hashable) -> Optional[SemanticHit]:
+        """Return the most similar live entry in ``scope``, or None."""
+        self._expire()
+        slots = [slot for slot, entry in self._entries.items() if entry.scope == scope]
+        if not slots:
+            self.misses += 1
+            return None
+
+        similarities = (self._vectors @ normalize(vector))[slots]
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.min_similarity:
+            self.misses += 1
+            return None
+        slot = slots[best]
+        self._entries.move_to_end(slot)
+        self.hits += 1
+        return SemanticHit(self._entries[slot].value, similarity)
+
+    def set(
+        self,
+        vector: Sequence[float],
+        scope: Hashable,
+        value: Any,
+        ttl_seconds: float = None,
+    ) -> None:
+        """Add an entry, evicting the LRU entry when full.
+
+        With ``max_entries`` 0 nothing is stored, as in ``TTLCache``.
+        """
+        if self.max_entries <= 0:
+            return
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        vector = normalize(vector)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+        elif len(vector) != self._vectors.shape[1]:
+            raise ValueError(
+                f"Expected a {self._vectors.shape[1]}-dimensional vector, "
+                f"got {len(vector)}"
+            )
+
+        self._expire()
+        if not self._free:
+            slot, _ = self._entries.popitem(last=False)
+            self._free.append(slot)
+            self.evictions += 1
+        slot = self._free.pop()
+        self._vectors[slot] = vector
+        self._entries[slot] = _Entry(scope, self._clock() + ttl_seconds, value)
+
+    def _expire(self) -> None:
+        now = self._clock()
+        for slot, entry in list(self._entries.items()):
+            if entry.expires_at <= now:
+                del self._entries[slot]
+                self._free.append(slot)
+                self.expirations += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._free.extend(self._entries)
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Report size, hit rate and eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "min_similarity": self.min_similarity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,191 @@
+"""Bounded in-memory session store for long-running servers.
+
+ADK's ``InMemorySessionService`` keeps every session (and its full event
+history, including tool outputs) forever. This subclass caps the number of
+sessions and their approximate serialized size, expires idle sessions after
+a TTL, and reports its own usage.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+SessionKey = tuple[str, str, str]  # (app_name, user_id, session_id)
+
+
+class BoundedSessionService(InMemorySessionService):
+    """In-memory session service with TTL expiry and count/size caps.
+
+    Sessions are tracked in least-recently-used order. Every create, read
+    and appended event refreshes a session. When a cap is exceeded, the
+    least recently used sessions are evicted first.
+
+    Callers that only need a session for a single run should still call
+    ``delete_session`` when the run completes; the caps are a safety net,
+    and evicting a session that is mid-run makes that run fail.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = None,
+        max_bytes: int = None,
+        ttl_seconds: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            max_sessions: Max sessions held at once.
+                          Defaults to SESSION_MAX_COUNT from env or 1000.
+            max_bytes: Max approximate serialized size of all events.
+                       Defaults to SESSION_MAX_BYTES from env or 64 MiB.
+            ttl_seconds: Idle time after which a session is expired.
+                         Defaults to SESSION_TTL_SECONDS from env or 900.
+            clock: Monotonic time source (injectable for tests).
+        """
+        super().__init__()
+        if max_sessions is None:
+            max_sessions = int(os.getenv("SESSION_MAX_COUNT", "1000"))
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("SESSION_TTL_SECONDS", "900"))
+
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+
+        # LRU order: oldest first. Value is the last-touched time.
+        self._last_used: OrderedDict[SessionKey, float] = OrderedDict()
+        self._sizes: dict[SessionKey, int] = {}
+        self._total_bytes = 0
+        self._evicted_ttl = 0
+        self._evicted_capacity = 0
+
+    # ------------------------------------------------------------------
+    # BaseSessionService overrides
+    # ------------------------------------------------------------------
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        self.evict_expired()
+        session = await super().create_session(
+            app_name=app_name,
+            user_id=user_id,
+            state=state,
+            session_id=session_id,
+        )
+        key = (app_name, user_id, session.id)
+        self._sizes[key] = 0
+        self._touch(key)
+        self._enforce_caps(keep=key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        self.evict_expired()
+        session = await super().get_session(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            config=config,
+        )
+        if session is not None:
+            self._touch((app_name, user_id, session_id))
+        return session
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self._remove((app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        key = (session.app_name, session.user_id, session.id)
+        if not event.partial and key in self._sizes:
+            size = len(event.model_dump_json(exclude_none=True))
+            self._sizes[key] += size
+            self._total_bytes += size
+            self._touch(key)
+            self._enforce_caps(keep=key)
+        return event
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+    def evict_expired(self) -> int:
+        """Drop sessions idle for longer than the TTL. Returns how many."""
+        cutoff = self._clock() - self.ttl_seconds
+        expired = []
+        for key, last_used in self._last_used.items():
+            if last_used > cutoff:
+                break  # LRU order: everything after this is newer
+            expired.append(key)
+
+        for key in expired:
+            self._remove(key)
+        self._evicted_ttl += len(expired)
+        return len(expired)
+
+    def _enforce_caps(self, keep: SessionKey) -> None:
+        """Evict least recently used sessions until both caps are met."""
+        while (
+            len(self._last_used) > self.max_sessions
+            or self._total_bytes > self.max_bytes
+        ):
+            victim = next(iter(self._last_used))
+            if victim == keep:
+                break  # never evict the session being written
+            self._remove(victim)
+            self._evicted_capacity += 1
+
+    def _touch(self, key: SessionKey) -> None:
+        self._last_used[key] = self._clock()
+        self._last_used.move_to_end(key)
+
+    def _remove(self, key: SessionKey) -> None:
+        app_name, user_id, session_id = key
+        self._last_used.pop(key, None)
+        self._total_bytes -= self._sizes.pop(key, 0)
+
+        user_sessions = self.sessions.get(app_name, {}).get(user_id)
+        if user_sessions is None:
+            return
+        user_sessions.pop(session_id, None)
+        # Drop emptied containers so one-off users don't accumulate
+        if not user_sessions:
+            del self.sessions[app_name][user_id]
+            if not self.sessions[app_name]:
+                del self.sessions[app_name]
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        """Report current usage and lifetime eviction counts."""
+        return {
+            "sessions": len(self._last_used),
+            "approx_bytes": self._total_bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted_ttl": self._evicted_ttl,
+            "evicted_capacity": self._evicted_capacity,
+        }
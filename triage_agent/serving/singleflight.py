@@ -0,0 +1,61 @@
+"""Single-flight coalescing of concurrent identical work."""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """Run at most one coroutine per key at a time; share its outcome.
+
+    The first caller for a key (the leader) starts the work as a task.
+    Callers arriving with the same key while it is in flight await that
+    same task instead of starting their own, and receive its result or
+    exception. The task is shielded, so a cancelled caller (e.g. a client
+    disconnect) does not abort the run for the others.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """Run ``fn()`` for ``key``, or join the run already in flight.
+
+        Returns:
+            tuple: (result, whether this call joined an existing run)
+        """
+        task = self._in_flight.get(key)
+        shared = task is not None
+
+        if shared:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._in_flight
+
+    @property
+    def in_flight(self) -> int:
+        """Distinct keys currently executing."""
+        return len(self._in_flight)
+
+    def stats(self) -> dict:
+        """Report in-flight keys and leader/coalesced call counts."""
+        return {
+            "in_flight": self.in_flight,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
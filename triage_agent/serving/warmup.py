@@ -0,0 +1,90 @@
+"""Startup warm-up and readiness tracking.
+
+The server process imports only what it needs to accept connections; the
+expensive one-time work (importing ADK and LiteLLM, loading data tables,
+opening the vector store, the first embedding call) is run by ``Warmup``
+from the app's lifespan hook instead of inside the first requests. Until
+it finishes, ``/ready`` reports not-ready so load balancers hold traffic
+while ``/health`` (liveness) already answers.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Optional
+
+
+class Warmup:
+    """Runs named warm-up steps once, in order, off the event loop.
+
+    A failing step is recorded and the remaining steps still run: the
+    affected feature degrades (e.g. knowledge base search falls back to
+    keyword search) rather than keeping the instance out of rotation.
+    """
+
+    def __init__(self, steps: list[tuple[str, Callable[[], Any]]]) -> None:
+        self.steps = steps
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # step name -> {"ok", "seconds"[, "error"]}
+        self.results: dict[str, dict] = {}
+
+    async def run(self) -> None:
+        """Run every step in a worker thread; sets ``ready`` when done."""
+        self.started_at = time.perf_counter()
+        for name, step in self.steps:
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(step)
+                self.results[name] = {"ok": True}
+            except Exception as e:
+                print(f"[WARNING] Warm-up step '{name}' failed: {e}")
+                self.results[name] = {"ok": False, "error": str(e)}
+            self.results[name]["seconds"] = round(time.perf_counter() - started, 3)
+        self.finished_at = time.perf_counter()
+        self.ready = True
+
+    def mark_ready(self) -> None:
+        """Declare readiness without warming up (warm-up disabled)."""
+        self.ready = True
+
+    def status(self) -> dict:
+        """Report readiness and per-step outcomes."""
+        elapsed = None
+        if self.started_at is not None:
+            end = self.finished_at or time.perf_counter()
+            elapsed = round(end - self.started_at, 3)
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "warmup_seconds": elapsed,
+            "steps": self.results,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Warm-up steps
+# ---------------------------------------------------------------------------
+def import_litellm() -> None:
+    """Import LiteLLM now rather than on the first model call.
+
+    ADK's ``LiteLlm`` defers this import (several seconds) to its first
+    request; importing it here, with the same ``LITELLM_MODE`` default ADK
+    applies, moves that cost out of the first ticket.
+    """
+    os.environ.setdefault("LITELLM_MODE", "PRODUCTION")
+    import litellm  # noqa: F401
+
+
+def open_vector_store() -> None:
+    """Open the ChromaDB collection and create the embedding client."""
+    from triage_agent.tools.search.vector_store import get_vector_store
+
+    get_vector_store()
+
+
+def warm_search() -> None:
+    """Run one semantic search so the embedding connection is established."""
+    from triage_agent.tools.search.vector_store import get_vector_store
+
+    get_vector_store().search("how do I reset my password", n_results=1)
@@ -0,0 +1,117 @@
+"""Reuse of a near-duplicate ticket's triage (semantic response cache).
+
+During an outage hundreds of near-identical tickets ("error 500 on the
+dashboard") arrive within minutes, and each would pay for a full multi-turn
+agent run. With ``SEMANTIC_CACHE_ENABLED`` on, each ticket's subject and
+latest message are embedded; if a ticket triaged recently for a customer
+with the same profile (plan, churn risk, SLA at risk) is similar enough,
+its classification is reused and only the draft is re-personalized, by
+swapping in the new customer's name and IDs (no LLM call).
+
+- ``SEMANTIC_CACHE_ENABLED``: enable reuse (default false)
+- ``SEMANTIC_CACHE_MIN_SIMILARITY``: minimum cosine similarity (default 0.95)
+- ``SEMANTIC_CACHE_SIZE`` / ``SEMANTIC_CACHE_TTL_SECONDS``: capacity and
+  per-entry lifetime (default 512 entries, 300 s; keep it short, an
+  outage's status changes quickly)
+"""
+
+import os
+import re
+from typing import NamedTuple
+
+from triage_agent.models import TriageResult
+from triage_agent.tools import (
+    check_sla_status,
+    get_customer_health_score,
+    lookup_customer_history,
+)
+
+
+def semantic_cache_enabled() -> bool:
+    """Whether SEMANTIC_CACHE_ENABLED is on."""
+    return os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+
+
+class CustomerProfile(NamedTuple):
+    """What a reused classification must share with the original ticket."""
+
+    plan: str  # "unknown" for customers not on record
+    risk_level: str
+    sla_at_risk: bool
+
+
+class SimilarTicket(NamedTuple):
+    """A triaged ticket kept for reuse."""
+
+    ticket_id: str
+    customer_id: str
+    result: TriageResult
+
+
+def ticket_text(subject: str, messages: list[str]) -> str:
+    """The part of a ticket that is embedded: subject and latest message."""
+    return f"{subject}\n{messages[-1] if messages else ''}".strip()
+
+
+def embed_text(text: str) -> list[float]:
+    """Embed ``text`` with the knowledge base's embedding model (blocking)."""
+    from triage_agent.tools.search.vector_store import get_vector_store
+
+    [vector] = get_vector_store().embedding_function([text])
+    return [float(x) for x in vector]
+
+
+def customer_profile(customer_id: str) -> CustomerProfile:
+    """Profile of the customer from local table lookups (no LLM call)."""
+    customer = lookup_customer_history(customer_id)
+    health = get_customer_health_score(customer_id)
+    sla = check_sla_status(customer_id)
+    return CustomerProfile(
+        plan=customer["customer"]["plan"] if customer["status"] == "found" else "unknown",
+        risk_level=health["risk_level"] if health["status"] == "found" else "unknown",
+        sla_at_risk=sla["status"] == "found" and bool(sla["is_at_risk"]),
+    )
+
+
+def _customer_name(customer_id: str) -> str | None:
+    customer = lookup_customer_history(customer_id)
+    if customer["status"] != "found":
+        return None
+    return customer["customer"]["name"]
+
+
+def personalize_result(
+    similar: SimilarTicket, ticket_id: str, customer_id: str
+) -> TriageResult:
+    """``similar``'s result, rewritten for another ticket and customer.
+
+    The original customer's name becomes the new customer's first name
+    ("there" for customers not on record), and the original ticket and
+    customer IDs become the new ones, in the draft and the reasoning.
+    """
+    replacements = [
+        (similar.ticket_id, ticket_id),
+        (similar.customer_id, customer_id),
+    ]
+    source_name = _customer_name(similar.customer_id)
+    if source_name and similar.customer_id != customer_id:
+        name = _customer_name(customer_id)
+        first_name = name.split()[0] if name else "there"
+        replacements += [(source_name, first_name), (source_name.split()[0], first_name)]
+
+    def _swap(text: str) -> str:
+        for old, new in replacements:
+            if old != new:
+                text = re.sub(rf"\b{re.escape(old)}\b", new, text)
+        return text
+
+    result = similar.result
+    return result.model_copy(
+        update={
+            "draft_response": _swap(result.draft_response or ""),
+            "reasoning": _swap(result.reasoning),
+            "recommended_action": result.recommended_action.model_copy(
+                update={"reason": _swap(result.recommended_action.reason)}
+            ),
+        }
+    )
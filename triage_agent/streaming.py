@@ -0,0 +1,159 @@
+"""Incremental parsing of the agent's final answer as it streams in.
+
+The answer's fields come in schema order (urgency, extracted_info,
+recommended_action, reasoning, draft_response), so the routing decision is
+complete well before the draft response has finished generating.
+``IncrementalJsonParser`` reports each top-level field of the JSON object
+as soon as its value is complete, without re-parsing the text seen so far.
+"""
+
+import json
+from typing import Any, Optional
+
+# Top-level answer fields acted on before the answer is complete
+EARLY_FIELDS = ("urgency", "recommended_action")
+
+
+class IncrementalJsonParser:
+    """Reports top-level fields of a JSON object fed to it in chunks.
+
+    Text before the first ``{`` (a sentence, a code fence) is skipped, as is
+    everything after the object closes. Fields whose value doesn't parse
+    are dropped; the rest of the object is still reported.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._done = False
+        self._in_string = False
+        self._escaped = False
+        # At depth 1: "key", "colon", "value", "in_value" or "after_value"
+        self._expect = "key"
+        self._key: Optional[str] = None
+        self._start = 0  # start of the current top-level key or value
+
+    @property
+    def done(self) -> bool:
+        """Whether the object's closing brace has been seen."""
+        return self._done
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Add ``chunk``; returns the (key, value) pairs it completed."""
+        self._buffer += chunk
+        completed: list[tuple[str, Any]] = []
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            if self._done:
+                break
+            char = buffer[i]
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key":
+                        self._key = self._load(self._start, i + 1)
+                        self._expect = "colon"
+                    elif self._depth == 1 and self._expect == "in_value":
+                        self._complete(self._start, i + 1, completed)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect in ("key", "value"):
+                    self._start = i
+                    if self._expect == "value":
+                        self._expect = "in_value"
+            elif char in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._start = i
+                    self._expect = "in_value"
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._expect == "in_value":
+                    self._complete(self._start, i + 1, completed)
+                elif self._depth == 0:
+                    if self._expect == "in_value":
+                        # Number or literal ended by the closing brace
+                        self._complete(self._start, i, completed)
+                    self._done = True
+            elif self._depth == 1:
+                if char == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif char == ",":
+                    if self._expect == "in_value":
+                        self._complete(self._start, i, completed)
+                    self._expect = "key"
+                elif not char.isspace() and self._expect == "value":
+                    # Number or literal: complete at the next , or }
+                    self._start = i
+                    self._expect = "in_value"
+        self._pos = len(buffer)
+        return completed
+
+    def _load(self, start: int, end: int) -> Any:
+        try:
+            return json.loads(self._buffer[start:end])
+        except json.JSONDecodeError:
+            return None
+
+    def _complete(self, start: int, end: int, completed: list) -> None:
+        self._expect = "after_value"
+        value = self._load(start, end)
+        if self._key is not None and (
+            value is not None or self._buffer[start:end].strip() == "null"
+        ):
+            completed.append((self._key, value))
+        self._key = None
+
+
+class EarlyFieldTracker:
+    """Watches a run's events and reports each of ``fields`` once, early.
+
+    Streamed (partial) text of a model turn is parsed as it arrives; a turn
+    that wasn't streamed is parsed whole when it completes. Text of turns
+    that aren't a JSON object (e.g. a remark before a tool call) yields
+    nothing.
+    """
+
+    def __init__(self, fields: tuple[str, ...] = EARLY_FIELDS) -> None:
+        self.fields = fields
+        self.reported: set[str] = set()
+        self._parser = IncrementalJsonParser()
+        self._streamed = False
+
+    def observe(self, event) -> list[tuple[str, Any]]:
+        """Feed one ADK event; returns newly known (field, value) pairs."""
+        if not event.content or event.content.role != "model":
+            return []
+        text = "".join(
+            part.text
+            for part in event.content.parts or []
+            if part.text and not part.thought
+        )
+        if event.partial:
+            completed = self._parser.feed(text) if text else []
+            self._streamed = self._streamed or bool(text)
+        else:
+            # End of the turn: parse it now unless it was streamed
+            completed = [] if self._streamed or not text else self._parser.feed(text)
+            self._parser = IncrementalJsonParser()
+            self._streamed = False
+
+        found = []
+        for field, value in completed:
+            if field in self.fields and field not in self.reported:
+                self.reported.add(field)
+                found.append((field, value))
+        return found
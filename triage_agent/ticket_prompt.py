@@ -0,0 +1,222 @@
+"""Assembly of the ticket message sent to the agent, within a token budget.
+
+The message thread of a ticket is resent on every LLM turn of its run, so a
+long thread (dozens of messages, pasted logs, quoted replies) multiplies
+latency and cost. ``build_ticket_prompt`` renders the ticket the same way
+for the server, the CLI and the evaluation, and keeps the thread within
+``THREAD_TOKEN_BUDGET`` tokens:
+
+1. Quoted text is collapsed: ``>``-quoted lines and ``On ... wrote:``
+   headers are dropped, and a paragraph already seen in an earlier message
+   is replaced with a marker.
+2. Oversized messages (pasted logs) keep their first and last lines.
+3. If the thread is still over budget, the first message and as many of
+   the latest messages as fit are kept; the messages in between are
+   replaced by an extractive summary (their most informative sentences).
+
+Tokens are estimated (UTF-8 bytes / 4), which is close enough for
+budgeting and needs no tokenizer download.
+
+- ``THREAD_TOKEN_BUDGET``: token budget for the message thread (default
+  3000; 0 renders the thread verbatim)
+"""
+
+import os
+import re
+from typing import NamedTuple, Optional
+
+# Latest messages kept verbatim before any are summarized
+MIN_LATEST_MESSAGES = 2
+# Lines kept at the start / end of an oversized message
+HEAD_LINES = 12
+TAIL_LINES = 6
+# Paragraphs shorter than this are never treated as repeated text
+MIN_REPEATED_CHARS = 40
+# Longest sentence taken into the summary
+MAX_SUMMARY_SENTENCE_CHARS = 240
+
+_QUOTE_HEADER = re.compile(r"^\s*On .{1,200} wrote:\s*$")
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n+")
+# Sentences carrying facts the triage depends on
+_SIGNALS = re.compile(
+    r"error|fail|exception|crash|down|outage|timeout|refund|charge|invoice|"
+    r"cancel|deadline|urgent|asap|lost|security|breach|blocked|\d",
+    re.IGNORECASE,
+)
+
+
+class TicketPrompt(NamedTuple):
+    """The rendered ticket message and what budgeting did to it."""
+
+    text: str
+    thread_tokens: int  # tokens of the thread as sent
+    original_thread_tokens: int  # tokens of the thread verbatim
+    summarized_messages: int  # messages replaced by the summary
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_thread_tokens - self.thread_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 UTF-8 bytes per token)."""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def thread_token_budget() -> int:
+    """Configured thread budget in tokens (0 = unlimited)."""
+    return int(os.getenv("THREAD_TOKEN_BUDGET", "3000"))
+
+
+def _render(timestamp: str, content: str) -> str:
+    return f"[{timestamp}] {content}"
+
+
+def _collapse_quotes(content: str, seen: set[str]) -> str:
+    """Drop quoted lines and paragraphs repeated from earlier messages."""
+    lines = [
+        line
+        for line in content.splitlines()
+        if not line.lstrip().startswith(">") and not _QUOTE_HEADER.match(line)
+    ]
+    paragraphs = []
+    for paragraph in re.split(r"\n\s*\n", "\n".join(lines)):
+        normalized = " ".join(paragraph.split()).lower()
+        if not normalized:
+            continue
+        if len(normalized) >= MIN_REPEATED_CHARS and normalized in seen:
+            if paragraphs and paragraphs[-1] == "[repeated text omitted]":
+                continue
+            paragraphs.append("[repeated text omitted]")
+            continue
+        seen.add(normalized)
+        paragraphs.append(paragraph.strip())
+    return "\n\n".join(paragraphs) or "[quoted text only]"
+
+
+def _shorten(content: str, max_tokens: int) -> str:
+    """Keep the first and last lines (or characters) of an oversized message."""
+    if estimate_tokens(content) <= max_tokens:
+        return content
+    lines = content.splitlines()
+    if len(lines) > HEAD_LINES + TAIL_LINES:
+        omitted = len(lines) - HEAD_LINES - TAIL_LINES
+        content = "\n".join(
+            lines[:HEAD_LINES]
+            + [f"[... {omitted} lines omitted ...]"]
+            + lines[-TAIL_LINES:]
+        )
+    if estimate_tokens(content) <= max_tokens:
+        return content
+    # Few, very long lines: cut by characters (2/3 head, 1/3 tail)
+    keep = max_tokens * 4
+    head, tail = content[: keep * 2 // 3], content[-(keep // 3) :]
+    return f"{head}\n[... {len(content) - len(head) - len(tail)} characters omitted ...]\n{tail}"
+
+
+def _summarize(messages: list[tuple[str, str]], max_tokens: int) -> list[str]:
+    """Pick the most informative sentences of ``messages`` within budget."""
+    candidates = []  # (score, position, line)
+    for index, (timestamp, content) in enumerate(messages):
+        sentences = [s.strip() for s in _SENTENCE_END.split(content) if s.strip()]
+        for position, sentence in enumerate(sentences):
+            if sentence.startswith("[") and sentence.endswith("]"):
+                continue  # our own markers
+            score = len(_SIGNALS.findall(sentence)) + (1 if position == 0 else 0)
+            if score == 0:
+                continue
+            if len(sentence) > MAX_SUMMARY_SENTENCE_CHARS:
+                sentence = sentence[:MAX_SUMMARY_SENTENCE_CHARS].rstrip() + "…"
+            candidates.append((score, index, position, f"- [{timestamp}] {sentence}"))
+
+    chosen, used = [], 0
+    for score, index, position, line in sorted(candidates, key=lambda c: -c[0]):
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            continue
+        chosen.append((index, position, line))
+        used += cost
+    return [line for _, _, line in sorted(chosen)]
+
+
+def _fit_thread(messages: list[tuple[str, str]], budget: int) -> tuple[str, int]:
+    """Render the thread within ``budget``; returns (text, summarized count)."""
+    # 1. Collapse quoted / repeated text
+    seen: set[str] = set()
+    messages = [(ts, _collapse_quotes(content, seen)) for ts, content in messages]
+
+    # 2. Shorten oversized messages
+    max_message_tokens = max(budget // 4, 100)
+    messages = [(ts, _shorten(content, max_message_tokens)) for ts, content in messages]
+
+    rendered = [_render(ts, content) for ts, content in messages]
+    if estimate_tokens("\n\n".join(rendered)) <= budget or len(messages) <= 2:
+        return "\n\n".join(rendered), 0
+
+    # 3. First message + latest messages; summarize what's in between
+    used = estimate_tokens(rendered[0])
+    latest_start = len(messages)
+    while latest_start > 1:
+        cost = estimate_tokens(rendered[latest_start - 1]) + 1
+        kept = len(messages) - latest_start
+        # Leave a quarter of the budget for the summary once the minimum is kept
+        limit = budget if kept < MIN_LATEST_MESSAGES else budget * 3 // 4
+        if used + cost > limit:
+            break
+        used += cost
+        latest_start -= 1
+
+    middle = messages[1:latest_start]
+    if not middle:
+        return "\n\n".join(rendered), 0
+
+    summary = _summarize(middle, max(budget - used, 0))
+    summary_block = f"[... {len(middle)} earlier messages summarized ...]"
+    if summary:
+        summary_block += "\n" + "\n".join(summary)
+    parts = [rendered[0], summary_block] + rendered[latest_start:]
+    return "\n\n".join(parts), len(middle)
+
+
+def build_ticket_prompt(
+    ticket_id: str,
+    customer_id: str,
+    subject: str,
+    messages: list[tuple[str, str]],
+    budget: Optional[int] = None,
+) -> TicketPrompt:
+    """Render a ticket as the user message sent to the agent.
+
+    Args:
+        ticket_id: Ticket identifier.
+        customer_id: Customer identifier.
+        subject: Ticket subject line.
+        messages: (timestamp, content) pairs, oldest first.
+        budget: Token budget for the message thread.
+                Defaults to THREAD_TOKEN_BUDGET from env or 3000; 0 disables.
+
+    Returns:
+        TicketPrompt: The message text plus token accounting for the thread.
+    """
+    if budget is None:
+        budget = thread_token_budget()
+
+    verbatim = "\n\n".join(_render(ts, content) for ts, content in messages)
+    original_tokens = estimate_tokens(verbatim)
+    conversation, summarized = verbatim, 0
+    if budget > 0 and original_tokens > budget:
+        conversation, summarized = _fit_thread(messages, budget)
+
+    text = (
+        f"Please triage the following support ticket.\n\n"
+        f"**Ticket ID:** {ticket_id}\n"
+        f"**Customer ID:** {customer_id}\n"
+        f"**Subject:** {subject}\n\n"
+        f"**Messages:**\n{conversation}"
+    )
+    return TicketPrompt(
+        text=text,
+        thread_tokens=estimate_tokens(conversation),
+        original_thread_tokens=original_tokens,
+        summarized_messages=summarized,
+    )
@@ -0,0 +1,105 @@
+"""Per-run memoization of tool results.
+
+Within one triage run the model often asks for the same thing twice (e.g.
+the customer context again after a knowledge base search). ``ToolMemo``
+plugs into the agent's tool callbacks: the first call with given arguments
+runs the tool and stores its result, and any repeat within the same run
+(ADK invocation) is answered from the store without running the tool.
+
+Memoized calls are reported by ``MetricsPlugin`` as tool calls with outcome
+``memoized`` (``triage_tool_calls_total``).
+
+- ``TOOL_MEMO_ENABLED``: ``true`` (default) or ``false``
+"""
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Runs cancelled mid-way (e.g. by a deadline) never reach after_agent; keep
+# at most this many runs' results around
+MAX_RUNS = 256
+
+
+def _memo_key(tool_name: str, args: dict[str, Any]) -> str:
+    return tool_name + ":" + json.dumps(args, sort_keys=True, default=str)
+
+
+class _RunMemo:
+    __slots__ = ("results", "hit_call_ids")
+
+    def __init__(self) -> None:
+        self.results: dict[str, dict] = {}
+        # function_call_id of every call answered from ``results``
+        self.hit_call_ids: set[str] = set()
+
+
+class ToolMemo:
+    """Tool-result memo scoped to one agent invocation.
+
+    Register ``before_tool``, ``after_tool`` and ``after_agent`` as the
+    agent's ``before_tool_callback``, ``after_tool_callback`` and
+    ``after_agent_callback``.
+    """
+
+    def __init__(self, max_runs: int = MAX_RUNS, enabled: bool = None) -> None:
+        if enabled is None:
+            enabled = os.getenv("TOOL_MEMO_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, _RunMemo] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run(self, invocation_id: str, create: bool) -> Optional[_RunMemo]:
+        with self._lock:
+            run = self._runs.get(invocation_id)
+            if run is None and create:
+                run = self._runs[invocation_id] = _RunMemo()
+                while len(self._runs) > self.max_runs:
+                    self._runs.popitem(last=False)
+            return run
+
+    def before_tool(self, tool, args: dict[str, Any], tool_context) -> Optional[dict]:
+        """Answer a repeated call from the memo (skipping the tool)."""
+        if not self.enabled:
+            return None
+        run = self._run(tool_context.invocation_id, create=False)
+        if run is None:
+            return None
+        result = run.results.get(_memo_key(tool.name, args))
+        if result is None:
+            return None
+        run.hit_call_ids.add(tool_context.function_call_id)
+        # Callbacks further down may modify the response in place
+        return copy.deepcopy(result)
+
+    def after_tool(
+        self, tool, args: dict[str, Any], tool_context, tool_response: Any
+    ) -> Optional[dict]:
+        """Store the result of a call that actually ran."""
+        if not self.enabled or not isinstance(tool_response, dict):
+            return None
+        run = self._run(tool_context.invocation_id, create=True)
+        if tool_context.function_call_id not in run.hit_call_ids:
+            run.results.setdefault(
+                _memo_key(tool.name, args), copy.deepcopy(tool_response)
+            )
+        return None
+
+    def after_agent(self, callback_context) -> None:
+        """Drop the finished run's results."""
+        with self._lock:
+            self._runs.pop(callback_context.invocation_id, None)
+        return None
+
+    def was_memoized(self, invocation_id: str, function_call_id: str) -> bool:
+        """Whether the given call was answered from the memo."""
+        run = self._run(invocation_id, create=False)
+        return run is not None and function_call_id in run.hit_call_ids
+
+
+# Shared by ``root_agent`` and ``MetricsPlugin``
+TOOL_MEMO = ToolMemo()
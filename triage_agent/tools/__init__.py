@@ -3,6 +3,7 @@ from .context import (
     search_ticket_history,
     get_customer_health_score,
     check_sla_status,
+    get_customer_context,
 )
 from .search import search_knowledge_base
 from .operational import (
@@ -17,6 +18,7 @@ __all__ = [
     "search_ticket_history",
     "get_customer_health_score",
     "check_sla_status",
+    "get_customer_context",
     # Search
     "search_knowledge_base",
     # Operational
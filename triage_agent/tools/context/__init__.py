@@ -2,10 +2,12 @@ from .customer_history import lookup_customer_history
 from .ticket_history import search_ticket_history
 from .health_score import get_customer_health_score
 from .sla_status import check_sla_status
+from .customer_context import get_customer_context
 
 __all__ = [
     "lookup_customer_history",
     "search_ticket_history",
     "get_customer_health_score",
     "check_sla_status",
+    "get_customer_context",
 ]
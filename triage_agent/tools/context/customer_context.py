@@ -0,0 +1,152 @@
+"""Tool: Get all per-customer context (profile, health, SLA, billing, tickets) at once."""
+
+from ..tables import derived_table, load_table
+
+# Recent billing transactions / past tickets included per customer
+RECENT_LIMIT = 5
+
+
+@derived_table
+def _context_index() -> dict[str, dict]:
+    """Join every per-customer table into one record per customer ID.
+
+    Tables are keyed (customers, health, SLA) or flat lists (billing,
+    tickets); the lists are grouped here once so a lookup is a single
+    dictionary access instead of a scan of each table. Built on first
+    use, once per process.
+    """
+    customers = load_table("customers.json")
+    health_metrics = load_table("health_metrics.json")
+    sla_status = load_table("sla_status.json")
+    transactions = load_table("billing_transactions.json")
+    tickets = load_table("ticket_history.json")
+
+    index: dict[str, dict] = {}
+
+    def _entry(customer_id: str) -> dict:
+        return index.setdefault(
+            customer_id,
+            {
+                "customer": None,
+                "health": None,
+                "sla": None,
+                "transactions": [],
+                "tickets": [],
+            },
+        )
+
+    for customer_id, customer in customers.items():
+        _entry(customer_id)["customer"] = customer
+    for customer_id, metrics in health_metrics.items():
+        _entry(customer_id)["health"] = metrics
+    for customer_id, sla in sla_status.items():
+        _entry(customer_id)["sla"] = sla
+    for txn in transactions:
+        _entry(txn["customer_id"])["transactions"].append(txn)
+    for ticket in tickets:
+        _entry(ticket["customer_id"])["tickets"].append(ticket)
+
+    for entry in index.values():
+        entry["transactions"].sort(key=lambda t: t["created_at"], reverse=True)
+        entry["tickets"].sort(key=lambda t: t["date"], reverse=True)
+    return index
+
+
+def get_customer_context(customer_id: str) -> dict:
+    """Get a customer's profile, health, SLA, billing and ticket history in one call.
+
+    Use this tool instead of looking up the customer's profile, health score
+    and SLA status separately: it returns all of them, plus a summary of
+    recent billing activity and their most recent support tickets. Sections
+    with no data for the customer are null.
+
+    Args:
+        customer_id: The unique customer identifier (e.g., "CUST-001").
+
+    Returns:
+        dict: A dictionary containing:
+            - status: "found" or "not_found"
+            - profile: Plan, region, tenure, seats, spend and account notes
+            - health: health_score, risk_level, recent_nps, usage_trend,
+                      last_login_days_ago, feature_adoption_pct
+            - sla: sla_tier, response_time_hours, time_remaining_hours,
+                   is_at_risk, ticket_opened_at
+            - billing_summary: total_pending, total_completed,
+                               total_transactions and recent_transactions
+            - recent_tickets: Most recent past tickets with resolutions
+            - total_tickets: Number of past tickets on record
+    """
+    entry = _context_index().get(customer_id)
+
+    if entry is None:
+        return {
+            "status": "not_found",
+            "message": f"No customer data found for ID: '{customer_id}'",
+        }
+
+    customer = entry["customer"]
+    metrics = entry["health"]
+    sla = entry["sla"]
+    transactions = entry["transactions"]
+    tickets = entry["tickets"]
+
+    return {
+        "status": "found",
+        "customer_id": customer_id,
+        "profile": {
+            "name": customer["name"],
+            "plan": customer["plan"],
+            "region": customer["region"],
+            "tenure_months": customer["tenure_months"],
+            "seats": customer["seats"],
+            "monthly_spend": customer["monthly_spend"],
+            "notes": customer["notes"],
+        } if customer else None,
+        "health": {
+            "health_score": metrics["health_score"],
+            "risk_level": metrics["risk_level"],
+            "recent_nps": metrics["recent_nps"],
+            "usage_trend": metrics["usage_trend"],
+            "last_login_days_ago": metrics["last_login_days_ago"],
+            "feature_adoption_pct": metrics["feature_adoption_pct"],
+        } if metrics else None,
+        "sla": {
+            "sla_tier": sla["sla_tier"],
+            "response_time_hours": sla["response_time_hours"],
+            "time_remaining_hours": sla["time_remaining_hours"],
+            "is_at_risk": sla["is_at_risk"],
+            "ticket_opened_at": sla["ticket_opened_at"],
+        } if sla else None,
+        "billing_summary": {
+            "total_pending": round(
+                sum(t["amount"] for t in transactions if t["status"] == "pending"), 2
+            ),
+            "total_completed": round(
+                sum(t["amount"] for t in transactions if t["status"] == "completed"), 2
+            ),
+            "total_transactions": len(transactions),
+            "recent_transactions": [
+                {
+                    "transaction_id": t["transaction_id"],
+                    "amount": t["amount"],
+                    "currency": t["currency"],
+                    "status": t["status"],
+                    "type": t["type"],
+                    "created_at": t["created_at"],
+                }
+                for t in transactions[:RECENT_LIMIT]
+            ],
+        },
+        "recent_tickets": [
+            {
+                "ticket_id": t["ticket_id"],
+                "date": t["date"],
+                "subject": t["subject"],
+                "issue_type": t["issue_type"],
+                "resolution": t["resolution"],
+                "satisfaction": t["satisfaction"],
+            }
+            for t in tickets[:RECENT_LIMIT]
+        ],
+        "total_tickets": len(tickets),
+    }
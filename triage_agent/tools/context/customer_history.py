@@ -1,12 +1,6 @@
 """Tool: Look up customer history and profile information."""
 
-import json
-from pathlib import Path
-
-# Load customer records from JSON
-_DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
-with open(_DATA_DIR / "customers.json", encoding="utf-8") as f:
-    CUSTOMER_RECORDS = json.load(f)
+from ..tables import load_table
 
 
 def lookup_customer_history(customer_id: str) -> dict:
@@ -26,7 +20,7 @@ def lookup_customer_history(customer_id: str) -> dict:
             - customer: Customer profile with plan, region, tenure, spend,
                         previous tickets, and notes (when found)
     """
-    customer = CUSTOMER_RECORDS.get(customer_id)
+    customer = load_table("customers.json").get(customer_id)
 
     if customer:
         return {
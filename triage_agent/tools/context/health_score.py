@@ -1,12 +1,6 @@
 """Tool: Get customer health score and churn risk assessment."""
 
-import json
-from pathlib import Path
-
-# Load health metrics from JSON
-_DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
-with open(_DATA_DIR / "health_metrics.json", encoding="utf-8") as f:
-    HEALTH_METRICS = json.load(f)
+from ..tables import load_table
 
 
 def get_customer_health_score(customer_id: str) -> dict:
@@ -29,7 +23,7 @@ def get_customer_health_score(customer_id: str) -> dict:
             - last_login_days_ago: Days since last login
             - feature_adoption_pct: Percentage of available features used
     """
-    metrics = HEALTH_METRICS.get(customer_id)
+    metrics = load_table("health_metrics.json").get(customer_id)
 
     if metrics:
         return {
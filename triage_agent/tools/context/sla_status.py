@@ -1,12 +1,6 @@
 """Tool: Check SLA status and time remaining before breach."""
 
-import json
-from pathlib import Path
-
-# Load SLA status from JSON
-_DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
-with open(_DATA_DIR / "sla_status.json", encoding="utf-8") as f:
-    SLA_STATUS = json.load(f)
+from ..tables import load_table
 
 
 def check_sla_status(customer_id: str) -> dict:
@@ -28,7 +22,7 @@ def check_sla_status(customer_id: str) -> dict:
             - is_at_risk: True if less than 25% of time remaining
             - ticket_opened_at: ISO timestamp when ticket was opened
     """
-    sla = SLA_STATUS.get(customer_id)
+    sla = load_table("sla_status.json").get(customer_id)
 
     if sla:
         return {
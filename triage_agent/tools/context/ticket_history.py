@@ -1,12 +1,6 @@
 """Tool: Search past tickets for similar issues and their resolutions."""
 
-import json
-from pathlib import Path
-
-# Load ticket history from JSON
-_DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
-with open(_DATA_DIR / "ticket_history.json", encoding="utf-8") as f:
-    TICKET_HISTORY = json.load(f)
+from ..tables import load_table
 
 
 def search_ticket_history(customer_id: str = None, query: str = None) -> dict:
@@ -29,7 +23,7 @@ def search_ticket_history(customer_id: str = None, query: str = None) -> dict:
             - avg_resolution_time_hours: Average time to resolve similar issues
             - total_results: Number of matching tickets found
     """
-    filtered_tickets = TICKET_HISTORY
+    filtered_tickets = load_table("ticket_history.json")
 
     # Filter by customer ID if provided
     if customer_id:
@@ -1,12 +1,6 @@
 """Tool: Look up recent billing transactions and their status."""
 
-import json
-from pathlib import Path
-
-# Load billing transactions from JSON
-_DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
-with open(_DATA_DIR / "billing_transactions.json", encoding="utf-8") as f:
-    BILLING_TRANSACTIONS = json.load(f)
+from ..tables import load_table
 
 
 def lookup_billing_transaction(customer_id: str, date: str = None) -> dict:
@@ -29,9 +23,8 @@ def lookup_billing_transaction(customer_id: str, date: str = None) -> dict:
             - total_results: Number of matching transactions
     """
     # Filter transactions by customer ID
-    customer_txns = [
-        t for t in BILLING_TRANSACTIONS if t["customer_id"] == customer_id
-    ]
+    transactions = load_table("billing_transactions.json")
+    customer_txns = [t for t in transactions if t["customer_id"] == customer_id]
 
     # Further filter by date if provided
     if date is not None:
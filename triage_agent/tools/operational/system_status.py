@@ -1,12 +1,6 @@
 """Tool: Check for ongoing incidents or maintenance in a region."""
 
-import json
-from pathlib import Path
-
-# Load system status from JSON
-_DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
-with open(_DATA_DIR / "system_status.json", encoding="utf-8") as f:
-    SYSTEM_STATUS = json.load(f)
+from ..tables import load_table
 
 
 def check_system_status(region: str = None) -> dict:
@@ -27,11 +21,12 @@ def check_system_status(region: str = None) -> dict:
             - incidents: List of active incidents affecting the region
             - last_updated: ISO timestamp of last status update
     """
-    global_status = SYSTEM_STATUS["global"]["status"]
-    last_updated = SYSTEM_STATUS["global"]["last_updated"]
+    system_status = load_table("system_status.json")
+    global_status = system_status["global"]["status"]
+    last_updated = system_status["global"]["last_updated"]
 
     if region:
-        region_data = SYSTEM_STATUS["regions"].get(region)
+        region_data = system_status["regions"].get(region)
         if region_data:
             return {
                 "global_status": global_status,
@@ -53,6 +48,6 @@ def check_system_status(region: str = None) -> dict:
     # Return all regions if no specific region requested
     return {
         "global_status": global_status,
-        "regions": SYSTEM_STATUS["regions"],
+        "regions": system_status["regions"],
         "last_updated": last_updated,
     }
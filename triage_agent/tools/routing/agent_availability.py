@@ -1,12 +1,6 @@
 """Tool: Check current queue depth and wait time for specialist teams."""
 
-import json
-from pathlib import Path
-
-# Load agent availability from JSON
-_DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
-with open(_DATA_DIR / "agent_availability.json", encoding="utf-8") as f:
-    AGENT_AVAILABILITY = json.load(f)
+from ..tables import load_table
 
 
 def get_agent_availability(team: str = None) -> dict:
@@ -29,8 +23,9 @@ def get_agent_availability(team: str = None) -> dict:
             - agents_available: Number of agents currently available
             - agents_total: Total number of agents on the team
     """
+    agent_availability = load_table("agent_availability.json")
     if team:
-        team_data = AGENT_AVAILABILITY.get(team)
+        team_data = agent_availability.get(team)
         if team_data:
             return {
                 "status": "found",
@@ -49,5 +44,5 @@ def get_agent_availability(team: str = None) -> dict:
     # Return all teams if no specific team requested
     return {
         "status": "found",
-        "teams": AGENT_AVAILABILITY,
+        "teams": agent_availability,
     }
@@ -11,6 +11,9 @@ from typing import List, Dict, Any
 import chromadb
 from chromadb.utils import embedding_functions
 
+from triage_agent.http_clients import openai_client
+from triage_agent.serving.metrics import VECTOR_SEARCH_SECONDS
+
 
 class VectorStore:
     """Wrapper for ChromaDB vector database."""
@@ -40,6 +43,11 @@ class VectorStore:
             api_key=os.getenv("OPENAI_API_KEY"),
             model_name=embedding_model
         )
+        # Send embedding requests through the shared keep-alive connection pool
+        self.embedding_function.client = openai_client(
+            self.embedding_function.api_key,
+            base_url=self.embedding_function.api_base,
+        )
         
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
@@ -87,11 +95,12 @@ class VectorStore:
                 - distances: List of similarity distances (lower = more similar)
                 - ids: List of document IDs
         """
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results,
-            where=where
-        )
+        with VECTOR_SEARCH_SECONDS.time():
+            results = self.collection.query(
+                query_texts=[query],
+                n_results=n_results,
+                where=where
+            )
         
         # Flatten results (query_texts is a list, so results are nested)
         return {
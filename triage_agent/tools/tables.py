@@ -0,0 +1,49 @@
+"""Shared lazy loader for the JSON data tables backing the tools.
+
+Nothing is read at import time. Each table in ``data/`` is parsed on first
+use, at most once per process, and the same object is handed to every tool
+module; indexes built from the tables (``derived_table``) are cached the
+same way. ``preload_tables`` loads all of them up front: the startup warm-up
+calls it so the first ticket doesn't pay for parsing, and the pre-fork
+server (``triage_agent.serving.prefork``) calls it in the parent so forked
+workers inherit one copy-on-write copy instead of parsing their own.
+"""
+
+import functools
+import json
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+T = TypeVar("T")
+
+# Cached builders registered with derived_table, run by preload_tables
+_DERIVED: list[Callable[[], Any]] = []
+
+
+@functools.cache
+def load_table(filename: str) -> Any:
+    """Return the parsed contents of ``data/<filename>``, loading it once."""
+    with open(DATA_DIR / filename, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def derived_table(build: Callable[[], T]) -> Callable[[], T]:
+    """Cache ``build()`` like a table: built on first call or by preload_tables."""
+    cached = functools.cache(build)
+    _DERIVED.append(cached)
+    return cached
+
+
+def preload_tables() -> list[str]:
+    """Load every JSON table in ``data/`` and build every derived index.
+
+    Returns the loaded filenames.
+    """
+    filenames = sorted(path.name for path in DATA_DIR.glob("*.json"))
+    for filename in filenames:
+        load_table(filename)
+    for build in _DERIVED:
+        build()
+    return filenames